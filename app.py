@@ -1,239 +1,492 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
+import click
+from flask import (Blueprint, Flask, current_app, has_app_context, make_response, render_template, request, redirect,
+                   session, url_for, flash, jsonify)
+from flask_login import LoginManager, login_user, login_required, logout_user, current_user
+from werkzeug.http import is_resource_modified
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from compute_pool import ComputePool, PoolFull
+from db_config import configure_database, install_pragmas, read_only
+from instrumentation import PROMETHEUS_CONTENT_TYPE, install_instrumentation, phase
+from metrics_ingest import aggregate_csv_metrics, aggregate_monthly_metrics, format_stats, new_totals
+from migrations import migrate
+from metrics_snapshot import MetricsSnapshot, SnapshotError, read_digest, write_snapshot
+from models import (db, User, Club, Award, Nomination, ClubMetrics, ClubMetricsMonthly, EvaluationWeights, FeedbackVote, VoteTally,
+                    AwardDecision, IngestWatermark, AwardEligibility, EligibilityVersion, RankingSnapshot, RankingSnapshotRow,
+                    PageVersion, WeightSet, bump_eligibility_version, bump_page_versions)
+from page_cache import PageCache
+from report_scoring import ReportScoreCache
 import os
+import base64
+import copy
 import csv
-from collections import defaultdict
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import re
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
+import bisect
+import heapq
 import random
+import threading
+import time
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///awards.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+try:
+    import numpy as np
+except ImportError:  # optional: vectorised scoring backend
+    np = None
 
-db = SQLAlchemy(app)
+log = logging.getLogger(__name__)
 login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-
-# Database Models
-class User(UserMixin, db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(120), nullable=False)
-    is_admin = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class Club(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False)
-    description = db.Column(db.Text)
-    category = db.Column(db.String(50))  # e.g., 'Academic', 'Cultural', 'Technical'
-    founded_year = db.Column(db.Integer)
-    member_count = db.Column(db.Integer)
-    achievements = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-class Award(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False)
-    description = db.Column(db.Text)
-    category = db.Column(db.String(50))  # e.g., 'Best Public Speaking', 'Best Technical Club'
-    criteria = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    winners_declared = db.Column(db.Boolean, default=False)
-    declared_at = db.Column(db.DateTime)
-
-class Nomination(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), nullable=False)
-    reason = db.Column(db.Text)
-    submitted_by = db.Column(db.Integer, db.ForeignKey('user.id'))
-    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
-    is_approved = db.Column(db.Boolean, default=False)
-    
-    club = db.relationship('Club', backref='nominations')
-    award = db.relationship('Award', backref='nominations')
-
-class ClubMetrics(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), unique=True, nullable=False)
-    instagram_posts = db.Column(db.Integer, default=0)
-    instagram_likes = db.Column(db.Integer, default=0)
-    instagram_reach = db.Column(db.Integer, default=0)
-    whatsapp_messages = db.Column(db.Integer, default=0)
-    whatsapp_sentiment = db.Column(db.Float, default=0.0)  # -1 to 1 synthetic
-    awards_won = db.Column(db.Integer, default=0)
-    offline_attendance = db.Column(db.Integer, default=0)
-
-    club = db.relationship('Club', backref=db.backref('metrics', uselist=False))
-
-class EvaluationWeights(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    # Global single row config
-    w_social = db.Column(db.Float, default=0.30)  # posts/likes/reach composite
-    w_whatsapp = db.Column(db.Float, default=0.20)  # messages & sentiment
-    w_awards = db.Column(db.Float, default=0.20)  # awards won
-    w_feedback = db.Column(db.Float, default=0.15)  # student votes
-    w_attendance = db.Column(db.Float, default=0.15)  # offline attendance
-    w_reports = db.Column(db.Float, default=0.10)  # textual report impact
-
-class FeedbackVote(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), nullable=False)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    voter_hash = db.Column(db.String(120), nullable=True)  # simple duplicate prevention token
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    award = db.relationship('Award', backref='votes')
-    club = db.relationship('Club', backref='votes')
-
-class AwardDecision(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), unique=True, nullable=False)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    reason = db.Column(db.Text)
-    decided_by = db.Column(db.Integer, db.ForeignKey('user.id'))
-    decided_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    award = db.relationship('Award', backref=db.backref('decision', uselist=False))
-    club = db.relationship('Club')
-    decider = db.relationship('User')
+login_manager.login_view = 'main.login'
+# Views and CLI commands; cli_group=None keeps the commands at the top level (`flask seed`)
+bp = Blueprint('main', __name__, cli_group=None)
 
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
-# -------- Lightweight SQLite migration helpers --------
+# -------- Schema setup --------
 
-def ensure_award_columns():
-    try:
-        info_award = db.session.execute(db.text("PRAGMA table_info('award')")).all()
-        cols_award = {row[1] for row in info_award}
-        if 'winners_declared' not in cols_award:
-            db.session.execute(db.text("ALTER TABLE award ADD COLUMN winners_declared BOOLEAN DEFAULT 0"))
-        if 'declared_at' not in cols_award:
-            db.session.execute(db.text("ALTER TABLE award ADD COLUMN declared_at DATETIME"))
-        # ensure AwardDecision table exists
-        db.session.execute(db.text("CREATE TABLE IF NOT EXISTS award_decision (id INTEGER PRIMARY KEY AUTOINCREMENT, award_id INTEGER UNIQUE, club_id INTEGER, reason TEXT, decided_by INTEGER, decided_at DATETIME)"))
-        # ensure ClubMetrics new column
-        info_metrics = db.session.execute(db.text("PRAGMA table_info('club_metrics')")).all()
-        cols_metrics = {row[1] for row in info_metrics}
-        if 'offline_attendance' not in cols_metrics:
-            db.session.execute(db.text("ALTER TABLE club_metrics ADD COLUMN offline_attendance INTEGER DEFAULT 0"))
-        # ensure EvaluationWeights new column
-        info_weights = db.session.execute(db.text("PRAGMA table_info('evaluation_weights')")).all()
-        cols_weights = {row[1] for row in info_weights}
-        if 'w_attendance' not in cols_weights:
-            db.session.execute(db.text("ALTER TABLE evaluation_weights ADD COLUMN w_attendance FLOAT DEFAULT 0.15"))
-        if 'w_reports' not in cols_weights:
-            db.session.execute(db.text("ALTER TABLE evaluation_weights ADD COLUMN w_reports FLOAT DEFAULT 0.10"))
-        # Backfill NULL weights for existing single row
-        db.session.execute(db.text("UPDATE evaluation_weights SET w_attendance = COALESCE(w_attendance, 0.15)"))
-        db.session.execute(db.text("UPDATE evaluation_weights SET w_reports = COALESCE(w_reports, 0.10)"))
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-        raise
+def init_database():
+    """Create missing tables, then apply pending schema migrations (see migrations.py)."""
+    db.create_all()
+    return migrate(db.engine)
 
 # -------- Automated eligibility rules and helpers --------
 
 def _text(s: str) -> str:
     return (s or '').lower()
 
-def get_award_eligibility_predicate(award_name: str):
+
+def _compile_keywords(keywords):
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+class EligibilityRule:
+    """Decides whether a club qualifies for an award.
+
+    Each keyword list is compiled into one alternation so a club's name,
+    description and description+achievements text are each scanned once
+    (plain substring semantics, as before). A club is eligible when any
+    configured test matches.
+    """
+
+    def __init__(self, name_keywords=(), description_keywords=(), text_keywords=(), categories=(), check=None):
+        self._name = _compile_keywords(name_keywords)
+        self._description = _compile_keywords(description_keywords)
+        self._text = _compile_keywords(text_keywords)
+        self._categories = frozenset(categories)
+        self._check = check
+
+    def __call__(self, club: Club) -> bool:
+        if club.category in self._categories:
+            return True
+        if self._name is not None and self._name.search(_text(club.name)):
+            return True
+        if self._description is not None and self._description.search(_text(club.description)):
+            return True
+        if self._text is not None and self._text.search(_text(club.description) + ' ' + _text(club.achievements)):
+            return True
+        return self._check is not None and self._check(club)
+
+
+# (award name substrings, rule); the first matching entry wins
+ELIGIBILITY_RULES = [
+    (('public speaking',), EligibilityRule(
+        name_keywords=['debate', 'toastmasters', 'mun'],
+        description_keywords=['debate', 'public speaking', 'oratory'],
+    )),
+    (('technical',), EligibilityRule(
+        name_keywords=['mun club',  # forced override
+                       'coding', 'robotics', 'ai', 'ml'],
+        description_keywords=['machine learning', 'programming', 'software', 'hackathon'],
+        categories=['Technical'],
+    )),
+    (('cultural',), EligibilityRule(
+        name_keywords=['dance', 'music', 'photography'],
+        description_keywords=['dance', 'music', 'arts', 'culture'],
+        categories=['Cultural'],
+    )),
+    (('most active',), EligibilityRule(
+        check=lambda club: (club.member_count or 0) >= 40,
+    )),
+    (('new club',), EligibilityRule(
+        check=lambda club: (club.founded_year or 0) >= (datetime.utcnow().year - 2),
+    )),
+    (('community impact',), EligibilityRule(
+        text_keywords=['community', 'service', 'impact', 'outreach'],
+    )),
+    (('innovation',), EligibilityRule(
+        text_keywords=['innov', 'ai', 'robot', 'ml', 'new'],
+    )),
+    (('leadership',), EligibilityRule(
+        text_keywords=['leader', 'organizer', 'management'],
+    )),
+]
+
+ALWAYS_ELIGIBLE = EligibilityRule(check=lambda club: True)
+
+# Club/Award columns the rules read; changing one re-evaluates eligibility
+CLUB_ELIGIBILITY_FIELDS = ('name', 'description', 'category', 'achievements', 'member_count', 'founded_year')
+AWARD_ELIGIBILITY_FIELDS = ('name',)
+
+
+@functools.lru_cache(maxsize=None)
+def get_award_eligibility_predicate(award_name: str) -> EligibilityRule:
     name = award_name.lower()
+    for needles, rule in ELIGIBILITY_RULES:
+        if any(n in name for n in needles):
+            return rule
+    return ALWAYS_ELIGIBLE
+
+
+def eligible_clubs_for_award(award_id: int):
+    """Eligible clubs for an award, read from the award_eligibility table."""
+    return (
+        Club.query
+        .join(AwardEligibility, AwardEligibility.club_id == Club.id)
+        .filter(AwardEligibility.award_id == award_id)
+        .order_by(Club.id)
+        .all()
+    )
 
-    overrides = {
-        'best technical club': ['mun club'],
-    }
 
-    if 'public speaking' in name:
-        def pred(club: Club) -> bool:
-            cn = _text(club.name)
-            cd = _text(club.description)
-            return (
-                'debate' in cn or 'toastmasters' in cn or 'mun' in cn or
-                'debate' in cd or 'public speaking' in cd or 'oratory' in cd
-            )
-        return pred
-
-    if 'technical' in name:
-        def pred(club: Club) -> bool:
-            cn = _text(club.name)
-            cd = _text(club.description)
-            forced = any(sub in cn for sub in overrides.get('best technical club', []))
-            return forced or (
-                'coding' in cn or 'robotics' in cn or 'ai' in cn or 'ml' in cn or 'machine learning' in cd or
-                club.category == 'Technical' or 'programming' in cd or 'software' in cd or 'hackathon' in cd
-            )
-        return pred
-
-    if 'cultural' in name:
-        def pred(club: Club) -> bool:
-            cn = _text(club.name)
-            cd = _text(club.description)
-            return (
-                club.category == 'Cultural' or 'dance' in cn or 'music' in cn or 'photography' in cn or
-                'dance' in cd or 'music' in cd or 'arts' in cd or 'culture' in cd
-            )
-        return pred
+# award_id -> frozenset(club_id) as of eligibility_version.version; any process's rebuild bumps the version
+_eligible_ids = {'version': None, 'awards': {}}
+_eligible_ids_lock = threading.Lock()
 
-    if 'most active' in name:
-        def pred(club: Club) -> bool:
-            return (club.member_count or 0) >= 40
-        return pred
 
-    if 'best new club' in name or ('new club' in name):
-        def pred(club: Club) -> bool:
-            return (club.founded_year or 0) >= (datetime.utcnow().year - 2)
-        return pred
+def eligible_club_ids(award_id: int) -> frozenset:
+    """Cached set of club ids eligible for an award, re-read once the stored eligibility version moves."""
+    version = db.session.query(EligibilityVersion.version).filter_by(id=1).scalar() or 0
+    with _eligible_ids_lock:
+        if _eligible_ids['version'] != version:
+            _eligible_ids.update(version=version, awards={})
+        ids = _eligible_ids['awards'].get(award_id)
+    if ids is None:
+        # read after the version, so the cached set is never older than the version it is filed under
+        ids = frozenset(cid for (cid,) in db.session.query(AwardEligibility.club_id)
+                        .filter(AwardEligibility.award_id == award_id))
+        with _eligible_ids_lock:
+            if _eligible_ids['version'] == version:
+                _eligible_ids['awards'][award_id] = ids
+    return ids
 
-    if 'community impact' in name:
-        def pred(club: Club) -> bool:
-            cd = _text(club.description) + ' ' + _text(club.achievements)
-            return ('community' in cd) or ('service' in cd) or ('impact' in cd) or ('outreach' in cd)
-        return pred
 
-    if 'innovation' in name:
-        def pred(club: Club) -> bool:
-            cd = _text(club.description) + ' ' + _text(club.achievements)
-            return ('innov' in cd) or ('ai' in cd) or ('robot' in cd) or ('ml' in cd) or ('new' in cd)
-        return pred
+def is_club_eligible(award_id: int, club_id: int) -> bool:
+    return club_id in eligible_club_ids(award_id)
 
-    if 'leadership' in name:
-        def pred(club: Club) -> bool:
-            cd = _text(club.description) + ' ' + _text(club.achievements)
-            return ('leader' in cd) or ('organizer' in cd) or ('management' in cd)
-        return pred
 
-    return lambda club: True
+def eligibility_index():
+    """The full award_id -> set(club_id) mapping in one query."""
+    index = defaultdict(set)
+    for award_id, club_id in db.session.query(AwardEligibility.award_id, AwardEligibility.club_id):
+        index[award_id].add(club_id)
+    return index
 
 
 def auto_nominate_all_awards():
-    awards = Award.query.all()
-    clubs = Club.query.all()
-    for award in awards:
-        predicate = get_award_eligibility_predicate(award.name)
-        for club in clubs:
-            if predicate(club):
-                exists = Nomination.query.filter_by(club_id=club.id, award_id=award.id).first()
-                if exists:
-                    continue
-                reason = f"Auto-nominated based on eligibility: '{award.name}' criteria matched by {club.name}."
-                nomination = Nomination(
-                    club_id=club.id,
-                    award_id=award.id,
-                    reason=reason,
-                    submitted_by=None,
-                    is_approved=True  # accept automatically
-                )
-                db.session.add(nomination)
+    """Insert an approved nomination for every eligible (award, club) pair that lacks one.
+
+    Missing pairs come from one anti-join of award_eligibility against
+    nomination and are written with a single bulk INSERT.
+    Returns (rows inserted, seconds taken).
+    """
+    started = time.perf_counter()
+    missing = (
+        db.session.query(AwardEligibility.award_id, AwardEligibility.club_id, Award.name, Club.name)
+        .join(Award, Award.id == AwardEligibility.award_id)
+        .join(Club, Club.id == AwardEligibility.club_id)
+        .outerjoin(Nomination, db.and_(Nomination.award_id == AwardEligibility.award_id,
+                                       Nomination.club_id == AwardEligibility.club_id))
+        .filter(Nomination.id.is_(None))
+        .all()
+    )
+    rows = [{
+        'club_id': club_id,
+        'award_id': award_id,
+        'reason': f"Auto-nominated based on eligibility: '{award_name}' criteria matched by {club_name}.",
+        'submitted_by': None,
+        'is_approved': True,  # accept automatically
+    } for award_id, club_id, award_name, club_name in missing]
+    if rows:
+        db.session.execute(db.insert(Nomination), rows)
+    db.session.commit()
+    return len(rows), time.perf_counter() - started
+
+
+def refresh_award_eligibility(club_ids=None, award_ids=None):
+    """Recompute award_eligibility rows.
+
+    With no arguments the whole table is rebuilt; otherwise only the rows of
+    the given clubs (against every award) and awards (against every club) are
+    replaced. Returns the number of rows written.
+    """
+    full = club_ids is None and award_ids is None
+    club_ids = set(club_ids or ())
+    award_ids = set(award_ids or ())
+    all_clubs = Club.query.all() if full or award_ids else Club.query.filter(Club.id.in_(club_ids)).all()
+    all_awards = Award.query.all() if full or club_ids else Award.query.filter(Award.id.in_(award_ids)).all()
+
+    pairs = set()
+    for award in all_awards:
+        rule = get_award_eligibility_predicate(award.name)
+        clubs = all_clubs if (full or award.id in award_ids) else [c for c in all_clubs if c.id in club_ids]
+        pairs.update((award.id, club.id) for club in clubs if rule(club))
+
+    if full:
+        db.session.execute(db.delete(AwardEligibility))
+    else:
+        db.session.execute(db.delete(AwardEligibility).where(db.or_(
+            AwardEligibility.club_id.in_(club_ids), AwardEligibility.award_id.in_(award_ids))))
+    if pairs:
+        db.session.execute(db.insert(AwardEligibility), [{'award_id': a, 'club_id': c} for a, c in pairs])
+    bump_eligibility_version(db.session.connection())
     db.session.commit()
+    invalidate_pages('award')
+    # eligibility is not part of the snapshot key, so affected rankings are rebuilt in place
+    queue_ranking_refresh(None if full or club_ids else award_ids, force=True)
+    return len(pairs)
+
+
+_eligibility_sync_lock = threading.Lock()
+
+
+def sync_award_eligibility(club_ids=None, award_ids=None):
+    """Refresh eligibility (fully, or for the given clubs/awards) and create missing auto-nominations."""
+    with _eligibility_sync_lock:
+        refresh_award_eligibility(club_ids, award_ids)
+        return auto_nominate_all_awards()
+
+
+class BackgroundJob:
+    """Runs ``fn`` on a daemon worker thread.
+
+    Triggers that arrive while a run is pending or in progress are coalesced
+    into one follow-up run, so bursts of changes cost a single recompute.
+    With ``BACKGROUND_JOBS`` off (CLI commands, tests) triggers are ignored
+    and the caller is expected to do the work itself.
+    """
+
+    def __init__(self, fn, name):
+        self._fn = fn
+        self._name = name
+        self._pending = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    def trigger(self):
+        """Schedule a run inside the current application's context."""
+        if not current_app.config.get('BACKGROUND_JOBS', True):
+            return
+        self._app = current_app._get_current_object()
+        self._pending.set()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            try:
+                with self._app.app_context():
+                    self._fn()
+            except Exception:
+                log.exception('Background job %s failed', self._name)
+
+
+_pending_eligibility = {'clubs': set(), 'awards': set()}
+_pending_eligibility_lock = threading.Lock()
+
+
+def queue_eligibility_sync(club_ids=(), award_ids=()):
+    with _pending_eligibility_lock:
+        _pending_eligibility['clubs'].update(club_ids)
+        _pending_eligibility['awards'].update(award_ids)
+    eligibility_sync_job.trigger()
+
+
+def _run_eligibility_sync():
+    with _pending_eligibility_lock:
+        club_ids = set(_pending_eligibility['clubs'])
+        award_ids = set(_pending_eligibility['awards'])
+        _pending_eligibility['clubs'].clear()
+        _pending_eligibility['awards'].clear()
+    if not club_ids and not award_ids:
+        return
+    sync_award_eligibility(club_ids, award_ids)
+
+
+eligibility_sync_job = BackgroundJob(_run_eligibility_sync, 'eligibility-sync')
+
+
+def _eligibility_fields_changed(obj, fields):
+    attrs = db.inspect(obj).attrs
+    return any(attrs[f].history.has_changes() for f in fields)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_eligibility_changes(session, flush_context):
+    changes = session.info.setdefault('eligibility_changes', {'clubs': set(), 'awards': set()})
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        if isinstance(obj, Club):
+            key, fields = 'clubs', CLUB_ELIGIBILITY_FIELDS
+        elif isinstance(obj, Award):
+            key, fields = 'awards', AWARD_ELIGIBILITY_FIELDS
+        else:
+            continue
+        if obj in session.dirty and not _eligibility_fields_changed(obj, fields):
+            continue
+        changes[key].add(obj.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _schedule_eligibility_sync(session):
+    changes = session.info.pop('eligibility_changes', None)
+    if changes and (changes['clubs'] or changes['awards']):
+        # club and award names/categories appear on every cached public page
+        invalidate_pages('clubs', 'awards', 'award', 'results')
+        queue_eligibility_sync(changes['clubs'], changes['awards'])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_eligibility_changes(session):
+    session.info.pop('eligibility_changes', None)
+
+# -------- Votes --------
+
+def unique_voter_index_missing() -> bool:
+    """True while feedback_vote lacks the (award_id, voter_hash) unique index, i.e. before `flask init-db`.
+
+    Only a present index is remembered, so the check stops once migrations have run.
+    """
+    known = current_app.extensions.get('unique_voter_index')
+    if known:
+        return False
+    indexes = db.inspect(db.engine).get_indexes('feedback_vote')
+    present = any(ix['name'] == 'ux_feedback_vote_award_voter' for ix in indexes)
+    if not present and known is None:
+        log.warning('feedback_vote has no unique voter index; run `flask init-db`. Checking tokens before each vote.')
+    current_app.extensions['unique_voter_index'] = present
+    return not present
+
+
+def record_vote(award_id: int, club_id: int, voter_hash=None) -> bool:
+    """Store a vote and its tally in one transaction; False if the token already voted.
+
+    The unique index rejects repeated tokens; until it exists they are looked up first.
+    """
+    if voter_hash and unique_voter_index_missing() and db.session.query(FeedbackVote.id).filter_by(
+            award_id=award_id, voter_hash=voter_hash).first() is not None:
+        return False
+    db.session.add(FeedbackVote(award_id=award_id, club_id=club_id, voter_hash=voter_hash))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return False
+    return True
+
+
+class VoteWriter:
+    """Group-commits votes submitted from request threads.
+
+    ``submit`` queues a vote and blocks until the batch holding it is
+    committed. A single writer thread flushes a batch once it holds
+    ``batch_size`` votes or ``interval_ms`` after its first vote arrived, so a
+    burst of POSTs costs a handful of SQLite transactions instead of one each
+    and request threads never contend for the write lock.
+    """
+
+    def __init__(self, app, batch_size=200, interval_ms=20):
+        self.app = app
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, award_id: int, club_id: int, voter_hash=None, timeout=10.0) -> bool:
+        """Queue a vote; returns False if the token already voted for the award.
+
+        Raises concurrent.futures.TimeoutError if the vote is not committed
+        within ``timeout`` seconds; it stays queued and is still written.
+        """
+        # End the caller's read transaction first: its SHARED lock would block the writer's commit
+        db.session.close()
+        future = Future()
+        self._queue.put((award_id, club_id, voter_hash, future))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='vote-writer', daemon=True)
+                self._thread.start()
+        return future.result(timeout)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.interval_ms / 1000.0
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                with self.app.app_context():
+                    results = self._write([vote[:3] for vote in batch])
+            except Exception as exc:
+                log.exception('Vote batch of %d failed', len(batch))
+                for *_, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (*_, future), accepted in zip(batch, results):
+                future.set_result(accepted)
+
+    def _write(self, votes):
+        # (award_id, voter_hash) pairs already stored, plus those claimed earlier in this batch
+        tokens = {(a, h) for a, _, h in votes if h}
+        taken = set()
+        if tokens:
+            taken = set(db.session.query(FeedbackVote.award_id, FeedbackVote.voter_hash).filter(
+                FeedbackVote.award_id.in_({a for a, _ in tokens}),
+                FeedbackVote.voter_hash.in_({h for _, h in tokens})))
+        results = []
+        for award_id, club_id, voter_hash in votes:
+            if voter_hash and (award_id, voter_hash) in taken:
+                results.append(False)
+                continue
+            if voter_hash:
+                taken.add((award_id, voter_hash))
+            db.session.add(FeedbackVote(award_id=award_id, club_id=club_id, voter_hash=voter_hash))
+            results.append(True)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # a vote committed outside the writer raced this batch; settle it one vote at a time
+            db.session.rollback()
+            results = [ok and record_vote(*vote) for vote, ok in zip(votes, results)]
+        return results
+
 
 # -------- Scoring helpers --------
 
@@ -256,170 +509,993 @@ def normalize(values):
     return [(v - vmin) / (vmax - vmin) for v in values]
 
 
+# METRICS_DATA_DIR points the metric sources at another dataset (e.g. one from generate_synthetic_data --clubs)
+DATA_DIR = os.environ.get('METRICS_DATA_DIR') or os.path.join(os.path.dirname(__file__), 'data')
+REPORTS_DIR = os.path.join(DATA_DIR, 'reports')
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'metrics.snapshot')
+METRIC_SOURCES = {
+    'instagram': os.path.join(DATA_DIR, 'instagram_monthly.csv'),
+    'whatsapp': os.path.join(DATA_DIR, 'whatsapp_monthly.csv'),
+    'attendance': os.path.join(DATA_DIR, 'attendance_events.csv'),
+    'awards': os.path.join(DATA_DIR, 'awards_won.csv'),
+}
+
+
+def _report_files():
+    """Yield (club_id, path) for every data/reports/club_<id>.txt file."""
+    if not os.path.isdir(REPORTS_DIR):
+        return
+    for entry in os.scandir(REPORTS_DIR):
+        name = entry.name
+        if not (name.startswith('club_') and name.endswith('.txt')):
+            continue
+        try:
+            cid = int(name[len('club_'):-len('.txt')])
+        except ValueError:
+            continue
+        yield cid, entry.path
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _metrics_sources_signature():
+    """Size/mtime of every file `_read_synthetic_metrics` depends on."""
+    csvs = tuple((key, _file_signature(path)) for key, path in sorted(METRIC_SOURCES.items()))
+    reports = tuple(sorted((cid, _file_signature(path)) for cid, path in _report_files()))
+    return csvs, reports
+
+
+def _metrics_sources_digest():
+    return hashlib.sha1(repr(_metrics_sources_signature()).encode()).digest()
+
+
+@phase('metrics.signature')
+def _metrics_cache_key():
+    return _metrics_sources_signature(), _file_signature(SNAPSHOT_PATH)
+
+
+report_score_cache = ReportScoreCache()
+
+
+def _aggregate_synthetic_metrics(parallel=False):
+    with phase('metrics.csv'):
+        agg, stats = aggregate_csv_metrics(METRIC_SOURCES)
+    log.info('Synthetic metrics loaded: %s', format_stats(stats))
+    with phase('metrics.reports'):
+        report_scores = report_score_cache.scores(_report_files(), parallel=parallel)
+
+    return {cid: _finalize_metrics(agg[cid], report_scores.get(cid, 0.0)) for cid in set(agg) | set(report_scores)}
+
+
+def _finalize_metrics(m, report_score):
+    """Per-club metrics dict from summed totals (sentiment sum/count become an average)."""
+    cnt = m['whatsapp_sentiment_cnt']
+    return {
+        'instagram_posts': m['instagram_posts'],
+        'instagram_likes': m['instagram_likes'],
+        'instagram_reach': m['instagram_reach'],
+        'whatsapp_messages': m['whatsapp_messages'],
+        'whatsapp_sentiment': (m['whatsapp_sentiment_sum'] / cnt) if cnt > 0 else 0.0,
+        'awards_won': m['awards_won'],
+        'offline_attendance': m['offline_attendance'],
+        'report_score': report_score,
+    }
+
+
+def _read_synthetic_metrics():
+    """Aggregated metrics from the binary snapshot when it matches the sources, else from CSV/reports."""
+    if read_digest(SNAPSHOT_PATH) == _metrics_sources_digest():
+        try:
+            with phase('metrics.snapshot'):
+                return MetricsSnapshot(SNAPSHOT_PATH)
+        except (OSError, SnapshotError):
+            log.warning('Ignoring unreadable metrics snapshot %s', SNAPSHOT_PATH, exc_info=True)
+    return _aggregate_synthetic_metrics()
+
+
+def write_metrics_snapshot():
+    """Compile the CSV/report aggregates into data/metrics.snapshot; returns the club count.
+
+    Only called from CLI commands and scripts, so it may score reports on a process pool.
+    """
+    digest = _metrics_sources_digest()
+    metrics = _aggregate_synthetic_metrics(parallel=True)
+    write_snapshot(SNAPSHOT_PATH, metrics, digest)
+    return len(metrics)
+
+
+class MetricsCache:
+    """In-memory copy of the aggregated synthetic metrics.
+
+    The cached mapping is reused until the size or mtime of any source file
+    (the CSVs under data/, data/reports/club_<id>.txt and the binary
+    snapshot) changes, or a report file appears/disappears. Callers must
+    treat the result as read-only.
+    """
+
+    def __init__(self, loader, signature):
+        self._loader = loader
+        self._signature = signature
+        self._lock = threading.Lock()
+        self._key = None
+        self._value = None
+        self.hits = 0
+        self.misses = 0
+        self.loaded_at = None
+
+    def get(self):
+        key = self._signature()
+        with self._lock:
+            if self._value is not None and key == self._key:
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            self._value = self._loader()
+            self._key = key
+            self.loaded_at = datetime.utcnow()
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
+            self._value = None
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'loaded_at': self.loaded_at}
+
+
+metrics_cache = MetricsCache(_read_synthetic_metrics, _metrics_cache_key)
+
+
+@phase('metrics')
 def _load_synthetic_metrics():
-    base_dir = os.path.join(os.path.dirname(__file__), 'data')
-    paths = {
-        'instagram': os.path.join(base_dir, 'instagram_monthly.csv'),
-        'whatsapp': os.path.join(base_dir, 'whatsapp_monthly.csv'),
-        'attendance': os.path.join(base_dir, 'attendance_events.csv'),
-        'awards': os.path.join(base_dir, 'awards_won.csv'),
+    return metrics_cache.get()
+
+
+# -------- Time windows (monthly rollup) --------
+
+ROLLUP_COLUMNS = tuple(new_totals())
+
+
+def month_index(value) -> int:
+    """Months since year 0 for a (year, month) pair, a date/datetime or a 'YYYY-MM' string.
+
+    An int is taken to be such an index already.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        year, month = value.split('-')[:2]
+    elif hasattr(value, 'year'):
+        year, month = value.year, value.month
+    else:
+        year, month = value
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(f'month out of range: {value!r}')
+    return year * 12 + month - 1
+
+
+class MonthlyRollup:
+    """Per-club prefix sums over the (club, month) metric cells.
+
+    Each club keeps its months in order with running totals of every column,
+    so the sum over any window is two bisections and a subtraction; raw
+    events are never rescanned.
+    """
+
+    def __init__(self, cells):
+        by_club = defaultdict(list)
+        for (cid, year, month), cell in cells:
+            by_club[cid].append((year * 12 + month - 1, tuple(cell[c] for c in ROLLUP_COLUMNS)))
+        self._months = {}
+        self._prefix = {}
+        for cid, entries in by_club.items():
+            entries.sort(key=lambda e: e[0])
+            running = (0,) * len(ROLLUP_COLUMNS)
+            prefix = [running]
+            for _, values in entries:
+                running = tuple(a + b for a, b in zip(running, values))
+                prefix.append(running)
+            self._months[cid] = [m for m, _ in entries]
+            self._prefix[cid] = prefix
+
+    def __len__(self):
+        return sum(len(months) for months in self._months.values())
+
+    def totals(self, club_id, start=None, end=None) -> dict:
+        """Summed columns for months ``start``..``end`` (month indexes, inclusive; None is open-ended)."""
+        months = self._months.get(club_id)
+        if not months:
+            return new_totals()
+        lo = 0 if start is None else bisect.bisect_left(months, start)
+        hi = len(months) if end is None else bisect.bisect_right(months, end)
+        if hi <= lo:
+            return new_totals()
+        prefix = self._prefix[club_id]
+        return dict(zip(ROLLUP_COLUMNS, (b - a for a, b in zip(prefix[lo], prefix[hi]))))
+
+    def span(self):
+        """(first, last) month index present, or None when empty."""
+        if not self._months:
+            return None
+        return min(m[0] for m in self._months.values()), max(m[-1] for m in self._months.values())
+
+
+@phase('metrics.rollup')
+def _read_monthly_rollup():
+    """The club_metrics_monthly table, or (before the first CSV load) the CSVs folded per month in memory."""
+    table = ClubMetricsMonthly.__table__
+    rows = db.session.execute(db.select(table)).mappings().all()
+    if rows:
+        return MonthlyRollup(((r['club_id'], r['year'], r['month']), r) for r in rows)
+    monthly, _ = aggregate_monthly_metrics(METRIC_SOURCES)
+    return MonthlyRollup(monthly.items())
+
+
+def _monthly_rollup_key():
+    # every CSV load touches the watermarks; the CSV signatures cover the in-memory fallback
+    stamp = db.session.query(db.func.count(IngestWatermark.source), db.func.max(IngestWatermark.updated_at)).one()
+    return tuple(stamp), _metrics_sources_signature()[0]
+
+
+monthly_rollup_cache = MetricsCache(_read_monthly_rollup, _monthly_rollup_key)
+
+
+class WindowedMetrics:
+    """Synthetic metrics summed over a window of months, read like the all-time mapping (``get``).
+
+    Report scores carry no date, so they stay all-time.
+    """
+
+    def __init__(self, rollup, synth, start, end):
+        self._rollup = rollup
+        self._synth = synth
+        self._start = start
+        self._end = end
+
+    def get(self, club_id, default=None):
+        report_score = self._synth.get(club_id, {}).get('report_score', 0.0)
+        return _finalize_metrics(self._rollup.totals(club_id, self._start, self._end), report_score)
+
+
+def _windowed_metrics(window):
+    """Metrics restricted to ``window`` = (start, end), each a month (inclusive) or None."""
+    start, end = (None if w is None else month_index(w) for w in window)
+    return WindowedMetrics(monthly_rollup_cache.get(), _load_synthetic_metrics(), start, end)
+
+
+def _metrics_for(window):
+    return _load_synthetic_metrics() if window is None else _windowed_metrics(window)
+
+
+def _vote_counts(award_id=None):
+    """Vote counts as {award_id: {club_id: count}}, read from the vote_tally table."""
+    query = db.session.query(VoteTally.award_id, VoteTally.club_id, VoteTally.count)
+    if award_id is not None:
+        query = query.filter(VoteTally.award_id == award_id)
+    counts = defaultdict(dict)
+    for aid, cid, n in query:
+        counts[aid][cid] = n
+    return counts
+
+
+def _metric_columns(clubs, synth):
+    """Raw synthetic metrics as per-metric lists aligned with ``clubs``."""
+    rows = [synth.get(c.id, {}) for c in clubs]
+
+    def col(key):
+        return [r.get(key, 0) for r in rows]
+    return {
+        'posts': col('instagram_posts'),
+        'likes': col('instagram_likes'),
+        'reach': col('instagram_reach'),
+        'messages': col('whatsapp_messages'),
+        'sentiment': col('whatsapp_sentiment'),
+        'awards_won': col('awards_won'),
+        'offline_attendance': col('offline_attendance'),
+        'report_score': col('report_score'),
     }
-    agg = defaultdict(lambda: {
-        'instagram_posts': 0,
-        'instagram_likes': 0,
-        'instagram_reach': 0,
-        'whatsapp_messages': 0,
-        'whatsapp_sentiment_sum': 0.0,
-        'whatsapp_sentiment_cnt': 0,
-        'awards_won': 0,
-        'offline_attendance': 0,
-        'report_score_sum': 0.0,
-        'report_score_cnt': 0,
-    })
-
-    def _read(path):
-        if not os.path.exists(path):
-            return []
-        with open(path, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
-
-    for r in _read(paths['instagram']):
-        cid = int(r['club_id'])
-        agg[cid]['instagram_posts'] += int(r['posts'])
-        agg[cid]['instagram_likes'] += int(r['likes'])
-        agg[cid]['instagram_reach'] += int(r['reach'])
-
-    for r in _read(paths['whatsapp']):
-        cid = int(r['club_id'])
-        agg[cid]['whatsapp_messages'] += int(r['messages'])
-        agg[cid]['whatsapp_sentiment_sum'] += float(r['sentiment'])
-        agg[cid]['whatsapp_sentiment_cnt'] += 1
-
-    for r in _read(paths['attendance']):
-        cid = int(r['club_id'])
-        agg[cid]['offline_attendance'] += int(r['attendees'])
-
-    for r in _read(paths['awards']):
-        cid = int(r['club_id'])
-        agg[cid]['awards_won'] += 1
-
-    # parse textual reports (simple heuristic scoring)
-    reports_dir = os.path.join(base_dir, 'reports')
-    if os.path.isdir(reports_dir):
-        positive_keywords = [
-            'successful', 'collaboration', 'won', 'first place', 'mentorship', 'improved', 'impact',
-            'innovation', 'praise', 'excellent', 'record attendance', 'strong engagement', 'high satisfaction'
-        ]
-        negative_keywords = [
-            'postponements', 'lower turnout', 'challenges', 'conflicts', 'cancelled', 'delay'
-        ]
-        for club in Club.query.all():
-            path = os.path.join(reports_dir, f'club_{club.id}.txt')
-            if not os.path.exists(path):
-                continue
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    text = f.read().lower()
-                pos = sum(text.count(k) for k in positive_keywords)
-                neg = sum(text.count(k) for k in negative_keywords)
-                score = max(0.0, min(1.0, (pos - 0.5 * neg) / 10.0))
-                agg[club.id]['report_score_sum'] += score
-                agg[club.id]['report_score_cnt'] += 1
-            except Exception:
-                continue
 
-    # finalize sentiment average
-    finalized = {}
-    for cid, m in agg.items():
-        cnt = m['whatsapp_sentiment_cnt']
-        avg_s = (m['whatsapp_sentiment_sum'] / cnt) if cnt > 0 else 0.0
-        finalized[cid] = {
-            'instagram_posts': m['instagram_posts'],
-            'instagram_likes': m['instagram_likes'],
-            'instagram_reach': m['instagram_reach'],
-            'whatsapp_messages': m['whatsapp_messages'],
-            'whatsapp_sentiment': avg_s,
-            'awards_won': m['awards_won'],
-            'offline_attendance': m['offline_attendance'],
-            'report_score': (m['report_score_sum'] / m['report_score_cnt']) if m['report_score_cnt'] > 0 else 0.0,
-        }
-    return finalized
 
+def _normalize_array(arr):
+    """Vectorised counterpart of ``normalize`` for NumPy arrays."""
+    if arr.size == 0:
+        return arr.astype(float)
+    vmin, vmax = arr.min(), arr.max()
+    if vmax == vmin:
+        return np.zeros(arr.shape)
+    return (arr - vmin) / (vmax - vmin)
 
-def compute_rankings_for_award(award: Award):
-    predicate = get_award_eligibility_predicate(award.name)
-    eligible = [c for c in Club.query.all() if predicate(c)]
-    if not eligible:
-        return []
 
-    synth = _load_synthetic_metrics()
-    vote_counts = {c.id: FeedbackVote.query.filter_by(award_id=award.id, club_id=c.id).count() for c in eligible}
-
-    posts = [synth.get(c.id, {}).get('instagram_posts', 0) for c in eligible]
-    likes = [synth.get(c.id, {}).get('instagram_likes', 0) for c in eligible]
-    reach = [synth.get(c.id, {}).get('instagram_reach', 0) for c in eligible]
-    msgs = [synth.get(c.id, {}).get('whatsapp_messages', 0) for c in eligible]
-    senti = [synth.get(c.id, {}).get('whatsapp_sentiment', 0) for c in eligible]
-    awards_won = [synth.get(c.id, {}).get('awards_won', 0) for c in eligible]
-    votes = [vote_counts[c.id] for c in eligible]
-    attend = [synth.get(c.id, {}).get('offline_attendance', 0) for c in eligible]
-
-    n_posts = normalize(posts)
-    n_likes = normalize(likes)
-    n_reach = normalize(reach)
-    n_msgs = normalize(msgs)
-    n_senti = normalize(senti)
-    n_awards = normalize(awards_won)
-    n_votes = normalize(votes)
-    n_attend = normalize(attend)
-    n_reports = normalize([synth.get(c.id, {}).get('report_score', 0) for c in eligible])
+def _take(values, positions):
+    if np is not None and isinstance(values, np.ndarray):
+        return values[positions]
+    return [values[i] for i in positions]
 
-    weights = get_weights()
-    results = []
-    for idx, club in enumerate(eligible):
-        social = (n_posts[idx] + n_likes[idx] + n_reach[idx]) / 3.0
-        whatsapp = (n_msgs[idx] * 0.7) + (n_senti[idx] * 0.3)
-        awards_component = n_awards[idx]
-        feedback_component = n_votes[idx]
-        attendance_component = n_attend[idx]
-        reports_component = n_reports[idx]
-        score = (
+
+def _scalar(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+class RankingFrame:
+    """Column-oriented scores for one award's eligible clubs.
+
+    Normalisation and the weighted sum run as array operations (NumPy when it
+    is installed, plain lists otherwise). Result dicts with ``details``/``raw``
+    are only built by ``rows()`` for the ranks a caller actually needs.
+    ``reweighted()`` reuses the normalised components, so trying other
+    weights costs one weighted sum and a sort.
+    """
+
+    RAW_KEYS = ('posts', 'likes', 'reach', 'messages', 'sentiment', 'awards_won', 'votes', 'offline_attendance', 'report_score')
+
+    def __init__(self, clubs, columns, votes, weights):
+        self.clubs = clubs
+        self.columns = dict(columns, votes=votes)
+        if np is not None:
+            self._components_vectorized()
+        else:
+            self._components_python()
+        self._apply_weights(weights)
+
+    def __len__(self):
+        return len(self.clubs)
+
+    def reweighted(self, weights):
+        """A frame sharing this one's clubs and components, scored with ``weights``."""
+        frame = copy.copy(self)
+        frame._apply_weights(weights)
+        return frame
+
+    def _apply_weights(self, weights):
+        c = self.components
+        if np is not None:
+            self.scores = (
+                weights.w_social * c['social'] +
+                weights.w_whatsapp * c['whatsapp'] +
+                weights.w_awards * c['awards'] +
+                weights.w_feedback * c['feedback'] +
+                weights.w_attendance * c['attendance'] +
+                weights.w_reports * c['reports']
+            )
+            self._keys = np.round(self.scores, 4)
+            return
+        self.scores = [
             weights.w_social * social +
             weights.w_whatsapp * whatsapp +
             weights.w_awards * awards_component +
             weights.w_feedback * feedback_component +
             weights.w_attendance * attendance_component +
             weights.w_reports * reports_component
-        )
-        results.append({
-            'club': club,
-            'score': round(score, 4),
-            'details': {
-                'social': round(social, 4),
-                'whatsapp': round(whatsapp, 4),
-                'awards': round(awards_component, 4),
-                'feedback': round(feedback_component, 4),
-                'attendance': round(attendance_component, 4),
-                'reports': round(reports_component, 4),
-                'raw': {
-                    'posts': posts[idx], 'likes': likes[idx], 'reach': reach[idx],
-                    'messages': msgs[idx], 'sentiment': senti[idx], 'awards_won': awards_won[idx],
-                    'votes': votes[idx], 'offline_attendance': attend[idx], 'report_score': synth.get(club.id, {}).get('report_score', 0)
-                }
-            }
-        })
-
-    results.sort(key=lambda r: r['score'], reverse=True)
-    for i, r in enumerate(results, start=1):
-        r['rank'] = i
-    return results
+            for social, whatsapp, awards_component, feedback_component, attendance_component, reports_component
+            in zip(c['social'], c['whatsapp'], c['awards'], c['feedback'], c['attendance'], c['reports'])
+        ]
+        self._keys = [round(score, 4) for score in self.scores]
+
+    def _components_vectorized(self):
+        cols = {key: np.asarray(values) for key, values in self.columns.items()}
+        n = {key: _normalize_array(arr) for key, arr in cols.items()}
+        c = {
+            'social': (n['posts'] + n['likes'] + n['reach']) / 3.0,
+            'whatsapp': (n['messages'] * 0.7) + (n['sentiment'] * 0.3),
+            'awards': n['awards_won'],
+            'feedback': n['votes'],
+            'attendance': n['offline_attendance'],
+            'reports': n['report_score'],
+        }
+        self.columns = cols
+        self.components = c
+
+    def _components_python(self):
+        n = {key: normalize(values) for key, values in self.columns.items()}
+        c = {
+            'social': [(a + b + d) / 3.0 for a, b, d in zip(n['posts'], n['likes'], n['reach'])],
+            'whatsapp': [(m * 0.7) + (s * 0.3) for m, s in zip(n['messages'], n['sentiment'])],
+            'awards': n['awards_won'],
+            'feedback': n['votes'],
+            'attendance': n['offline_attendance'],
+            'reports': n['report_score'],
+        }
+        self.components = c
+
+    def row(self, idx, rank):
+        details = {name: round(float(values[idx]), 4) for name, values in self.components.items()}
+        details['raw'] = {key: _scalar(self.columns[key][idx]) for key in self.RAW_KEYS}
+        return {
+            'club': self.clubs[idx],
+            'score': round(float(self.scores[idx]), 4),
+            'details': details,
+            'rank': rank,
+        }
+
+    def ranked(self, k=None):
+        """Positions of the ``k`` best clubs (all when ``k`` is None), best first.
+
+        Ties on the rounded score keep eligibility order. For ``k`` smaller
+        than the frame only the top ``k`` are selected (argpartition / heap)
+        instead of sorting every club.
+        """
+        n = len(self.clubs)
+        if k is None or k >= n:
+            if np is not None:
+                return np.argsort(-self._keys, kind='stable').tolist()
+            return sorted(range(n), key=lambda i: self._keys[i], reverse=True)
+        if k <= 0:
+            return []
+        if np is not None:
+            keys = self._keys
+            threshold = np.partition(keys, n - k)[n - k]
+            above = np.flatnonzero(keys > threshold)
+            ties = np.flatnonzero(keys == threshold)[:k - above.size]
+            picked = np.concatenate((above, ties))
+            return picked[np.lexsort((picked, -keys[picked]))].tolist()
+        return heapq.nsmallest(k, range(n), key=lambda i: (-self._keys[i], i))
+
+    def rows(self, start=0, stop=None):
+        """Result dicts for ranks ``start + 1`` .. ``stop``, best first."""
+        positions = self.ranked(stop)[start:stop]
+        return [self.row(idx, rank) for rank, idx in enumerate(positions, start=start + 1)]
+
+
+def _award_frame(award: Award, window=None):
+    with phase('rank.eligibility'):
+        eligible = eligible_clubs_for_award(award.id)
+    if not eligible:
+        return None
+
+    with phase('rank.metrics'):
+        synth = _metrics_for(window)
+    with phase('rank.votes'):
+        vote_counts = _vote_counts(award.id).get(award.id, {})
+    votes = [vote_counts.get(c.id, 0) for c in eligible]
+    with phase('rank.score'):
+        return RankingFrame(eligible, _metric_columns(eligible, synth), votes, get_weights())
+
+
+def compute_rankings_for_award(award: Award, top_k=None, offset=0, window=None):
+    """Ranked clubs for ``award``; with ``top_k`` only ranks offset+1..offset+top_k are built.
+
+    ``window=(start, end)`` limits the CSV metrics to those months (see month_index).
+    """
+    frame = _award_frame(award, window)
+    if frame is None:
+        return []
+    with phase('rank.rows'):
+        return frame.rows(offset, None if top_k is None else offset + top_k)
+
+
+def compute_rankings_page(award: Award, limit=25, offset=0, window=None):
+    """One page of rankings plus the total number of eligible clubs."""
+    frame = _award_frame(award, window)
+    with phase('rank.rows'):
+        rows = frame.rows(offset, offset + limit) if frame is not None else []
+    return {'rankings': rows, 'total': len(frame) if frame is not None else 0, 'offset': offset, 'limit': limit}
+
+
+def compute_all_rankings(awards=None, top_k=None, window=None):
+    """Rank every award in one pass; returns {award_id: rankings}.
+
+    Clubs, metrics, weights and vote counts are loaded once and shared across
+    awards, so the result for each award is identical to
+    ``compute_rankings_for_award`` at a fraction of the queries.
+    """
+    awards = Award.query.all() if awards is None else awards
+    clubs = Club.query.order_by(Club.id).all()
+    index = eligibility_index()
+    synth = _metrics_for(window)
+    weights = get_weights()
+    vote_counts = _vote_counts()
+    columns = _metric_columns(clubs, synth)
+    if np is not None:
+        columns = {key: np.asarray(values) for key, values in columns.items()}
+
+    rankings = {}
+    for award in awards:
+        eligible_ids = index.get(award.id, ())
+        mask = [i for i, c in enumerate(clubs) if c.id in eligible_ids]
+        if not mask:
+            rankings[award.id] = []
+            continue
+        eligible = [clubs[i] for i in mask]
+        award_columns = {key: _take(values, mask) for key, values in columns.items()}
+        award_votes = vote_counts.get(award.id, {})
+        votes = [award_votes.get(c.id, 0) for c in eligible]
+        rankings[award.id] = RankingFrame(eligible, award_columns, votes, weights).rows(0, top_k)
+    return rankings
+
+
+# -------- Ranking snapshots --------
+
+RANKING_SNAPSHOTS_KEPT = 2  # per award; older snapshots are deleted after each refresh
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()
+
+
+def _weights_version(weights: EvaluationWeights) -> str:
+    return _digest((weights.w_social, weights.w_whatsapp, weights.w_awards, weights.w_feedback,
+                    weights.w_attendance, weights.w_reports))
+
+
+def _votes_versions(award_ids):
+    """{award_id: digest of its vote tallies} in one query over vote_tally."""
+    tallies = defaultdict(list)
+    query = (db.session.query(VoteTally.award_id, VoteTally.club_id, VoteTally.count)
+             .filter(VoteTally.award_id.in_(award_ids), VoteTally.count > 0)
+             .order_by(VoteTally.award_id, VoteTally.club_id))
+    for aid, cid, n in query:
+        tallies[aid].append((cid, n))
+    return {aid: _digest(tallies.get(aid, [])) for aid in award_ids}
+
+
+def ranking_input_versions(award_ids):
+    """Current snapshot key (award_id, weights, votes, metrics versions) for each award."""
+    weights_version = _weights_version(get_weights())
+    metrics_version = _digest(_metrics_cache_key())
+    votes = _votes_versions(award_ids)
+    return {aid: (aid, weights_version, votes[aid], metrics_version) for aid in award_ids}
+
+
+def latest_ranking_snapshot(award_id: int):
+    return (RankingSnapshot.query.filter_by(award_id=award_id)
+            .order_by(RankingSnapshot.computed_at.desc(), RankingSnapshot.id.desc()).first())
+
+
+def _store_ranking_snapshot(award: Award, key):
+    started = time.perf_counter()
+    frame = _award_frame(award)
+    rows = frame.rows() if frame is not None else []
+    stale = RankingSnapshot.query.filter_by(award_id=award.id).order_by(
+        RankingSnapshot.computed_at.desc(), RankingSnapshot.id.desc()).offset(RANKING_SNAPSHOTS_KEPT - 1).all()
+    stale += RankingSnapshot.query.filter_by(award_id=award.id, weights_version=key[1], votes_version=key[2],
+                                             metrics_version=key[3]).all()
+    stale_ids = {s.id for s in stale}
+    if stale_ids:
+        db.session.execute(db.delete(RankingSnapshotRow).where(RankingSnapshotRow.snapshot_id.in_(stale_ids)))
+        db.session.execute(db.delete(RankingSnapshot).where(RankingSnapshot.id.in_(stale_ids)))
+    snapshot = RankingSnapshot(award_id=award.id, weights_version=key[1], votes_version=key[2],
+                               metrics_version=key[3], total=len(rows))
+    db.session.add(snapshot)
+    db.session.flush()
+    if rows:
+        db.session.execute(db.insert(RankingSnapshotRow), [{
+            'snapshot_id': snapshot.id,
+            'rank': r['rank'],
+            'club_id': r['club'].id,
+            'score': r['score'],
+            'details': json.dumps(r['details']),
+        } for r in rows])
+    snapshot.seconds = time.perf_counter() - started
+    db.session.commit()
+    return snapshot
+
+
+_ranking_refresh_lock = threading.Lock()  # one refresh at a time per process; the snapshot key is unique
+
+
+def refresh_ranking_snapshots(award_ids=None, force=False):
+    """Recompute snapshots for awards whose inputs changed (all given awards with ``force``).
+
+    Returns the ids of the awards recomputed.
+    """
+    with _ranking_refresh_lock:
+        query = Award.query if award_ids is None else Award.query.filter(Award.id.in_(award_ids))
+        awards = query.order_by(Award.id).all()
+        keys = ranking_input_versions([a.id for a in awards])
+        refreshed = []
+        for award in awards:
+            key = keys[award.id]
+            if not force:
+                latest = latest_ranking_snapshot(award.id)
+                if latest is not None and latest.key == key:
+                    continue
+            try:
+                _store_ranking_snapshot(award, key)
+            except IntegrityError:
+                # another process stored a snapshot with the same key first
+                db.session.rollback()
+                continue
+            refreshed.append(award.id)
+        return refreshed
+
+
+def ranking_snapshot_page(snapshot: RankingSnapshot, limit, offset=0):
+    """Rows ranked offset+1..offset+limit of a stored snapshot, shaped like compute_rankings_page rows."""
+    stored = (RankingSnapshotRow.query.filter_by(snapshot_id=snapshot.id)
+              .filter(RankingSnapshotRow.rank > offset, RankingSnapshotRow.rank <= offset + limit)
+              .order_by(RankingSnapshotRow.rank).all())
+    clubs = {c.id: c for c in Club.query.filter(Club.id.in_([r.club_id for r in stored]))} if stored else {}
+    return [{'club': clubs[r.club_id], 'score': r.score, 'details': json.loads(r.details), 'rank': r.rank}
+            for r in stored if r.club_id in clubs]
+
+
+def format_age(moment: datetime) -> str:
+    """'42s', '5m' or '3h 10m' since ``moment`` (naive UTC)."""
+    seconds = max(int((datetime.utcnow() - moment).total_seconds()), 0)
+    if seconds < 60:
+        return f'{seconds}s'
+    if seconds < 3600:
+        return f'{seconds // 60}m'
+    return f'{seconds // 3600}h {seconds % 3600 // 60}m'
+
+
+_pending_rankings = {'awards': set(), 'all': False, 'force': False}
+_pending_rankings_lock = threading.Lock()
+
+
+def queue_ranking_refresh(award_ids=None, force=False):
+    """Ask ranking_refresh_job to bring the given awards' snapshots (all when None) up to date."""
+    with _pending_rankings_lock:
+        if award_ids is None:
+            _pending_rankings['all'] = True
+        else:
+            _pending_rankings['awards'].update(award_ids)
+        _pending_rankings['force'] |= force
+    ranking_refresh_job.trigger()
+
+
+def _run_ranking_refresh():
+    with _pending_rankings_lock:
+        award_ids = None if _pending_rankings['all'] else set(_pending_rankings['awards'])
+        force = _pending_rankings['force']
+        _pending_rankings.update(awards=set(), all=False, force=False)
+    if award_ids is not None and not award_ids:
+        return
+    refresh_ranking_snapshots(award_ids, force=force)
+
+
+ranking_refresh_job = BackgroundJob(_run_ranking_refresh, 'ranking-refresh')
+
+
+# Votes are deliberately not tracked: rebuilding an award's snapshot on every vote commit would compete
+# with the votes for the write lock during a spike. A snapshot outdated by votes is rebuilt when it is
+# next read instead (admin rankings page, current_ranking_snapshot), at most once per read.
+@event.listens_for(Session, 'after_flush')
+def _track_ranking_inputs(session, flush_context):
+    if any(isinstance(obj, EvaluationWeights)
+           for obj in list(session.new) + list(session.deleted) + list(session.dirty)):
+        session.info['ranking_changes'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _schedule_ranking_refresh(session):
+    if session.info.pop('ranking_changes', False):
+        queue_ranking_refresh()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_ranking_changes(session):
+    session.info.pop('ranking_changes', None)
+
+
+# -------- What-if weights --------
+
+WEIGHT_FIELDS = ('w_social', 'w_whatsapp', 'w_awards', 'w_feedback', 'w_attendance', 'w_reports')
+
+# Detached stand-in for Club inside cached frames, which outlive any one session
+ClubRef = namedtuple('ClubRef', 'id name')
+
+
+def weights_dict(weights) -> dict:
+    return {f: getattr(weights, f) for f in WEIGHT_FIELDS}
+
+
+def parse_weights(data, base) -> EvaluationWeights:
+    """Unsaved EvaluationWeights from ``data``; fields it omits are taken from ``base``.
+
+    Raises ValueError unless ``data`` is a dict of non-negative, finite numbers.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('weights must be an object of weight name to number')
+    values = {}
+    for field in WEIGHT_FIELDS:
+        raw = data.get(field, getattr(base, field))
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be a number')
+        if not 0 <= value < float('inf'):
+            raise ValueError(f'{field} must be a non-negative number')
+        values[field] = value
+    return EvaluationWeights(**values)
+
+
+class ComponentCache:
+    """Normalised component frames per award, for re-scoring under other weights.
+
+    An entry is reused while the award's eligible clubs, vote tallies and
+    metric source files are unchanged, so a what-if request costs one
+    weighted sum and a sort instead of reloading metrics.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, award: Award):
+        """The award's RankingFrame (scored with the live weights), or None without eligible clubs."""
+        key = (eligible_club_ids(award.id), _votes_versions([award.id])[award.id], _digest(_metrics_cache_key()))
+        with self._lock:
+            entry = self._entries.get(award.id)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(award.id)
+                return entry[1]
+        eligible = eligible_clubs_for_award(award.id)
+        if not eligible:
+            return None
+        synth = _load_synthetic_metrics()
+        vote_counts = _vote_counts(award.id).get(award.id, {})
+        frame = RankingFrame([ClubRef(c.id, c.name) for c in eligible], _metric_columns(eligible, synth),
+                             [vote_counts.get(c.id, 0) for c in eligible], get_weights())
+        with self._lock:
+            self._entries[award.id] = (key, frame)
+            self._entries.move_to_end(award.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return frame
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+component_cache = ComponentCache()
+
+
+def what_if_rankings(award: Award, weights, limit=None):
+    """Rankings of ``award`` under ``weights``, with each club's rank under the live weights."""
+    started = time.perf_counter()
+    frame = component_cache.get(award)
+    rows = []
+    if frame is not None:
+        trial = frame.reweighted(weights)
+        live_rank = {idx: rank for rank, idx in enumerate(frame.reweighted(get_weights()).ranked(), start=1)}
+        for rank, idx in enumerate(trial.ranked(limit), start=1):
+            row = trial.row(idx, rank)
+            rows.append({
+                'rank': rank,
+                'live_rank': live_rank[idx],
+                'club_id': row['club'].id,
+                'club': row['club'].name,
+                'score': row['score'],
+                'components': {k: v for k, v in row['details'].items() if k != 'raw'},
+            })
+    return {
+        'award_id': award.id,
+        'weights': weights_dict(weights),
+        'total': len(frame) if frame is not None else 0,
+        'rankings': rows,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def save_weight_set(name: str, weights, user=None) -> WeightSet:
+    weight_set = WeightSet(name=name, created_by=user.id if user else None, **weights_dict(weights))
+    db.session.add(weight_set)
+    db.session.commit()
+    return weight_set
+
+
+def promote_weight_set(weight_set: WeightSet) -> EvaluationWeights:
+    """Copy a saved weight set into the live EvaluationWeights row."""
+    live = get_weights()
+    for field, value in weights_dict(weight_set).items():
+        setattr(live, field, value)
+    weight_set.promoted_at = datetime.utcnow()
+    db.session.commit()  # the commit queues a ranking snapshot refresh for every award
+    log.info('Promoted weight set %d (%s) to the live weights', weight_set.id, weight_set.name)
+    return live
+
+
+def weight_set_json(weight_set: WeightSet) -> dict:
+    return {
+        'id': weight_set.id,
+        'name': weight_set.name,
+        'weights': weights_dict(weight_set),
+        'created_at': weight_set.created_at.isoformat() if weight_set.created_at else None,
+        'promoted_at': weight_set.promoted_at.isoformat() if weight_set.promoted_at else None,
+    }
+
+
+def admin_api(view):
+    """JSON endpoints: 403 with an error body instead of the login redirect/flash."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated or not current_user.is_admin:
+            return jsonify(error='admin login required'), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+# -------- JSON API --------
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+
+
+def _has_bearer(token) -> bool:
+    """True when ``token`` is configured and the request sends ``Authorization: Bearer <token>``."""
+    return bool(token) and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+
+
+def api_reader(view):
+    """Admin-only JSON reads, also open to clients sending the API_TOKEN (e.g. display boards)."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not (_has_bearer(current_app.config['API_TOKEN'])
+                or (current_user.is_authenticated and current_user.is_admin)):
+            return jsonify(error='admin login or API token required'), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def encode_cursor(position: dict) -> str:
+    """Opaque ``?cursor=`` value for the position after the last item of a page."""
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    if not isinstance(position, dict):
+        raise ValueError('invalid cursor')
+    return position
+
+
+def cursor_field(position: dict, key: str, kind=int):
+    """``position[key]`` if it is a ``kind`` (ints: non-negative and 64-bit); raises ValueError otherwise."""
+    value = position.get(key)
+    if not isinstance(value, kind) or isinstance(value, bool) or (kind is int and not 0 <= value < 2 ** 63):
+        raise ValueError('invalid cursor')
+    return value
+
+
+def api_page_args():
+    """(limit, cursor position or None) from ``?limit=&cursor=``; raises ValueError for a bad cursor."""
+    limit = min(max(request.args.get('limit', API_PAGE_SIZE, type=int), 1), API_MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+    if not cursor:
+        return limit, None
+    try:
+        return limit, decode_cursor(cursor)
+    except ValueError:
+        raise ValueError('invalid cursor') from None
+
+
+def api_not_modified(etag, last_modified=None):
+    """A 304 when the client's If-None-Match/If-Modified-Since still match, else None.
+
+    Checked before the body is built, so an unchanged poll costs only the version lookup.
+    """
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return api_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+def api_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def _refresh_snapshot_task(app, award_id: int):
+    """Compute pool task: bring one award's snapshot up to date; returns the latest snapshot id."""
+    with app.app_context():
+        refresh_ranking_snapshots([award_id])
+        snapshot = latest_ranking_snapshot(award_id)
+        return None if snapshot is None else snapshot.id
+
+
+def current_ranking_snapshot(award_id: int, wait=False):
+    """(snapshot or None, stale) for the API.
+
+    A stale snapshot is served as is while the compute pool brings it up
+    to date; concurrent callers for the same inputs share that one
+    computation. Callers wait for it (up to API_WAIT_SECONDS) only when there
+    is no snapshot yet or ``wait`` is set. A None snapshot means the
+    computation is still running; PoolFull means it could not be queued.
+    """
+    key = ranking_input_versions([award_id])[award_id]
+    snapshot = latest_ranking_snapshot(award_id)
+    if snapshot is not None and snapshot.key == key:
+        return snapshot, False
+    pool = current_app.extensions['compute_pool']
+    try:
+        future = pool.submit(('ranking-snapshot',) + key, _refresh_snapshot_task,
+                             current_app._get_current_object(), award_id)
+    except PoolFull:
+        if snapshot is None:
+            raise
+        return snapshot, True
+    if snapshot is not None and not wait:
+        return snapshot, True
+    # End this request's read transaction, so the worker's commit is neither blocked by it nor hidden from it
+    db.session.close()
+    try:
+        snapshot_id = future.result(current_app.config['API_WAIT_SECONDS'])
+    except FutureTimeoutError:
+        return latest_ranking_snapshot(award_id), True
+    return (db.session.get(RankingSnapshot, snapshot_id) if snapshot_id else None), False
+
 
 # Routes
-@app.route('/')
+# -------- Public page cache --------
+
+def invalidate_pages(*keys):
+    """Drop cached public pages after a write they show, e.g. invalidate_pages('results', ('award', 3)).
+
+    This process drops exactly those entries; other workers see the route's
+    page_version move and drop every page of the route on their next request.
+    """
+    if has_app_context() and 'page_cache' in current_app.extensions:
+        current_app.extensions['page_cache'].invalidate(*keys)
+        with db.engine.begin() as conn:
+            bump_page_versions(conn, {key[0] if isinstance(key, tuple) else key for key in keys})
+
+
+def page_version(route: str) -> int:
+    """How often the pages of ``route`` were invalidated, by any process."""
+    return db.session.query(PageVersion.version).filter_by(route=route).scalar() or 0
+
+
+def _viewer() -> str:
+    # the navigation bar differs by role only, so pages are cached once per role
+    if not current_user.is_authenticated:
+        return 'anonymous'
+    return 'admin' if current_user.is_admin else 'student'
+
+
+def cached_page(key):
+    """Serve a public view from the page cache under ``key(**view_args) + (viewer role,)``.
+
+    Responses carry ETag/Last-Modified and revalidate on every request, so
+    unchanged pages cost a 304. Requests with pending flash messages bypass
+    the cache, since those render into the page for one visitor only.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(**kwargs):
+            if '_flashes' in session:
+                return view(**kwargs)
+            cache = current_app.extensions['page_cache']
+            cache_key = key(**kwargs) + (_viewer(),)
+            # read before rendering, so a page is never filed under a version newer than its data
+            version = page_version(cache_key[0]) if cache.ttl > 0 else None
+            page = cache.get(cache_key, version)
+            if page is None:
+                generation = cache.generation
+                rendered = make_response(view(**kwargs))
+                if rendered.status_code != 200:
+                    return rendered
+                page = cache.put(cache_key, rendered.get_data(), rendered.mimetype, generation, version)
+            response = current_app.response_class(page.body, mimetype=page.mimetype)
+            response.set_etag(page.etag)
+            response.last_modified = page.last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add('Cookie')
+            return response.make_conditional(request)
+        return wrapped
+    return decorator
+
+
+@bp.route('/')
 def index():
-    return redirect(url_for('awards'))
+    return redirect(url_for('main.awards'))
 
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         username = request.form['username']
@@ -441,20 +1517,20 @@ def login():
 
         login_user(user)
         flash('Login successful!', 'success')
-        return redirect(url_for('admin_dashboard' if user.is_admin else 'dashboard'))
+        return redirect(url_for('main.admin_dashboard' if user.is_admin else 'main.dashboard'))
 
     # GET
     role = request.args.get('role', 'student')
     return render_template('login.html', current_role=role)
 
-@app.route('/admin/login', methods=['GET', 'POST'])
+@bp.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
     # Use unified login with admin role preselected
     if request.method == 'POST':
-        return redirect(url_for('login') + '?role=admin')
-    return redirect(url_for('login', role='admin'))
+        return redirect(url_for('main.login') + '?role=admin')
+    return redirect(url_for('main.login', role='admin'))
 
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
         username = request.form['username']
@@ -478,79 +1554,84 @@ def register():
         db.session.commit()
         
         flash('Registration successful! Please login.', 'success')
-        return redirect(url_for('login'))
+        return redirect(url_for('main.login'))
     
     return render_template('register.html')
 
-@app.route('/logout')
+@bp.route('/logout')
 @login_required
 def logout():
     logout_user()
     flash('You have been logged out.', 'info')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/dashboard')
+@bp.route('/dashboard')
 @login_required
+@read_only
 def dashboard():
     if current_user.is_admin:
-        return redirect(url_for('admin_dashboard'))
+        return redirect(url_for('main.admin_dashboard'))
     # Declared winners for students to see on their home page
     winners = (
         AwardDecision.query
         .join(Award, AwardDecision.award_id == Award.id)
+        .options(db.contains_eager(AwardDecision.award), db.joinedload(AwardDecision.club))
         .filter(Award.winners_declared == True)
         .all()
     )
     user_nominations = Nomination.query.filter_by(submitted_by=current_user.id).all()
     return render_template('dashboard.html', nominations=user_nominations, winners=winners)
 
-@app.route('/admin/dashboard')
+ADMIN_NOMINATIONS_PER_PAGE = 50
+
+
+@bp.route('/admin/dashboard')
 @login_required
+@read_only
 def admin_dashboard():
     if not current_user.is_admin:
         flash('Access denied. Admin privileges required.', 'error')
-        return redirect(url_for('dashboard'))
+        return redirect(url_for('main.dashboard'))
     
-    clubs = Club.query.all()
-    awards = Award.query.all()
-    nominations = Nomination.query.all()
+    page = max(request.args.get('page', 1, type=int), 1)
+    nominations = (
+        Nomination.query
+        .options(db.joinedload(Nomination.club), db.joinedload(Nomination.award))
+        .order_by(Nomination.submitted_at.desc(), Nomination.id.desc())
+        .paginate(page=page, per_page=ADMIN_NOMINATIONS_PER_PAGE, error_out=False)
+    )
     
     return render_template('admin_dashboard.html', 
-                         clubs=clubs, 
-                         awards=awards, 
-                         nominations=nominations)
-
-@app.route('/clubs')
+                         club_count=Club.query.count(), 
+                         award_count=Award.query.count(), 
+                         nominations=nominations,
+                         approved_count=Nomination.query.filter_by(is_approved=True).count())
+
+@bp.route('/clubs')
+@read_only
+@cached_page(lambda: ('clubs',))
 def clubs():
     clubs = Club.query.all()
     return render_template('clubs.html', clubs=clubs)
 
-@app.route('/awards')
+@bp.route('/awards')
+@read_only
+@cached_page(lambda: ('awards',))
 def awards():
     awards = Award.query.all()
     return render_template('awards.html', awards=awards)
 
-@app.route('/awards/<int:award_id>')
+@bp.route('/awards/<int:award_id>')
+@read_only
+@cached_page(lambda award_id: ('award', award_id))
 def award_detail(award_id: int):
+    # Read-only: eligibility and nominations are maintained by eligibility_sync_job
     award = Award.query.get_or_404(award_id)
-    predicate = get_award_eligibility_predicate(award.name)
-    clubs = Club.query.all()
-    eligible_clubs = [club for club in clubs if predicate(club)]
-
-    for club in eligible_clubs:
-        exists = Nomination.query.filter_by(club_id=club.id, award_id=award.id).first()
-        if not exists:
-            reason = f"Auto-nominated based on eligibility for '{award.name}'."
-            db.session.add(Nomination(club_id=club.id, award_id=award.id, reason=reason))
-    db.session.commit()
-
-    nominations = Nomination.query.filter_by(award_id=award.id).all()
-    club_id_to_nom = {n.club_id: n for n in nominations}
-
-    return render_template('award_detail.html', award=award, eligible_clubs=eligible_clubs, club_id_to_nom=club_id_to_nom)
+    eligible_clubs = eligible_clubs_for_award(award.id)
+    return render_template('award_detail.html', award=award, eligible_clubs=eligible_clubs)
 
 # Restore nominate route
-@app.route('/nominate', methods=['GET', 'POST'])
+@bp.route('/nominate', methods=['GET', 'POST'])
 @login_required
 def nominate():
     if request.method == 'POST':
@@ -563,62 +1644,178 @@ def nominate():
         else:
             db.session.add(Nomination(club_id=club_id, award_id=award_id, reason=reason, submitted_by=current_user.id, is_approved=True))
             db.session.commit()
+            invalidate_pages(('award', int(award_id)))
             flash('Nomination accepted.', 'success')
-            return redirect(url_for('dashboard'))
+            return redirect(url_for('main.dashboard'))
     clubs = Club.query.all()
     awards = Award.query.all()
     return render_template('nominate.html', clubs=clubs, awards=awards)
 
-@app.route('/awards/<int:award_id>/vote', methods=['GET', 'POST'])
+@bp.route('/awards/<int:award_id>/vote', methods=['GET', 'POST'])
 @login_required
 def vote_award(award_id: int):
     award = Award.query.get_or_404(award_id)
-    predicate = get_award_eligibility_predicate(award.name)
-    eligible = [c for c in Club.query.all() if predicate(c)]
 
     if request.method == 'POST':
         club_id = int(request.form['club_id'])
         voter_hash = request.form.get('voter_hash') or None
-        if voter_hash and FeedbackVote.query.filter_by(award_id=award.id, voter_hash=voter_hash).first():
-            flash('You have already voted for this award.', 'error')
-            return redirect(url_for('vote_award', award_id=award.id))
-        if club_id not in [c.id for c in eligible]:
+        if not is_club_eligible(award.id, club_id):
             flash('Invalid selection.', 'error')
-            return redirect(url_for('vote_award', award_id=award.id))
-        vote = FeedbackVote(award_id=award.id, club_id=club_id, voter_hash=voter_hash)
-        db.session.add(vote)
-        db.session.commit()
+            return redirect(url_for('main.vote_award', award_id=award.id))
+        if current_app.config['VOTE_BATCHING']:
+            try:
+                accepted = current_app.extensions['vote_writer'].submit(award.id, club_id, voter_hash)
+            except FutureTimeoutError:
+                # still queued: the writer commits it shortly, so do not ask the voter to try again
+                flash('Your vote was received and is still being recorded.', 'info')
+                return redirect(url_for('main.awards'))
+        else:
+            accepted = record_vote(award.id, club_id, voter_hash)
+        if not accepted:
+            flash('You have already voted for this award.', 'error')
+            return redirect(url_for('main.vote_award', award_id=award.id))
         flash('Thanks for your feedback!', 'success')
-        return redirect(url_for('awards'))
+        return redirect(url_for('main.awards'))
 
-    rankings = compute_rankings_for_award(award) if (current_user.is_authenticated and current_user.is_admin) else None
-    return render_template('vote_award.html', award=award, eligible_clubs=eligible, rankings=rankings)
+    rankings = compute_rankings_for_award(award, top_k=5) if (current_user.is_authenticated and current_user.is_admin) else None
+    return render_template('vote_award.html', award=award, eligible_clubs=eligible_clubs_for_award(award.id), rankings=rankings)
 
-@app.route('/admin/awards/<int:award_id>/rankings')
+ADMIN_RANKINGS_PER_PAGE = 50
+
+
+@bp.route('/admin/awards/<int:award_id>/rankings')
 @login_required
+@read_only
 def admin_award_rankings(award_id: int):
     if not current_user.is_admin:
         flash('Access denied.', 'error')
-        return redirect(url_for('awards'))
+        return redirect(url_for('main.awards'))
     award = Award.query.get_or_404(award_id)
-    rankings = compute_rankings_for_award(award)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = ADMIN_RANKINGS_PER_PAGE
+    offset = (page - 1) * per_page
+    # Optional month range (?from=YYYY-MM&to=YYYY-MM), scored live from the monthly rollup
+    window_args = {k: request.args[k] for k in ('from', 'to') if request.args.get(k)}
+    window = None
+    if window_args:
+        try:
+            window = tuple(month_index(window_args[k]) if k in window_args else None for k in ('from', 'to'))
+        except ValueError:
+            flash('Use YYYY-MM for the month range.', 'error')
+            window, window_args = None, {}
+    # Serve the latest stored snapshot; a stale or missing one is recomputed in the background
+    snapshot = latest_ranking_snapshot(award.id) if window is None else None
+    stale = window is None and (snapshot is None or snapshot.key != ranking_input_versions([award.id])[award.id])
+    if stale:
+        queue_ranking_refresh([award.id])
+    if snapshot is None:
+        ranking_page = compute_rankings_page(award, limit=per_page, offset=offset, window=window)
+        rankings, total_eligible = ranking_page['rankings'], ranking_page['total']
+    else:
+        with phase('rank.snapshot'):
+            rankings, total_eligible = ranking_snapshot_page(snapshot, per_page, offset), snapshot.total
     weights = get_weights()
-    decision = AwardDecision.query.filter_by(award_id=award.id).first()
-    # Raw vote counts per eligible club
-    vote_counts = {}
-    predicate = get_award_eligibility_predicate(award.name)
-    eligible = [c for c in Club.query.all() if predicate(c)]
-    for c in eligible:
-        vote_counts[c.id] = FeedbackVote.query.filter_by(award_id=award.id, club_id=c.id).count()
-    total_votes = sum(vote_counts.values())
-    return render_template('admin_rankings.html', award=award, rankings=rankings, weights=weights, decision=decision, vote_counts=vote_counts, total_votes=total_votes)
-
-@app.route('/admin/awards/<int:award_id>/decide', methods=['POST'])
+    decision = AwardDecision.query.options(db.joinedload(AwardDecision.club)).filter_by(award_id=award.id).first()
+    # Raw vote counts for the clubs on this page
+    award_votes = _vote_counts(award.id).get(award.id, {})
+    vote_counts = {r['club'].id: award_votes.get(r['club'].id, 0) for r in rankings}
+    eligible = eligible_club_ids(award.id)
+    total_votes = sum(n for cid, n in award_votes.items() if cid in eligible)
+    return render_template('admin_rankings.html', award=award, rankings=rankings, weights=weights, decision=decision, vote_counts=vote_counts, total_votes=total_votes, metrics_cache_stats=metrics_cache.stats(), total_eligible=total_eligible, page=page, per_page=per_page, snapshot=snapshot, snapshot_age=format_age(snapshot.computed_at) if snapshot else None, snapshot_stale=stale, window_args=window_args)
+
+@bp.route('/admin/awards/<int:award_id>/what-if')
+@login_required
+@read_only
+def admin_what_if(award_id: int):
+    if not current_user.is_admin:
+        flash('Access denied.', 'error')
+        return redirect(url_for('main.awards'))
+    award = Award.query.get_or_404(award_id)
+    weight_sets = WeightSet.query.order_by(WeightSet.id.desc()).all()
+    return render_template('what_if.html', award=award, weights=weights_dict(get_weights()), weight_sets=weight_sets, fields=WEIGHT_FIELDS)
+
+
+@bp.route('/admin/api/awards/<int:award_id>/what-if', methods=['POST'])
+@admin_api
+@read_only
+def api_what_if(award_id: int):
+    award = Award.query.get_or_404(award_id)
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify(error='expected a JSON object'), 400
+    base = get_weights()
+    weight_set_id = data.get('weight_set_id')
+    if weight_set_id is not None:
+        if not isinstance(weight_set_id, int) or isinstance(weight_set_id, bool):
+            return jsonify(error='weight_set_id must be an integer'), 400
+        base = WeightSet.query.get_or_404(weight_set_id)
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool)):
+        return jsonify(error='limit must be an integer'), 400
+    try:
+        weights = parse_weights(data.get('weights', {}), base)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    limit = None if limit is None else max(limit, 0)
+    return jsonify(what_if_rankings(award, weights, limit))
+
+
+@bp.route('/admin/api/weight-sets')
+@admin_api
+@read_only
+def api_weight_sets():
+    weight_sets = WeightSet.query.order_by(WeightSet.id.desc()).all()
+    return jsonify(live=weights_dict(get_weights()), weight_sets=[weight_set_json(w) for w in weight_sets])
+
+
+@bp.route('/admin/api/weight-sets', methods=['POST'])
+@admin_api
+def api_create_weight_set():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(error='expected a JSON object'), 400
+    name = data.get('name')
+    if not isinstance(name, str) or not name.strip():
+        return jsonify(error='name is required'), 400
+    name = name.strip()
+    try:
+        weights = parse_weights(data.get('weights', {}), get_weights())
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    return jsonify(weight_set_json(save_weight_set(name[:100], weights, current_user))), 201
+
+
+@bp.route('/admin/api/weight-sets/<int:weight_set_id>/promote', methods=['POST'])
+@admin_api
+def api_promote_weight_set(weight_set_id: int):
+    weight_set = WeightSet.query.get_or_404(weight_set_id)
+    live = promote_weight_set(weight_set)
+    return jsonify(live=weights_dict(live), weight_set=weight_set_json(weight_set))
+
+
+@bp.route('/admin/metrics')
+def admin_metrics():
+    """Request, SQL, phase and template totals in the Prometheus text format (INSTRUMENTATION=1 only).
+
+    Open to admins, and to scrapers sending ``Authorization: Bearer <METRICS_TOKEN>`` when a token is set.
+    """
+    metrics = current_app.extensions.get('instrumentation')
+    if metrics is None:
+        return 'Instrumentation is off; set INSTRUMENTATION=1.\n', 404, {'Content-Type': 'text/plain'}
+    if not (_has_bearer(current_app.config['METRICS_TOKEN'])
+            or (current_user.is_authenticated and current_user.is_admin)):
+        return 'Forbidden\n', 403, {'Content-Type': 'text/plain'}
+    return current_app.response_class(metrics.exposition(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@bp.route('/admin/awards/<int:award_id>/decide', methods=['POST'])
 @login_required
 def decide_award(award_id: int):
     if not current_user.is_admin:
         flash('Access denied.', 'error')
-        return redirect(url_for('awards'))
+        return redirect(url_for('main.awards'))
     award = Award.query.get_or_404(award_id)
     club_id = int(request.form['club_id'])
     reason = request.form.get('reason', '')
@@ -636,46 +1833,174 @@ def decide_award(award_id: int):
     award.winners_declared = True
     award.declared_at = datetime.utcnow()
     db.session.commit()
+    invalidate_pages('results', ('award', award.id))
     flash('Winner set for this award.', 'success')
-    return redirect(url_for('admin_award_rankings', award_id=award.id))
+    return redirect(url_for('main.admin_award_rankings', award_id=award.id))
 
 
-@app.route('/admin/approve_nomination/<int:nomination_id>')
+@bp.route('/admin/approve_nomination/<int:nomination_id>')
 @login_required
 def approve_nomination(nomination_id: int):
     if not current_user.is_admin:
         flash('Access denied.', 'error')
-        return redirect(url_for('awards'))
+        return redirect(url_for('main.awards'))
     nomination = Nomination.query.get_or_404(nomination_id)
     nomination.is_approved = True
     db.session.commit()
+    invalidate_pages(('award', nomination.award_id))
     flash('Nomination approved.', 'success')
-    return redirect(url_for('admin_dashboard'))
+    return redirect(url_for('main.admin_dashboard'))
 
-@app.route('/admin/reject_nomination/<int:nomination_id>')
+@bp.route('/admin/reject_nomination/<int:nomination_id>')
 @login_required
 def reject_nomination(nomination_id: int):
     if not current_user.is_admin:
         flash('Access denied.', 'error')
-        return redirect(url_for('awards'))
+        return redirect(url_for('main.awards'))
     nomination = Nomination.query.get_or_404(nomination_id)
+    award_id = nomination.award_id
     db.session.delete(nomination)
     db.session.commit()
+    invalidate_pages(('award', award_id))
     flash('Nomination rejected and removed.', 'success')
-    return redirect(url_for('admin_dashboard'))
+    return redirect(url_for('main.admin_dashboard'))
 
 # Results: show declared winners only
-@app.route('/results')
+@bp.route('/results')
+@read_only
+@cached_page(lambda: ('results',))
 def results():
     decisions = (
         AwardDecision.query
         .join(Award, AwardDecision.award_id == Award.id)
+        .options(db.contains_eager(AwardDecision.award), db.joinedload(AwardDecision.club))
         .filter(Award.winners_declared == True)
         .order_by(Award.category, Award.name)
         .all()
     )
     return render_template('results.html', decisions=decisions)
 
+
+@bp.route('/api/results')
+@read_only
+@cached_page(lambda: ('results', 'api', request.query_string))
+def api_results():
+    """Declared winners by award id, as JSON; served through the page cache like /results."""
+    try:
+        limit, position = api_page_args()
+        after = cursor_field(position, 'award') if position is not None else 0
+    except (TypeError, ValueError) as exc:
+        return jsonify(error=str(exc)), 400
+    decisions = (
+        AwardDecision.query
+        .join(Award, AwardDecision.award_id == Award.id)
+        .options(db.contains_eager(AwardDecision.award), db.joinedload(AwardDecision.club))
+        .filter(Award.winners_declared == True, AwardDecision.award_id > after)
+        .order_by(AwardDecision.award_id)
+        .limit(limit + 1)
+        .all()
+    )
+    more = len(decisions) > limit
+    decisions = decisions[:limit]
+    return jsonify(results=[{
+        'award_id': d.award_id,
+        'award': d.award.name,
+        'category': d.award.category,
+        'club_id': d.club_id,
+        'club': d.club.name,
+        'decided_at': d.decided_at.isoformat() if d.decided_at else None,
+    } for d in decisions], next_cursor=encode_cursor({'award': decisions[-1].award_id}) if more else None)
+
+
+@bp.route('/api/awards/<int:award_id>/rankings')
+@api_reader
+@read_only
+def api_award_rankings(award_id: int):
+    """One page of the award's stored ranking snapshot.
+
+    The first page serves the latest snapshot (``stale`` while it is being
+    recomputed; ``?wait=1`` waits for the recomputation). Its cursor pins
+    that snapshot, so later pages stay consistent until it is replaced twice.
+    """
+    award = Award.query.get_or_404(award_id)
+    award_json = {'id': award.id, 'name': award.name, 'category': award.category}
+    try:
+        limit, position = api_page_args()
+        after, pinned = 0, None
+        if position is not None:
+            after = cursor_field(position, 'rank')
+            pinned = cursor_field(position, 'snapshot'), cursor_field(position, 'computed_at', str)
+    except (TypeError, ValueError) as exc:
+        return jsonify(error=str(exc)), 400
+    if pinned is None:
+        try:
+            snapshot, stale = current_ranking_snapshot(award_id, wait=request.args.get('wait') == '1')
+        except PoolFull:
+            return jsonify(error='too many rankings being computed, retry shortly'), 503, {'Retry-After': '5'}
+        if snapshot is None:
+            return jsonify(error='rankings are being computed, retry shortly'), 202, {'Retry-After': '1'}
+    else:
+        snapshot, stale = db.session.get(RankingSnapshot, pinned[0]), None
+        if snapshot is None or snapshot.award_id != award_id or snapshot.computed_at.isoformat() != pinned[1]:
+            return jsonify(error='cursor expired, start again from the first page'), 410
+
+    etag = _digest((snapshot.id, snapshot.computed_at.isoformat(), stale, after, limit))
+    not_modified = api_not_modified(etag, snapshot.computed_at)
+    if not_modified is not None:
+        return not_modified
+    rows = ranking_snapshot_page(snapshot, limit, after)
+    more = after + limit < snapshot.total and bool(rows)
+    next_cursor = encode_cursor({'snapshot': snapshot.id, 'computed_at': snapshot.computed_at.isoformat(),
+                                 'rank': rows[-1]['rank']}) if more else None
+    response = jsonify(
+        award=award_json,
+        snapshot={'id': snapshot.id, 'computed_at': snapshot.computed_at.isoformat(), 'total': snapshot.total,
+                  'stale': stale},
+        rankings=[{
+            'rank': r['rank'],
+            'club_id': r['club'].id,
+            'club': r['club'].name,
+            'score': r['score'],
+            'components': {k: v for k, v in r['details'].items() if k != 'raw'},
+        } for r in rows],
+        next_cursor=next_cursor,
+    )
+    return api_validators(response, etag, snapshot.computed_at)
+
+
+@bp.route('/api/awards/<int:award_id>/votes')
+@api_reader
+@read_only
+def api_award_votes(award_id: int):
+    """Vote counts per club from vote_tally, by club id; the ETag is the tally version."""
+    award = Award.query.get_or_404(award_id)
+    try:
+        limit, position = api_page_args()
+        after = cursor_field(position, 'club') if position is not None else 0
+    except (TypeError, ValueError) as exc:
+        return jsonify(error=str(exc)), 400
+    etag = _digest((_votes_versions([award.id])[award.id], after, limit))
+    not_modified = api_not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    tallies = (db.session.query(VoteTally.club_id, Club.name, VoteTally.count)
+               .join(Club, Club.id == VoteTally.club_id)
+               .filter(VoteTally.award_id == award.id, VoteTally.count > 0, VoteTally.club_id > after)
+               .order_by(VoteTally.club_id)
+               .limit(limit + 1)
+               .all())
+    more = len(tallies) > limit
+    tallies = tallies[:limit]
+    total = (db.session.query(db.func.coalesce(db.func.sum(VoteTally.count), 0))
+             .filter(VoteTally.award_id == award.id).scalar())
+    response = jsonify(
+        award={'id': award.id, 'name': award.name, 'category': award.category},
+        total_votes=total,
+        votes=[{'club_id': cid, 'club': name, 'votes': n} for cid, name, n in tallies],
+        next_cursor=encode_cursor({'club': tallies[-1].club_id}) if more else None,
+    )
+    return api_validators(response, etag)
+
 # ---- Seeding synthetic metrics ----
 def seed_synthetic_metrics():
     clubs = Club.query.all()
@@ -696,56 +2021,129 @@ def seed_synthetic_metrics():
         db.session.add(EvaluationWeights(w_social=0.30, w_whatsapp=0.20, w_awards=0.20, w_feedback=0.15, w_attendance=0.15))
     db.session.commit()
 
-if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        # Ensure new columns/tables exist when upgrading existing DBs
-        ensure_award_columns()
-        
-        admin = User.query.filter_by(username='admin').first()
-        if not admin:
-            admin = User(
-                username='admin',
-                email='admin@example.com',
-                password_hash=generate_password_hash('admin123'),
-                is_admin=True
-            )
-            db.session.add(admin)
-            db.session.commit()
-        
-        if Club.query.count() == 0:
-            sample_clubs = [
-                Club(name='MUN Club', description='Model United Nations Club focused on diplomacy, public speaking and global issues.', category='Academic', founded_year=2020, member_count=45),
-                Club(name='Debate Club', description='Competitive Debate Team with strong oratory skills and tournaments.', category='Academic', founded_year=2019, member_count=38),
-                Club(name='Toastmasters Club', description='Public Speaking and Leadership Development through regular speeches and evaluations.', category='Academic', founded_year=2021, member_count=52),
-                Club(name='Coding Club', description='Programming and Software Development; hosts hackathons and coding challenges.', category='Technical', founded_year=2018, member_count=65),
-                Club(name='Robotics Club', description='Robotics and Automation projects; participates in innovation contests.', category='Technical', founded_year=2020, member_count=42),
-                Club(name='AI/ML Club', description='Artificial Intelligence and Machine Learning research and projects.', category='Technical', founded_year=2022, member_count=35),
-                Club(name='Dance Club', description='Contemporary and Classical Dance; cultural performances and arts.', category='Cultural', founded_year=2019, member_count=58),
-                Club(name='Music Club', description='Instrumental and Vocal Music; concerts and cultural events.', category='Cultural', founded_year=2018, member_count=47),
-                Club(name='Photography Club', description='Digital and Film Photography; arts and cultural exhibitions.', category='Cultural', founded_year=2021, member_count=33),
-                Club(name='Sports Club', description='Various Sports Activities with regular practice and events.', category='Sports', founded_year=2017, member_count=72),
-                Club(name='Chess Club', description='Strategic Board Games; tournaments and analytical thinking.', category='Academic', founded_year=2020, member_count=28),
-                Club(name='Literature Club', description='Creative Writing and Poetry; leadership in literary events.', category='Cultural', founded_year=2019, member_count=31)
-            ]
-            db.session.add_all(sample_clubs)
-            db.session.commit()
-        
-        if Award.query.count() == 0:
-            sample_awards = [
-                Award(name='Best Public Speaking Club', description='Excellence in public speaking and communication', category='Communication', criteria='Demonstrated excellence in public speaking, debate, and communication skills'),
-                Award(name='Best Technical Club', description='Outstanding achievements in technology and innovation', category='Technical', criteria='Innovation in technology projects, hackathons, and technical workshops'),
-                Award(name='Best Cultural Club', description='Excellence in promoting arts and culture', category='Cultural', criteria='Cultural events, performances, and community engagement'),
-                Award(name='Most Active Club', description='Highest level of engagement and participation', category='General', criteria='Regular meetings, events, and member participation'),
-                Award(name='Best New Club', description='Outstanding performance by newly established clubs', category='General', criteria='Clubs founded within the last 2 years with exceptional growth'),
-                Award(name='Community Impact Award', description='Significant contribution to the community', category='Service', criteria='Community service projects and social impact initiatives'),
-                Award(name='Innovation Award', description='Creative and innovative approaches to club activities', category='Innovation', criteria='Unique projects, creative solutions, and innovative approaches'),
-                Award(name='Leadership Excellence', description='Outstanding leadership and organizational skills', category='Leadership', criteria='Effective leadership, team management, and organizational success')
-            ]
-            db.session.add_all(sample_awards)
-            db.session.commit()
+# ---- Sample data ----
+SAMPLE_CLUBS = [
+    dict(name='MUN Club', description='Model United Nations Club focused on diplomacy, public speaking and global issues.', category='Academic', founded_year=2020, member_count=45),
+    dict(name='Debate Club', description='Competitive Debate Team with strong oratory skills and tournaments.', category='Academic', founded_year=2019, member_count=38),
+    dict(name='Toastmasters Club', description='Public Speaking and Leadership Development through regular speeches and evaluations.', category='Academic', founded_year=2021, member_count=52),
+    dict(name='Coding Club', description='Programming and Software Development; hosts hackathons and coding challenges.', category='Technical', founded_year=2018, member_count=65),
+    dict(name='Robotics Club', description='Robotics and Automation projects; participates in innovation contests.', category='Technical', founded_year=2020, member_count=42),
+    dict(name='AI/ML Club', description='Artificial Intelligence and Machine Learning research and projects.', category='Technical', founded_year=2022, member_count=35),
+    dict(name='Dance Club', description='Contemporary and Classical Dance; cultural performances and arts.', category='Cultural', founded_year=2019, member_count=58),
+    dict(name='Music Club', description='Instrumental and Vocal Music; concerts and cultural events.', category='Cultural', founded_year=2018, member_count=47),
+    dict(name='Photography Club', description='Digital and Film Photography; arts and cultural exhibitions.', category='Cultural', founded_year=2021, member_count=33),
+    dict(name='Sports Club', description='Various Sports Activities with regular practice and events.', category='Sports', founded_year=2017, member_count=72),
+    dict(name='Chess Club', description='Strategic Board Games; tournaments and analytical thinking.', category='Academic', founded_year=2020, member_count=28),
+    dict(name='Literature Club', description='Creative Writing and Poetry; leadership in literary events.', category='Cultural', founded_year=2019, member_count=31)
+]
+
+SAMPLE_AWARDS = [
+    dict(name='Best Public Speaking Club', description='Excellence in public speaking and communication', category='Communication', criteria='Demonstrated excellence in public speaking, debate, and communication skills'),
+    dict(name='Best Technical Club', description='Outstanding achievements in technology and innovation', category='Technical', criteria='Innovation in technology projects, hackathons, and technical workshops'),
+    dict(name='Best Cultural Club', description='Excellence in promoting arts and culture', category='Cultural', criteria='Cultural events, performances, and community engagement'),
+    dict(name='Most Active Club', description='Highest level of engagement and participation', category='General', criteria='Regular meetings, events, and member participation'),
+    dict(name='Best New Club', description='Outstanding performance by newly established clubs', category='General', criteria='Clubs founded within the last 2 years with exceptional growth'),
+    dict(name='Community Impact Award', description='Significant contribution to the community', category='Service', criteria='Community service projects and social impact initiatives'),
+    dict(name='Innovation Award', description='Creative and innovative approaches to club activities', category='Innovation', criteria='Unique projects, creative solutions, and innovative approaches'),
+    dict(name='Leadership Excellence', description='Outstanding leadership and organizational skills', category='Leadership', criteria='Effective leadership, team management, and organizational success')
+]
+
+
+def seed_sample_data():
+    """Admin account, sample clubs and awards, each created only when missing."""
+    if not User.query.filter_by(username='admin').first():
+        db.session.add(User(
+            username='admin',
+            email='admin@example.com',
+            password_hash=generate_password_hash('admin123'),
+            is_admin=True
+        ))
+        db.session.commit()
+    if Club.query.count() == 0:
+        db.session.add_all(Club(**fields) for fields in SAMPLE_CLUBS)
+        db.session.commit()
+    if Award.query.count() == 0:
+        db.session.add_all(Award(**fields) for fields in SAMPLE_AWARDS)
+        db.session.commit()
 
-        auto_nominate_all_awards()
-        seed_synthetic_metrics()
-    
-    app.run(debug=True)
+
+# ---- CLI commands (flask --app app <command>) ----
+def foreground(command):
+    """Run a CLI command with background jobs off: it syncs what it changes itself, and
+    jobs started by its commits would race that work and be cut off when the command exits."""
+    @functools.wraps(command)
+    def wrapped(*args, **kwargs):
+        current_app.config['BACKGROUND_JOBS'] = False
+        return command(*args, **kwargs)
+    return wrapped
+
+
+@bp.cli.command('init-db')
+@foreground
+def init_db_command():
+    """Create tables and apply pending schema migrations."""
+    applied = init_database()
+    print(f"Schema migrations applied: {', '.join(map(str, applied)) if applied else 'none (up to date)'}")
+
+
+@bp.cli.command('seed')
+@foreground
+def seed_command():
+    """Migrate, then add sample data and synthetic metrics, then eligibility/auto-nominations."""
+    init_database()
+    seed_sample_data()
+    seed_synthetic_metrics()
+    inserted, elapsed = sync_award_eligibility()
+    print(f'Auto-nominations: {inserted} inserted in {elapsed:.3f}s')
+
+
+@bp.cli.command('refresh-rankings')
+@click.option('--force', is_flag=True, help='Recompute even when the stored snapshot is current.')
+@foreground
+def refresh_rankings_command(force):
+    """Bring the stored ranking snapshots up to date."""
+    started = time.perf_counter()
+    refreshed = refresh_ranking_snapshots(force=force)
+    print(f'Ranking snapshots recomputed for {len(refreshed)} awards in {time.perf_counter() - started:.3f}s')
+
+
+def create_app():
+    """Build the Flask app. Nothing is written to the database here; see `flask init-db` / `flask seed`."""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'your-secret-key-here'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Database URI, read engine and SQLite pragmas, all overridable from the environment (see db_config)
+    configure_database(app)
+    # Group-commit votes on a writer thread instead of one transaction per POST (see VoteWriter)
+    app.config['VOTE_BATCHING'] = os.environ.get('VOTE_BATCHING', '0') == '1'
+    app.config['VOTE_BATCH_SIZE'] = int(os.environ.get('VOTE_BATCH_SIZE', '200'))
+    app.config['VOTE_BATCH_INTERVAL_MS'] = int(os.environ.get('VOTE_BATCH_INTERVAL_MS', '20'))
+    # Rendered public pages (see cached_page); PAGE_CACHE_TTL=0 turns storage off
+    app.config['PAGE_CACHE_TTL'] = int(os.environ.get('PAGE_CACHE_TTL', '60'))
+    app.config['PAGE_CACHE_SIZE'] = int(os.environ.get('PAGE_CACHE_SIZE', '256'))
+    # Eligibility sync and ranking refresh after commits (see BackgroundJob); CLI commands turn it off
+    app.config['BACKGROUND_JOBS'] = os.environ.get('BACKGROUND_JOBS', '1') == '1'
+    # Per-request phase/SQL/template timing, Server-Timing headers for admins and /admin/metrics
+    app.config['INSTRUMENTATION'] = os.environ.get('INSTRUMENTATION', '0') == '1'
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN') or None
+    # JSON API: bearer token for non-admin clients, and the pool that recomputes stale ranking snapshots
+    app.config['API_TOKEN'] = os.environ.get('API_TOKEN') or None
+    app.config['API_WORKERS'] = int(os.environ.get('API_WORKERS', '2'))
+    app.config['API_MAX_PENDING'] = int(os.environ.get('API_MAX_PENDING', '16'))
+    app.config['API_WAIT_SECONDS'] = float(os.environ.get('API_WAIT_SECONDS', '10'))
+
+    db.init_app(app)
+    install_pragmas(app, db)
+    login_manager.init_app(app)
+    app.register_blueprint(bp)
+    app.extensions['vote_writer'] = VoteWriter(app, app.config['VOTE_BATCH_SIZE'], app.config['VOTE_BATCH_INTERVAL_MS'])
+    app.extensions['page_cache'] = PageCache(app.config['PAGE_CACHE_SIZE'], app.config['PAGE_CACHE_TTL'])
+    app.extensions['compute_pool'] = ComputePool(app.config['API_WORKERS'], app.config['API_MAX_PENDING'], 'api-compute')
+    if app.config['INSTRUMENTATION']:
+        app.extensions['instrumentation'] = install_instrumentation(
+            app, db, expose_timing=lambda: current_user.is_authenticated and current_user.is_admin)
+    return app
+
+
+if __name__ == '__main__':
+    create_app().run(debug=True)
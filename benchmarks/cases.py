@@ -0,0 +1,110 @@
+"""Benchmark cases, run in a child process whose environment already points at one dataset.
+
+Each case is timed ``repeat`` times (median and min are reported), then run
+once more under an SQL statement counter and once under tracemalloc for
+its peak Python allocation.
+"""
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy.engine import Engine
+
+from query_counter import QueryCounter
+
+
+def measure(fn, repeat, counter):
+    fn()  # warm-up: imports, compiled statements, connection pool
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - started)
+    before = counter.count, counter.seconds
+    fn()
+    statements, sql_seconds = counter.count - before[0], counter.seconds - before[1]
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_ms': statistics.median(seconds) * 1000,
+        'min_ms': min(seconds) * 1000,
+        'queries': statements,
+        'sql_ms': sql_seconds * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def _expect(status):
+    def check(response):
+        if response.status_code != status:
+            raise RuntimeError(f'{response.request.path}: HTTP {response.status_code}, expected {status}')
+        return response
+    return check
+
+
+def run_cases(repeat, only=None):
+    """Set up the app against the current environment and time every case; returns {case: result}."""
+    import app as app_module
+    from app import (auto_nominate_all_awards, compute_all_rankings, compute_rankings_for_award, create_app,
+                     init_database, metrics_cache, refresh_ranking_snapshots)
+    from models import db, Award, AwardEligibility, User
+
+    # every engine, calling thread only: background work a case triggers (e.g. the snapshot refresh
+    # after a vote) runs on other threads and is not attributed to the case
+    counter = QueryCounter(Engine, this_thread=True)
+    flask_app = create_app()
+    flask_app.logger.disabled = True
+    ok, redirected = _expect(200), _expect(302)
+
+    with flask_app.app_context():
+        init_database()
+        # the award with the most eligible clubs is the worst case for ranking
+        award_id = (db.session.query(AwardEligibility.award_id)
+                    .group_by(AwardEligibility.award_id)
+                    .order_by(db.func.count().desc(), AwardEligibility.award_id).limit(1).scalar())
+        eligible_club = db.session.query(AwardEligibility.club_id).filter_by(award_id=award_id).limit(1).scalar()
+        student = User.query.filter_by(is_admin=False).order_by(User.id).first().username
+        refresh_ranking_snapshots()  # the rankings page then serves stored snapshots, as in steady state
+
+    admin = flask_app.test_client()
+    redirected(admin.post('/login', data={'username': 'admin', 'password': 'admin123', 'role': 'admin'}))
+    voter = flask_app.test_client()
+    redirected(voter.post('/login', data={'username': student, 'password': 'student', 'role': 'student'}))
+
+    def in_app(fn):
+        def call():
+            with flask_app.app_context():
+                fn()
+        return call
+
+    def cold_metrics():
+        metrics_cache.invalidate()
+        app_module._load_synthetic_metrics()
+
+    cases = {
+        'load_synthetic_metrics (cold)': in_app(cold_metrics),
+        'load_synthetic_metrics (cached)': in_app(app_module._load_synthetic_metrics),
+        'compute_rankings_for_award': in_app(lambda: compute_rankings_for_award(db.session.get(Award, award_id))),
+        'compute_rankings_for_award top 5': in_app(
+            lambda: compute_rankings_for_award(db.session.get(Award, award_id), top_k=5)),
+        'compute_all_rankings': in_app(compute_all_rankings),
+        'auto_nominate_all_awards': in_app(auto_nominate_all_awards),
+        'GET /results': lambda: ok(admin.get('/results')),
+        'GET /admin/dashboard': lambda: ok(admin.get('/admin/dashboard')),
+        'GET /admin/awards/<id>/rankings': lambda: ok(admin.get(f'/admin/awards/{award_id}/rankings')),
+        # last, since every vote queues a background snapshot refresh
+        'POST /awards/<id>/vote': lambda: redirected(voter.post(
+            f'/awards/{award_id}/vote', data={'club_id': eligible_club, 'voter_hash': uuid.uuid4().hex})),
+    }
+    results = {}
+    with counter:
+        for name, fn in cases.items():
+            if only and not any(o in name for o in only):
+                continue
+            results[name] = measure(fn, repeat, counter)
+    return results
@@ -0,0 +1,145 @@
+"""Time the ranking, ingestion and page rendering hot paths at several dataset sizes.
+
+    python -m benchmarks.run --sizes 12,1000,10000 --json bench.json
+    python -m benchmarks.run --json new.json --compare bench.json --threshold 0.25
+
+Datasets are generated once with ``scripts.generate_synthetic_data`` and kept
+under build/bench/; every run works on a fresh copy of the database. Each
+size is measured in its own interpreter, pointed at its dataset through
+DATABASE_URL and METRICS_DATA_DIR.
+"""
+import os
+import argparse
+import json
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, 'build', 'bench')
+DEFAULT_SIZES = (12, 1000, 10000, 100000)
+
+# Child environment: render every page (no page cache), record votes one transaction each
+CHILD_ENV = {'PAGE_CACHE_TTL': '0', 'VOTE_BATCHING': '0'}
+
+
+def dataset(clubs, seed):
+    """(metrics directory, database path) for ``clubs`` generated clubs, generating them on first use."""
+    base = os.path.join(BENCH_DIR, f'{clubs}-seed{seed}')
+    if not os.path.isdir(base):
+        partial = base + '.partial'
+        shutil.rmtree(partial, ignore_errors=True)
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'scripts.generate_synthetic_data', '--clubs', str(clubs), '--seed', str(seed),
+                        '--out', partial, '--db', os.path.join(partial, 'awards.db'),
+                        '--users', str(max(200, clubs // 5)), '--votes', str(clubs * 2)],
+                       cwd=ROOT, check=True, capture_output=True)
+        os.replace(partial, base)  # the directory moves with any WAL files of the database
+        print(f'  generated {clubs} clubs in {time.perf_counter() - started:.1f}s', flush=True)
+    return base, os.path.join(base, 'awards.db')
+
+
+def scratch_copy(source, directory):
+    path = os.path.join(directory, 'bench.db')
+    src, dst = sqlite3.connect(source), sqlite3.connect(path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+    return path
+
+
+def run_size(clubs, seed, repeat, only):
+    data_dir, db_path = dataset(clubs, seed)
+    with tempfile.TemporaryDirectory(prefix='bench-') as scratch:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + scratch_copy(db_path, scratch), METRICS_DATA_DIR=data_dir,
+                   **CHILD_ENV)
+        command = [sys.executable, '-m', 'benchmarks.run', '--child', '--repeat', str(repeat)]
+        if only:
+            command += ['--only', ','.join(only)]
+        out = subprocess.run(command, env=env, cwd=ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(f'benchmark child for {clubs} clubs failed:\n{out.stderr}')
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Cases slower than baseline by more than ``threshold`` (a fraction) and ``min_delta_ms``, or issuing more queries."""
+    regressions = []
+    for size, cases in results.items():
+        for name, new in cases.items():
+            old = baseline.get(size, {}).get(name)
+            if old is None:
+                continue
+            if new['median_ms'] - old['median_ms'] > max(old['median_ms'] * threshold, min_delta_ms):
+                regressions.append(f"{size} clubs, {name}: {old['median_ms']:.1f} -> {new['median_ms']:.1f} ms")
+            if new['queries'] > old['queries']:
+                regressions.append(f"{size} clubs, {name}: {old['queries']} -> {new['queries']} queries")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ranking, metrics loading and views at several dataset sizes.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma-separated club counts')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case (median is reported)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', help='comma-separated substrings; run only the matching cases')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='baseline JSON from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs the baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='ignore slowdowns smaller than this, which are mostly timer noise on tiny cases')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    only = [o for o in (args.only or '').split(',') if o]
+
+    if args.child:
+        from benchmarks.cases import run_cases
+        print(json.dumps(run_cases(args.repeat, only)))
+        return
+
+    results = {}
+    for clubs in (int(s) for s in args.sizes.split(',')):
+        print(f'{clubs} clubs', flush=True)
+        results[str(clubs)] = cases = run_size(clubs, args.seed, args.repeat, only)
+        for name, r in cases.items():
+            print(f"  {name:<36}{r['median_ms']:>10.1f} ms (min {r['min_ms']:.1f}){r['queries']:>6} queries"
+                  f"{r['sql_ms']:>9.1f} ms SQL{r['peak_kib'] / 1024:>9.1f} MiB peak", flush=True)
+
+    if args.json:
+        report = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f'Results written to {args.json}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta_ms)
+        print(f"Compared with {args.compare} (commit {baseline.get('commit')}), threshold {args.threshold:.0%}:")
+        for line in regressions:
+            print(f'  REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+        print('  no regressions')
+
+
+if __name__ == '__main__':
+    main()
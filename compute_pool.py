@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolFull(Exception):
+    """Raised by ComputePool.submit when ``max_pending`` distinct keys are already in flight."""
+
+
+class ComputePool:
+    """Bounded worker pool that runs at most one call per key at a time (single-flight).
+
+    ``submit(key, fn)`` returns the Future of the call already queued or
+    running under ``key`` if there is one, so any number of concurrent
+    identical requests share a single computation. At most ``max_workers``
+    calls run at once and at most ``max_pending`` keys are in flight; beyond
+    that ``submit`` raises PoolFull rather than queueing without bound.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16, name='compute'):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._coalesced = 0
+        self._rejected = 0
+
+    def submit(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future
+            if len(self._inflight) >= self.max_pending:
+                self._rejected += 1
+                raise PoolFull(f'{len(self._inflight)} computations already pending')
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._inflight[key] = future
+            self._submitted += 1
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self):
+        with self._lock:
+            return {'submitted': self._submitted, 'coalesced': self._coalesced, 'rejected': self._rejected,
+                    'in_flight': len(self._inflight)}
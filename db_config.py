@@ -0,0 +1,100 @@
+"""SQLite connection tuning and the read/write engine split.
+
+Settings come from the environment:
+
+    DATABASE_URL             database URI (default sqlite:///awards.db)
+    SQLITE_JOURNAL_MODE      journal mode (default WAL, so readers do not wait on writers)
+    SQLITE_SYNCHRONOUS       synchronous level (default NORMAL, safe under WAL)
+    SQLITE_BUSY_TIMEOUT_MS   how long a connection waits for a lock (default 5000)
+    SQLITE_CACHE_SIZE        page cache per connection; negative values are KiB (default -20000)
+    SQLITE_MMAP_SIZE         bytes of the file to memory-map (default 256 MiB)
+    SQLITE_READ_ENGINE       1 to give read-only views their own engine (default 1)
+
+The pragmas are applied on every new connection through the engine's
+``connect`` event. The read engine points at the same file with
+``query_only`` set, so it keeps a separate connection pool for page views
+and can never write.
+"""
+import functools
+import os
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+READ_BIND = 'read'
+DEFAULT_DATABASE_URL = 'sqlite:///awards.db'
+
+
+def sqlite_settings(environ=os.environ):
+    """Pragma name -> value for new SQLite connections."""
+    return {
+        'journal_mode': environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'cache_size': int(environ.get('SQLITE_CACHE_SIZE', '-20000')),
+        'mmap_size': int(environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    }
+
+
+def _is_sqlite_file(uri):
+    return uri.startswith('sqlite:') and uri not in ('sqlite://', 'sqlite:///:memory:')
+
+
+def configure_database(app, environ=os.environ):
+    """Set the database URI, the optional read bind and the SQLite pragmas on ``app.config``."""
+    uri = environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLITE_PRAGMAS'] = sqlite_settings(environ) if uri.startswith('sqlite:') else {}
+    if _is_sqlite_file(uri) and environ.get('SQLITE_READ_ENGINE', '1') == '1':
+        app.config['SQLALCHEMY_BINDS'] = {READ_BIND: uri}
+
+
+def apply_pragmas(engine, pragmas, query_only=False):
+    """Run ``pragmas`` on every connection ``engine`` opens."""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+            if query_only:
+                cursor.execute('PRAGMA query_only=ON')
+        finally:
+            cursor.close()
+
+
+def install_pragmas(app, db):
+    """Attach the configured pragmas to the write engine and, if configured, the read engine."""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    with app.app_context():
+        engines = db.engines
+    apply_pragmas(engines[None], pragmas)
+    if READ_BIND in engines:
+        apply_pragmas(engines[READ_BIND], pragmas, query_only=True)
+
+
+class RoutingSession(Session):
+    """Session that sends queries to the read engine once marked read-only.
+
+    Flushes always go to the write engine, so an accidental write in a
+    read-only view still lands in the database instead of failing.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('read_only') and not self._flushing:
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_only(view):
+    """View decorator: run the view's queries on the read engine."""
+    @functools.wraps(view)
+    def wrapped(*args, **kwargs):
+        current_app.extensions['sqlalchemy'].session.info['read_only'] = True
+        return view(*args, **kwargs)
+    return wrapped
@@ -0,0 +1,211 @@
+"""Opt-in request instrumentation: phase timers, SQL and template timing, Prometheus export.
+
+Turned on with INSTRUMENTATION=1 (see create_app). Every request then
+collects
+
+* named phases, timed with ``phase('metrics.csv')`` as a context manager or
+  decorator (a no-op outside an instrumented request, e.g. on background jobs),
+* SQL statements and the time spent in them, from the engines'
+  ``before/after_cursor_execute`` events,
+* Jinja render time per template, from Flask's template signals,
+
+and reports them in a ``Server-Timing`` header and in process-wide totals
+that ``RequestMetrics.exposition`` renders in the Prometheus text format,
+including a latency histogram per route.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class RequestTimings:
+    """What one request spent where; lives on ``g.request_timings``."""
+
+    __slots__ = ('started', 'phases', 'templates', 'queries', 'sql_seconds', 'sql_started', 'renders')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # name -> [calls, seconds]
+        self.templates = {}  # template name -> [renders, seconds]
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.sql_started = None
+        self.renders = []  # start times of the templates being rendered (includes can nest)
+
+    def add(self, name, seconds, totals=None):
+        entry = (self.phases if totals is None else totals).setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+
+def current_timings():
+    """The running request's RequestTimings, or None when not instrumented."""
+    return g.get('request_timings') if has_request_context() else None
+
+
+@contextmanager
+def phase(name):
+    """Time a block (or, as a decorator, a function) as phase ``name`` of the current request."""
+    timings = current_timings()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, time.perf_counter() - started)
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+
+
+def _labels(**labels):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+class RequestMetrics:
+    """Process-wide totals of the per-request timings, keyed by route rule (not URL) to bound the label sets."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}    # (method, route) -> Histogram
+        self._responses = {}  # (method, route, status) -> count
+        self._sql = {}        # route -> [statements, seconds]
+        self._phases = {}     # phase -> [calls, seconds]
+        self._templates = {}  # template -> [renders, seconds]
+
+    def record(self, method, route, status, seconds, timings):
+        with self._lock:
+            self._latency.setdefault((method, route), Histogram()).observe(seconds)
+            key = (method, route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+            sql = self._sql.setdefault(route, [0, 0.0])
+            sql[0] += timings.queries
+            sql[1] += timings.sql_seconds
+            for mine, theirs in ((self._phases, timings.phases), (self._templates, timings.templates)):
+                for name, (calls, spent) in theirs.items():
+                    entry = mine.setdefault(name, [0, 0.0])
+                    entry[0] += calls
+                    entry[1] += spent
+
+    def exposition(self) -> str:
+        """All totals in the Prometheus text exposition format."""
+        with self._lock:
+            latency = {k: (list(h.counts), h.sum) for k, h in self._latency.items()}
+            responses = dict(self._responses)
+            sql = {k: tuple(v) for k, v in self._sql.items()}
+            phases = {k: tuple(v) for k, v in self._phases.items()}
+            templates = {k: tuple(v) for k, v in self._templates.items()}
+
+        lines = ['# HELP http_request_duration_seconds Request latency by route.',
+                 '# TYPE http_request_duration_seconds histogram']
+        for (method, route), (counts, total) in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{_labels(method=method, route=route)} {total}')
+            lines.append(f'http_request_duration_seconds_count{_labels(method=method, route=route)} {cumulative}')
+
+        lines += ['# HELP http_requests_total Responses by route and status.', '# TYPE http_requests_total counter']
+        lines += [f'http_requests_total{_labels(method=m, route=r, status=s)} {n}'
+                  for (m, r, s), n in sorted(responses.items())]
+
+        def counters(name, help_text, label, values, index):
+            out = [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            return out + [f'{name}{_labels(**{label: k})} {v[index]}' for k, v in sorted(values.items())]
+
+        lines += counters('db_queries_total', 'SQL statements executed, by route.', 'route', sql, 0)
+        lines += counters('db_query_seconds_total', 'Time spent executing SQL, by route.', 'route', sql, 1)
+        lines += counters('phase_calls_total', 'Timed phases entered during requests.', 'phase', phases, 0)
+        lines += counters('phase_seconds_total', 'Time spent in timed phases during requests.', 'phase', phases, 1)
+        lines += counters('template_renders_total', 'Jinja templates rendered.', 'template', templates, 0)
+        lines += counters('template_render_seconds_total', 'Time spent rendering Jinja templates.', 'template', templates, 1)
+        return '\n'.join(lines) + '\n'
+
+
+def server_timing(timings, total) -> str:
+    """``Server-Timing`` header value: total, SQL, template rendering and each phase, in milliseconds."""
+    entries = [f'total;dur={total * 1000:.1f}',
+               f'db;desc="{timings.queries} queries";dur={timings.sql_seconds * 1000:.1f}']
+    if timings.templates:
+        render = sum(spent for _, spent in timings.templates.values())
+        entries.append(f'render;desc="{", ".join(timings.templates)}";dur={render * 1000:.1f}')
+    for name, (calls, spent) in timings.phases.items():
+        desc = f';desc="{calls} calls"' if calls > 1 else ''
+        entries.append(f'{name}{desc};dur={spent * 1000:.1f}')
+    return ', '.join(entries)
+
+
+def install_instrumentation(app, db, expose_timing=lambda: True):
+    """Instrument every request of ``app`` and the SQL of ``db``'s engines; returns the RequestMetrics.
+
+    ``expose_timing()`` decides, per response, whether the Server-Timing header is sent.
+    """
+    metrics = RequestMetrics()
+
+    @app.before_request
+    def _start_timings():
+        g.request_timings = RequestTimings()
+
+    @app.after_request
+    def _finish_timings(response):
+        timings = g.pop('request_timings', None)
+        if timings is None:
+            return response
+        total = time.perf_counter() - timings.started
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        metrics.record(request.method, route, response.status_code, total, timings)
+        if expose_timing():
+            response.headers['Server-Timing'] = server_timing(timings, total)
+        return response
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timings = current_timings()
+        if timings is not None:
+            timings.sql_started = time.perf_counter()
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timings = current_timings()
+        if timings is not None and timings.sql_started is not None:
+            timings.queries += 1
+            timings.sql_seconds += time.perf_counter() - timings.sql_started
+            timings.sql_started = None
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def _before_render(sender, template, context, **extra):
+        timings = current_timings()
+        if timings is not None:
+            timings.renders.append(time.perf_counter())
+
+    def _rendered(sender, template, context, **extra):
+        timings = current_timings()
+        if timings is not None and timings.renders:
+            timings.add(template.name, time.perf_counter() - timings.renders.pop(), timings.templates)
+
+    # the signals hold weak references by default, and these closures have no other owner
+    before_render_template.connect(_before_render, app, weak=False)
+    template_rendered.connect(_rendered, app, weak=False)
+    return metrics
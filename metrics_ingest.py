@@ -0,0 +1,235 @@
+import csv
+import hashlib
+import os
+import sys
+import time
+from collections import defaultdict
+from operator import itemgetter
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def new_totals():
+    """Empty per-club accumulator for the CSV metrics."""
+    return {
+        'instagram_posts': 0,
+        'instagram_likes': 0,
+        'instagram_reach': 0,
+        'whatsapp_messages': 0,
+        'whatsapp_sentiment_sum': 0.0,
+        'whatsapp_sentiment_cnt': 0,
+        'awards_won': 0,
+        'offline_attendance': 0,
+    }
+
+
+def iter_columns(path, columns):
+    """Yield tuples of ``columns`` from a CSV file, one line at a time.
+
+    Columns are located once from the header and then read positionally, so
+    memory use does not depend on file size and no per-row dict is built.
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        idx = [header.index(c) for c in columns]
+        getter = itemgetter(*idx) if len(idx) > 1 else (lambda row, i=idx[0]: (row[i],))
+        for row in reader:
+            if row:
+                yield getter(row)
+
+
+class CsvTail:
+    """Complete CSV lines from byte ``offset`` onwards, parsed positionally.
+
+    ``offset`` advances past every line consumed, so after iteration it marks
+    where the next incremental read should resume. A final line without a
+    trailing newline (an append still in progress) is left for the next run.
+    """
+
+    def __init__(self, path, columns, offset=0):
+        self.path = path
+        self.columns = columns
+        self.offset = offset
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            header_line = f.readline()
+            if not header_line.endswith(b'\n'):
+                return
+            header = next(csv.reader([header_line.decode('utf-8')]))
+            getter = itemgetter(*[header.index(c) for c in self.columns])
+            self.offset = max(self.offset, len(header_line))
+            f.seek(self.offset)
+
+            def lines():
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        return
+                    self.offset += len(line)
+                    yield line.decode('utf-8')
+
+            for row in csv.reader(lines()):
+                if row:
+                    yield getter(row)
+
+
+def prefix_checksum(path, offset, chunk_size=1 << 20):
+    """SHA-1 of the first ``offset`` bytes of ``path``, read in chunks.
+
+    Stored with a watermark to detect files that were rewritten rather than
+    appended to since the last read. The whole prefix is hashed, so an edit
+    anywhere before the watermark forces a full reload.
+    """
+    digest = hashlib.sha1()
+    remaining = offset
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def track_months(rows, high_water):
+    """Pass through rows ending in (year, month) columns while recording the latest month.
+
+    ``high_water`` is a dict whose ``mark`` (the latest (year, month) seen) is
+    updated in place. The files are sorted by club, not by month, so rows
+    at or before the previous mark are ordinary and not counted as late.
+    """
+    for row in rows:
+        ym = (int(row[-2]), int(row[-1]))
+        if ym > high_water['mark']:
+            high_water['mark'] = ym
+        yield row
+
+
+def by_month(rows):
+    """Merge the leading club_id and trailing (year, month) columns into one key; fold with ``key=month_key``."""
+    for row in rows:
+        yield ((row[0], row[-2], row[-1]),) + tuple(row[1:-2])
+
+
+def month_key(key):
+    cid, year, month = key
+    return int(cid), int(year), int(month)
+
+
+def collapse_months(monthly, totals):
+    """Add (club_id, year, month) cells into per-club ``totals``."""
+    for (cid, _, _), cell in monthly.items():
+        t = totals[cid]
+        for col, value in cell.items():
+            t[col] += value
+    return totals
+
+
+# The fold functions key ``totals`` by ``key(first column)``: the club id by
+# default, (club_id, year, month) for rows from ``by_month``.
+
+def fold_instagram(rows, totals, key=int):
+    n = 0
+    for cid, posts, likes, reach in rows:
+        t = totals[key(cid)]
+        t['instagram_posts'] += int(posts)
+        t['instagram_likes'] += int(likes)
+        t['instagram_reach'] += int(reach)
+        n += 1
+    return n
+
+
+def fold_whatsapp(rows, totals, key=int):
+    n = 0
+    for cid, messages, sentiment in rows:
+        t = totals[key(cid)]
+        t['whatsapp_messages'] += int(messages)
+        t['whatsapp_sentiment_sum'] += float(sentiment)
+        t['whatsapp_sentiment_cnt'] += 1
+        n += 1
+    return n
+
+
+def fold_attendance(rows, totals, key=int):
+    n = 0
+    for cid, attendees in rows:
+        totals[key(cid)]['offline_attendance'] += int(attendees)
+        n += 1
+    return n
+
+
+def fold_awards(rows, totals, key=int):
+    n = 0
+    for (cid,) in rows:
+        totals[key(cid)]['awards_won'] += 1
+        n += 1
+    return n
+
+
+# source key -> (columns read, fold function)
+SOURCES = {
+    'instagram': (('club_id', 'posts', 'likes', 'reach'), fold_instagram),
+    'whatsapp': (('club_id', 'messages', 'sentiment'), fold_whatsapp),
+    'attendance': (('club_id', 'attendees'), fold_attendance),
+    'awards': (('club_id',), fold_awards),
+}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def aggregate_csv_metrics(paths, totals=None):
+    """Fold the metric CSVs in ``paths`` (source key -> file) into per-club totals.
+
+    Missing files are skipped. Returns ``(totals, stats)`` where ``totals`` maps
+    club_id to a ``new_totals()`` dict and ``stats`` reports rows read,
+    rows/sec and the process' peak RSS in MB.
+    """
+    totals = defaultdict(new_totals) if totals is None else totals
+    started = time.perf_counter()
+    rows_by_source = {}
+    for key, path in paths.items():
+        if not os.path.exists(path):
+            continue
+        columns, fold = SOURCES[key]
+        rows_by_source[key] = fold(iter_columns(path, columns), totals)
+    seconds = time.perf_counter() - started
+    total_rows = sum(rows_by_source.values())
+    stats = {
+        'rows': rows_by_source,
+        'seconds': seconds,
+        'rows_per_sec': (total_rows / seconds) if seconds > 0 else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    return totals, stats
+
+
+def aggregate_monthly_metrics(paths, monthly=None):
+    """Like ``aggregate_csv_metrics`` but keyed by (club_id, year, month)."""
+    monthly = defaultdict(new_totals) if monthly is None else monthly
+    rows = {}
+    for key, path in paths.items():
+        if not os.path.exists(path):
+            continue
+        columns, fold = SOURCES[key]
+        rows[key] = fold(by_month(iter_columns(path, columns + ('year', 'month'))), monthly, key=month_key)
+    return monthly, rows
+
+
+def format_stats(stats):
+    rss = stats['peak_rss_mb']
+    return '{} rows in {:.3f}s ({:,.0f} rows/s), peak RSS {}'.format(
+        sum(stats['rows'].values()), stats['seconds'], stats['rows_per_sec'],
+        f'{rss:.1f} MB' if rss is not None else 'n/a')
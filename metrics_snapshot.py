@@ -0,0 +1,117 @@
+"""Columnar binary snapshot of the aggregated per-club metrics.
+
+Layout (little-endian):
+
+    header   magic b'OPMS', format version (u16), column count (u16),
+             row count (u32), SHA-1 digest of the source files (20 bytes)
+    columns  club_id (int64, ascending), then one fixed-width array per
+             entry in COLUMNS, each ``row count`` values long
+
+Readers memory-map the file and index the arrays in place, so opening a
+snapshot costs a header parse regardless of the number of clubs.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+MAGIC = b'OPMS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI20s')
+COLUMNS = (
+    ('instagram_posts', 'q'),
+    ('instagram_likes', 'q'),
+    ('instagram_reach', 'q'),
+    ('whatsapp_messages', 'q'),
+    ('whatsapp_sentiment', 'd'),
+    ('awards_won', 'q'),
+    ('offline_attendance', 'q'),
+    ('report_score', 'd'),
+)
+ITEM_SIZE = 8
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _column_bytes(code, values):
+    arr = array(code, values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_snapshot(path, metrics, digest):
+    """Write ``metrics`` ({club_id: {column: value}}) atomically to ``path``."""
+    ids = sorted(metrics)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), len(ids), digest))
+        f.write(_column_bytes('q', ids))
+        for name, code in COLUMNS:
+            f.write(_column_bytes(code, (metrics[cid][name] for cid in ids)))
+    os.replace(tmp, path)
+
+
+def read_digest(path):
+    """Source digest stored in a snapshot header, or None if unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            magic, version, _, _, digest = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != VERSION:
+        return None
+    return digest
+
+
+class MetricsSnapshot(Mapping):
+    """Read-only {club_id: metrics dict} view over a memory-mapped snapshot."""
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise SnapshotError('snapshots are only mapped on little-endian hosts')
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, ncols, rows, self.digest = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            raise SnapshotError('truncated header')
+        if magic != MAGIC or version != VERSION or ncols != len(COLUMNS):
+            raise SnapshotError(f'unsupported snapshot (magic={magic!r}, version={version})')
+        if len(self._mm) != HEADER.size + ITEM_SIZE * rows * (len(COLUMNS) + 1):
+            raise SnapshotError('size does not match header')
+
+        view = memoryview(self._mm)
+        width = ITEM_SIZE * rows
+        offset = HEADER.size
+        self.ids = view[offset:offset + width].cast('q')
+        self.columns = {}
+        for name, code in COLUMNS:
+            offset += width
+            self.columns[name] = view[offset:offset + width].cast(code)
+
+    def _position(self, club_id):
+        i = bisect_left(self.ids, club_id)
+        if i == len(self.ids) or self.ids[i] != club_id:
+            return None
+        return i
+
+    def __getitem__(self, club_id):
+        i = self._position(club_id)
+        if i is None:
+            raise KeyError(club_id)
+        return {name: col[i] for name, col in self.columns.items()}
+
+    def __contains__(self, club_id):
+        return self._position(club_id) is not None
+
+    def __iter__(self):
+        return iter(self.ids.tolist())
+
+    def __len__(self):
+        return len(self.ids)
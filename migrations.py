@@ -0,0 +1,115 @@
+"""Numbered schema migrations for databases created by earlier versions.
+
+Each migration runs once, in its own transaction, and is recorded in the
+``schema_version`` table. ``db.create_all()`` already builds the current
+schema on a fresh database, so every step tolerates finding its change in
+place. When the schema is current, ``migrate`` costs one indexed lookup.
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import text
+
+log = logging.getLogger(__name__)
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table}')"))}
+
+
+def _add_columns(conn, table, columns):
+    existing = _columns(conn, table)
+    for name, ddl in columns:
+        if name not in existing:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl}'))
+
+
+def award_winner_columns(conn):
+    _add_columns(conn, 'award', [('winners_declared', 'BOOLEAN DEFAULT 0'), ('declared_at', 'DATETIME')])
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS award_decision (id INTEGER PRIMARY KEY AUTOINCREMENT, award_id INTEGER UNIQUE, "
+        "club_id INTEGER, reason TEXT, decided_by INTEGER, decided_at DATETIME)"))
+
+
+def attendance_and_report_weights(conn):
+    _add_columns(conn, 'club_metrics', [('offline_attendance', 'INTEGER DEFAULT 0')])
+    _add_columns(conn, 'evaluation_weights', [('w_attendance', 'FLOAT DEFAULT 0.15'), ('w_reports', 'FLOAT DEFAULT 0.10')])
+    conn.execute(text("UPDATE evaluation_weights SET w_attendance = COALESCE(w_attendance, 0.15), "
+                      "w_reports = COALESCE(w_reports, 0.10)"))
+
+
+def sentiment_running_totals(conn):
+    _add_columns(conn, 'club_metrics', [('whatsapp_sentiment_sum', 'FLOAT DEFAULT 0'),
+                                        ('whatsapp_sentiment_cnt', 'INTEGER DEFAULT 0')])
+
+
+def _dedupe_votes(conn):
+    """Delete repeated (award_id, voter_hash) votes, keeping the lowest id of each; returns the rows removed."""
+    removed = conn.execute(text(
+        "DELETE FROM feedback_vote WHERE voter_hash IS NOT NULL AND id NOT IN "
+        "(SELECT MIN(id) FROM feedback_vote WHERE voter_hash IS NOT NULL GROUP BY award_id, voter_hash)")).rowcount
+    if removed:
+        # legacy rows from before the database enforced one vote per token and award
+        log.warning('Removed %d duplicate (award_id, voter_hash) votes, keeping the earliest of each', removed)
+    return removed
+
+
+def _rebuild_vote_tallies(conn):
+    conn.execute(text("DELETE FROM vote_tally"))
+    conn.execute(text("INSERT INTO vote_tally (award_id, club_id, count) "
+                      "SELECT award_id, club_id, COUNT(*) FROM feedback_vote GROUP BY award_id, club_id"))
+
+
+def vote_indexes_and_tallies(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_feedback_vote_award_club ON feedback_vote (award_id, club_id)"))
+    _dedupe_votes(conn)
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_feedback_vote_award_voter "
+                      "ON feedback_vote (award_id, voter_hash)"))
+    _rebuild_vote_tallies(conn)
+
+
+def nomination_indexes(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_nomination_award_club ON nomination (award_id, club_id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_nomination_submitted_by ON nomination (submitted_by)"))
+
+
+def unique_voter_index(conn):
+    # earlier versions of migration 4 skipped the index when duplicates existed, yet were recorded as applied
+    if _dedupe_votes(conn):
+        _rebuild_vote_tallies(conn)
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ux_feedback_vote_award_voter "
+                      "ON feedback_vote (award_id, voter_hash)"))
+
+
+# (version, name, function); append only, never renumber
+MIGRATIONS = [
+    (1, 'award winner columns and award_decision', award_winner_columns),
+    (2, 'attendance and report weights', attendance_and_report_weights),
+    (3, 'whatsapp sentiment running totals', sentiment_running_totals),
+    (4, 'feedback_vote indexes and vote_tally backfill', vote_indexes_and_tallies),
+    (5, 'nomination indexes', nomination_indexes),
+    (6, 'feedback_vote unique voter index', unique_voter_index),
+]
+
+
+def current_version(conn):
+    return conn.execute(text('SELECT MAX(version) FROM schema_version')).scalar() or 0
+
+
+def migrate(engine):
+    """Apply pending migrations to ``engine``; returns the versions applied."""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version "
+                          "(version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at DATETIME NOT NULL)"))
+        version = current_version(conn)
+    applied = []
+    for number, name, step in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(text('INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :t)'),
+                         {'v': number, 'n': name, 't': datetime.utcnow()})
+        log.info('Applied schema migration %d: %s', number, name)
+        applied.append(number)
+    return applied
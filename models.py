@@ -0,0 +1,241 @@
+from datetime import datetime
+
+from flask_login import UserMixin
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db_config import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Database Models
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(120), nullable=False)
+    is_admin = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Club(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50))  # e.g., 'Academic', 'Cultural', 'Technical'
+    founded_year = db.Column(db.Integer)
+    member_count = db.Column(db.Integer)
+    achievements = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Award(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50))  # e.g., 'Best Public Speaking', 'Best Technical Club'
+    criteria = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    winners_declared = db.Column(db.Boolean, default=False)
+    declared_at = db.Column(db.DateTime)
+
+class Nomination(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), nullable=False)
+    reason = db.Column(db.Text)
+    submitted_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_approved = db.Column(db.Boolean, default=False)
+    
+    club = db.relationship('Club', backref='nominations')
+    award = db.relationship('Award', backref='nominations')
+
+    __table_args__ = (
+        db.Index('ix_nomination_award_club', 'award_id', 'club_id'),
+        db.Index('ix_nomination_submitted_by', 'submitted_by'),
+    )
+
+class ClubMetrics(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), unique=True, nullable=False)
+    instagram_posts = db.Column(db.Integer, default=0)
+    instagram_likes = db.Column(db.Integer, default=0)
+    instagram_reach = db.Column(db.Integer, default=0)
+    whatsapp_messages = db.Column(db.Integer, default=0)
+    whatsapp_sentiment = db.Column(db.Float, default=0.0)  # -1 to 1 synthetic
+    whatsapp_sentiment_sum = db.Column(db.Float, default=0.0)  # running sum/count behind the average
+    whatsapp_sentiment_cnt = db.Column(db.Integer, default=0)
+    awards_won = db.Column(db.Integer, default=0)
+    offline_attendance = db.Column(db.Integer, default=0)
+
+    club = db.relationship('Club', backref=db.backref('metrics', uselist=False))
+
+class ClubMetricsMonthly(db.Model):
+    # Monthly rollup of the metric CSVs, maintained by scripts/load_metrics_from_csv.py;
+    # sums and counts only, so any range of months adds up exactly
+    __tablename__ = 'club_metrics_monthly'
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    instagram_posts = db.Column(db.Integer, default=0)
+    instagram_likes = db.Column(db.Integer, default=0)
+    instagram_reach = db.Column(db.Integer, default=0)
+    whatsapp_messages = db.Column(db.Integer, default=0)
+    whatsapp_sentiment_sum = db.Column(db.Float, default=0.0)
+    whatsapp_sentiment_cnt = db.Column(db.Integer, default=0)
+    awards_won = db.Column(db.Integer, default=0)
+    offline_attendance = db.Column(db.Integer, default=0)
+
+class EvaluationWeights(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    # Global single row config
+    w_social = db.Column(db.Float, default=0.30)  # posts/likes/reach composite
+    w_whatsapp = db.Column(db.Float, default=0.20)  # messages & sentiment
+    w_awards = db.Column(db.Float, default=0.20)  # awards won
+    w_feedback = db.Column(db.Float, default=0.15)  # student votes
+    w_attendance = db.Column(db.Float, default=0.15)  # offline attendance
+    w_reports = db.Column(db.Float, default=0.10)  # textual report impact
+
+class WeightSet(db.Model):
+    # Saved what-if weighting; rows are never edited, so the id is the version
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    w_social = db.Column(db.Float, nullable=False)
+    w_whatsapp = db.Column(db.Float, nullable=False)
+    w_awards = db.Column(db.Float, nullable=False)
+    w_feedback = db.Column(db.Float, nullable=False)
+    w_attendance = db.Column(db.Float, nullable=False)
+    w_reports = db.Column(db.Float, nullable=False)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    promoted_at = db.Column(db.DateTime, nullable=True)  # last time it was copied to EvaluationWeights
+
+class FeedbackVote(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    voter_hash = db.Column(db.String(120), nullable=True)  # simple duplicate prevention token
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    award = db.relationship('Award', backref='votes')
+    club = db.relationship('Club', backref='votes')
+
+    __table_args__ = (
+        db.Index('ix_feedback_vote_award_club', 'award_id', 'club_id'),
+        # one vote per token and award; NULL tokens (anonymous votes) are not constrained
+        db.Index('ux_feedback_vote_award_voter', 'award_id', 'voter_hash', unique=True),
+    )
+
+class VoteTally(db.Model):
+    # Materialized vote count per (award, club), kept in step with feedback_vote inserts/deletes
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class AwardDecision(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), unique=True, nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    reason = db.Column(db.Text)
+    decided_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    decided_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    award = db.relationship('Award', backref=db.backref('decision', uselist=False))
+    club = db.relationship('Club')
+    decider = db.relationship('User')
+
+class IngestWatermark(db.Model):
+    # How far scripts/load_metrics_from_csv.py has read each source CSV
+    source = db.Column(db.String(50), primary_key=True)
+    byte_offset = db.Column(db.Integer, default=0)
+    checksum = db.Column(db.String(40))  # sha1 of the file up to byte_offset
+    last_year = db.Column(db.Integer)
+    last_month = db.Column(db.Integer)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class AwardEligibility(db.Model):
+    # Precomputed award -> eligible club pairs, maintained by sync_award_eligibility()
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+
+class EligibilityVersion(db.Model):
+    # Single row bumped with every award_eligibility rebuild, so each process can tell its cached sets are stale
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class PageVersion(db.Model):
+    # Bumped by invalidate_pages, per route, so every worker's page cache can tell its copies are stale
+    route = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class RankingSnapshot(db.Model):
+    # A stored ranking, identified by the versions of the inputs it was computed from
+    id = db.Column(db.Integer, primary_key=True)
+    award_id = db.Column(db.Integer, db.ForeignKey('award.id'), nullable=False)
+    weights_version = db.Column(db.String(40), nullable=False)
+    votes_version = db.Column(db.String(40), nullable=False)
+    metrics_version = db.Column(db.String(40), nullable=False)
+    total = db.Column(db.Integer, nullable=False, default=0)  # clubs ranked
+    seconds = db.Column(db.Float)  # time taken to compute
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('award_id', 'weights_version', 'votes_version', 'metrics_version',
+                            name='ux_ranking_snapshot_key'),
+        db.Index('ix_ranking_snapshot_award_computed', 'award_id', 'computed_at'),
+    )
+
+    @property
+    def key(self):
+        return (self.award_id, self.weights_version, self.votes_version, self.metrics_version)
+
+class RankingSnapshotRow(db.Model):
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('ranking_snapshot.id'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    details = db.Column(db.Text, nullable=False)  # JSON: weighted components and raw inputs
+
+
+# -------- Vote tallies --------
+
+def _adjust_vote_tally(connection, award_id, club_id, delta):
+    table = VoteTally.__table__
+    stmt = sqlite_insert(table).values(award_id=award_id, club_id=club_id, count=max(delta, 0))
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=['award_id', 'club_id'], set_={'count': table.c.count + delta}))
+
+
+@event.listens_for(FeedbackVote, 'after_insert')
+def _count_vote(mapper, connection, vote):
+    # Runs inside the flush, so the tally commits or rolls back with the vote itself
+    _adjust_vote_tally(connection, vote.award_id, vote.club_id, 1)
+
+
+@event.listens_for(FeedbackVote, 'after_delete')
+def _uncount_vote(mapper, connection, vote):
+    _adjust_vote_tally(connection, vote.award_id, vote.club_id, -1)
+
+
+def bump_eligibility_version(connection):
+    """Mark award_eligibility as changed; run in the transaction that changes it."""
+    table = EligibilityVersion.__table__
+    connection.execute(sqlite_insert(table).values(id=1, version=1).on_conflict_do_update(
+        index_elements=['id'], set_={'version': table.c.version + 1}))
+
+
+def bump_page_versions(connection, routes):
+    """Mark the cached pages of ``routes`` (e.g. 'results', 'award') as stale in every process."""
+    table = PageVersion.__table__
+    for route in sorted(routes):
+        connection.execute(sqlite_insert(table).values(route=route, version=1).on_conflict_do_update(
+            index_elements=['route'], set_={'version': table.c.version + 1}))
+
+
+def rebuild_vote_tallies(connection):
+    """Recount vote_tally from feedback_vote; bulk inserts skip the mapper events above."""
+    vote, tally = FeedbackVote.__table__, VoteTally.__table__
+    connection.execute(tally.delete())
+    connection.execute(tally.insert().from_select(
+        ['award_id', 'club_id', 'count'],
+        db.select(vote.c.award_id, vote.c.club_id, db.func.count()).group_by(vote.c.award_id, vote.c.club_id)))
@@ -0,0 +1,84 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+class CachedPage:
+    __slots__ = ('body', 'mimetype', 'etag', 'last_modified', 'expires', 'version')
+
+    def __init__(self, body, mimetype, etag, last_modified, expires, version=None):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.version = version
+
+
+class PageCache:
+    """Rendered pages keyed by tuples such as ``('award', 3, 'anonymous')``.
+
+    Entries expire after ``ttl`` seconds and the least recently used ones are
+    evicted beyond ``max_entries``; ``ttl=0`` disables storage but pages still
+    get validators. ``invalidate`` drops entries by key prefix. A page rendered
+    while an invalidation happened is served but not stored, so a write can
+    never be masked by a render that started before it.
+
+    Invalidations made by other processes arrive through ``version``: each
+    entry keeps the version it was rendered under (read before rendering),
+    and ``get`` treats an entry filed under any other version as missing.
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, version=None):
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None or page.expires <= time.monotonic() or page.version != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return page
+
+    def put(self, key, body, mimetype, generation, version=None):
+        """Store a freshly rendered page; returns it with ETag/Last-Modified set.
+
+        Last-Modified only moves when the body actually changed, so a page
+        re-rendered after expiry keeps validating clients' copies.
+        """
+        etag = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous.etag == etag:
+                last_modified = previous.last_modified
+            else:
+                last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+            page = CachedPage(body, mimetype, etag, last_modified, time.monotonic() + self.ttl, version)
+            if self.ttl > 0 and generation == self.generation:
+                self._entries[key] = page
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return page
+
+    def invalidate(self, *prefixes):
+        """Drop entries whose key starts with any prefix (a tuple, or a single route name)."""
+        prefixes = [p if isinstance(p, tuple) else (p,) for p in prefixes]
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if any(k[:len(p)] == p for p in prefixes)]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'entries': len(self._entries)}
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Counts SQL statements executed on ``engines`` while the context is active, and the time spent in them.
+
+        with QueryCounter(*db.engines.values()) as qc:   # the write and the read engine
+            client.get('/admin/dashboard')
+        print(qc.count, qc.seconds, qc.statements)
+
+    ``engines`` may also be the ``Engine`` class, for every engine. With
+    ``this_thread=True`` only statements run by the thread that entered the
+    context are counted, leaving out background jobs the work triggers.
+    """
+
+    def __init__(self, *engines, this_thread=False):
+        self.engines = engines
+        self.this_thread = this_thread
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = []
+        self._thread = None
+
+    def _counts(self):
+        return not self.this_thread or threading.get_ident() == self._thread
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._counts():
+            self.count += 1
+            self.statements.append(statement)
+            conn.info[id(self)] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop(id(self), None)
+        if started is not None:
+            self.seconds += time.perf_counter() - started
+
+    def __enter__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = []
+        self._thread = threading.get_ident()
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+        return False
+
+
+def assert_query_count_flat(engines, make_request, add_rows, rounds=2):
+    """Fail if the queries issued by ``make_request()`` grow as ``add_rows()`` inserts data.
+
+    ``engines`` is one engine or a sequence of them (pass every bind a view
+    may read from). ``make_request`` is counted once as a baseline and again
+    after each of ``rounds`` calls to ``add_rows``; every count must be the
+    same. Each count is preceded by an uncounted warm-up run, since the
+    writes in ``add_rows`` may invalidate caches. Returns the (constant)
+    query count.
+    """
+    engines = tuple(engines) if isinstance(engines, (list, tuple)) else (engines,)
+    counts = []
+    for i in range(rounds + 1):
+        if i:
+            add_rows()
+        make_request()
+        with QueryCounter(*engines) as qc:
+            make_request()
+        counts.append(qc.count)
+    if len(set(counts)) != 1:
+        raise AssertionError(f'query count grows with row count: {counts}')
+    return counts[0]
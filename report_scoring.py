@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+POSITIVE_KEYWORDS = [
+    'successful', 'collaboration', 'won', 'first place', 'mentorship', 'improved', 'impact',
+    'innovation', 'praise', 'excellent', 'record attendance', 'strong engagement', 'high satisfaction'
+]
+NEGATIVE_KEYWORDS = [
+    'postponements', 'lower turnout', 'challenges', 'conflicts', 'cancelled', 'delay'
+]
+
+
+class KeywordCounter:
+    """Counts every keyword in one regex pass with ``str.count`` semantics.
+
+    A zero-width lookahead alternation (longest keyword first) reports the
+    longest keyword starting at each position; keywords that are prefixes of
+    it start there too. Per keyword, occurrences are then taken greedily
+    left to right without overlapping themselves, exactly like
+    ``text.count(keyword)``, while different keywords may overlap.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        ordered = sorted(set(self.keywords), key=len, reverse=True)
+        self._pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in ordered) + '))')
+        self._starting_with = {k: [p for p in ordered if k.startswith(p)] for k in ordered}
+
+    def counts(self, text):
+        found = dict.fromkeys(self._starting_with, 0)
+        next_free = dict.fromkeys(self._starting_with, 0)
+        for m in self._pattern.finditer(text):
+            pos = m.start()
+            for k in self._starting_with[m.group(1)]:
+                if pos >= next_free[k]:
+                    found[k] += 1
+                    next_free[k] = pos + len(k)
+        return [found[k] for k in self.keywords]
+
+
+_counter = KeywordCounter(POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS)
+
+
+def score_text(text):
+    """Report score of lower-cased ``text``: (positives - 0.5 * negatives) / 10, clamped to [0, 1]."""
+    counts = _counter.counts(text)
+    pos = sum(counts[:len(POSITIVE_KEYWORDS)])
+    neg = sum(counts[len(POSITIVE_KEYWORDS):])
+    return max(0.0, min(1.0, (pos - 0.5 * neg) / 10.0))
+
+
+def score_report_file(path):
+    """Score one report file, or None if it cannot be read."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return score_text(f.read().lower())
+    except Exception:
+        return None
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class ReportScoreCache:
+    """Per-file report scores, recomputed only when a file's size or mtime changes.
+
+    Files are scored in the calling thread unless ``scores`` is asked for
+    ``parallel`` scoring, which only the snapshot build (a CLI command)
+    does: then, when at least ``parallel_threshold`` files need scoring,
+    they are spread over a spawned process pool of ``workers`` processes
+    (default: CPU count). Request threads never start processes; forking a
+    multi-threaded server process is unsafe.
+    """
+
+    def __init__(self, workers=None, parallel_threshold=256):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self._lock = threading.Lock()
+        self._scores = {}  # path -> (signature, score)
+
+    def scores(self, files, parallel=False):
+        """Map club_id -> score for ``files``, an iterable of (club_id, path)."""
+        result = {}
+        stale = []
+        with self._lock:
+            for cid, path in files:
+                sig = _file_signature(path)
+                cached = self._scores.get(path)
+                if cached is not None and cached[0] == sig:
+                    if cached[1] is not None:
+                        result[cid] = cached[1]
+                else:
+                    stale.append((cid, path, sig))
+
+        paths = [path for _, path, _ in stale]
+        if parallel and len(paths) >= self.parallel_threshold and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                computed = list(pool.map(score_report_file, paths, chunksize=max(1, len(paths) // (self.workers * 4))))
+        else:
+            computed = [score_report_file(path) for path in paths]
+
+        with self._lock:
+            for (cid, path, sig), score in zip(stale, computed):
+                self._scores[path] = (sig, score)
+                if score is not None:
+                    result[cid] = score
+        return result
@@ -0,0 +1,145 @@
+import os
+import argparse
+import json
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import sys
+import uuid
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'awards.db')
+
+# Environment of every run: the page cache would answer most reads without touching SQLite
+CHILD_ENV = {'PAGE_CACHE_TTL': '0'}
+# Per-profile overrides; 'before' reproduces the untuned defaults
+PROFILES = {
+    'before': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_CACHE_SIZE': '-2000',
+               'SQLITE_MMAP_SIZE': '0', 'SQLITE_READ_ENGINE': '0'},
+    'after': {},
+}
+READ_URLS = ('/results', '/awards', '/clubs')
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def scratch_copy():
+    """Copy the app database (including any WAL content) to a temporary file."""
+    path = os.path.join(tempfile.mkdtemp(prefix='read-bench-'), 'awards.db')
+    if os.path.exists(SOURCE_DB):
+        src, dst = sqlite3.connect(SOURCE_DB), sqlite3.connect(path)
+        src.backup(dst)
+        src.close()
+        dst.close()
+    return path
+
+
+def child(readers, writers, seconds):
+    """One measurement in a fresh process, so the profile's environment is read at import."""
+    from werkzeug.security import generate_password_hash
+    from app import create_app, eligibility_index, init_database, sync_award_eligibility
+    from models import db, User
+
+    app = create_app()
+    app.logger.disabled = True
+    with app.app_context():
+        init_database()
+        sync_award_eligibility()
+        password_hash = generate_password_hash('bench')
+        names = [f'bench_{uuid.uuid4().hex[:10]}' for _ in range(writers)]
+        db.session.add_all(User(username=n, email=f'{n}@example.com', password_hash=password_hash) for n in names)
+        db.session.commit()
+        pairs = [(aid, cid) for aid, cids in eligibility_index().items() for cid in sorted(cids)]
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_latencies, write_latencies, errors = [], [], []
+
+    def record(bucket, started, ok, error=None):
+        with lock:
+            if ok:
+                bucket.append(time.perf_counter() - started)
+            else:
+                errors.append(error)
+
+    def reader(i):
+        client = app.test_client()
+        n = i
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                r = client.get(READ_URLS[n % len(READ_URLS)])
+                record(read_latencies, started, r.status_code == 200, f'HTTP {r.status_code}')
+            except Exception as exc:
+                record(read_latencies, started, False, type(exc).__name__)
+            n += 1
+
+    def writer(username):
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': 'bench', 'role': 'student'})
+        n = 0
+        while not stop.is_set():
+            award_id, club_id = pairs[n % len(pairs)]
+            started = time.perf_counter()
+            try:
+                r = client.post(f'/awards/{award_id}/vote', data={'club_id': club_id, 'voter_hash': uuid.uuid4().hex})
+                record(write_latencies, started, r.status_code == 302, f'HTTP {r.status_code}')
+            except Exception as exc:
+                record(write_latencies, started, False, type(exc).__name__)
+            n += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(u,)) for u in names]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {
+        'journal_mode': journal_mode,
+        'reads_per_sec': len(read_latencies) / seconds,
+        'read_p99_ms': percentile(read_latencies, 99) * 1000 if read_latencies else 0.0,
+        'writes_per_sec': len(write_latencies) / seconds,
+        'write_p99_ms': percentile(write_latencies, 99) * 1000 if write_latencies else 0.0,
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read throughput on /results, /awards and /clubs during sustained vote writes.')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.readers, args.writers, args.seconds)))
+        return
+
+    print(f'{args.readers} readers, {args.writers} vote writers, {args.seconds:.0f}s per profile')
+    for name, overrides in PROFILES.items():
+        db_path = scratch_copy()
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + db_path, **CHILD_ENV, **overrides)
+        out = subprocess.run(
+            [sys.executable, '-m', 'scripts.benchmark_concurrent_reads', '--child', '--readers', str(args.readers),
+             '--writers', str(args.writers), '--seconds', str(args.seconds)],
+            env=env, capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print('{name:>7} ({journal_mode}): reads {reads_per_sec:,.0f}/s p99 {read_p99_ms:.1f} ms, '
+              'votes {writes_per_sec:,.0f}/s p99 {write_p99_ms:.1f} ms, {errors} errors'.format(name=name, **result))
+        # the database and whatever -wal/-shm/-journal files the run left next to it
+        shutil.rmtree(os.path.dirname(db_path))
+
+
+if __name__ == '__main__':
+    main()
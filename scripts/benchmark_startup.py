@@ -0,0 +1,92 @@
+import os
+import argparse
+import json
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DB = os.path.join(ROOT, 'instance', 'awards.db')
+
+# entry point -> code run in a fresh interpreter
+ENTRY_POINTS = {
+    'import models': 'import models',
+    'import app': 'import app',
+    'create_app()': 'import app; app.create_app()',
+    'first request /awards': 'import app; app.create_app().test_client().get("/awards")',
+    'scripts.build_metrics_snapshot': 'import scripts.build_metrics_snapshot',
+    'scripts.load_metrics_from_csv': 'import scripts.load_metrics_from_csv',
+    'scripts.generate_synthetic_data': 'import scripts.generate_synthetic_data',
+}
+
+CHILD = '''
+import json, time
+statements = [0]
+if {count}:
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    event.listen(Engine, 'before_cursor_execute', lambda *args: statements.__setitem__(0, statements[0] + 1))
+started = time.perf_counter()
+exec(compile({code!r}, '<entry point>', 'exec'))
+print(json.dumps({{'seconds': time.perf_counter() - started, 'statements': statements[0]}}))
+'''
+
+
+def scratch_copy(directory):
+    """Copy the app database into ``directory``; opening it (WAL pragmas) never touches the real one."""
+    path = os.path.join(directory, 'awards.db')
+    if os.path.exists(SOURCE_DB):
+        # backup() rather than a file copy so committed WAL content comes along
+        src, dst = sqlite3.connect(SOURCE_DB), sqlite3.connect(path)
+        src.backup(dst)
+        src.close()
+        dst.close()
+    return path
+
+
+def run_child(code, env, count=False):
+    """Run ``code`` in a new interpreter; returns (in-process seconds, process seconds, SQL statements)."""
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', CHILD.format(code=code, count=count)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result['seconds'], wall, result['statements']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start cost per entry point, each measured in a fresh interpreter.')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per entry point (median is reported)')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='startup-bench-')
+    env = dict(os.environ, DATABASE_URL='sqlite:///' + scratch_copy(scratch_dir))
+    results = {}
+    print(f"{'entry point':<34}{'median':>10}{'min':>10}{'process':>10}{'SQL':>6}")
+    for name, code in ENTRY_POINTS.items():
+        runs = [run_child(code, env) for _ in range(args.repeat)]
+        _, _, statements = run_child(code, env, count=True)
+        seconds = [r[0] for r in runs]
+        results[name] = {
+            'median_ms': statistics.median(seconds) * 1000,
+            'min_ms': min(seconds) * 1000,
+            'process_ms': statistics.median(r[1] for r in runs) * 1000,
+            'statements': statements,
+        }
+        r = results[name]
+        print(f"{name:<34}{r['median_ms']:>8.0f}ms{r['min_ms']:>8.0f}ms{r['process_ms']:>8.0f}ms{statements:>6}")
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Results written to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
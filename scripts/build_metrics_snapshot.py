@@ -0,0 +1,10 @@
+from app import SNAPSHOT_PATH, write_metrics_snapshot
+
+
+def main():
+    clubs = write_metrics_snapshot()
+    print(f'Metrics snapshot for {clubs} clubs written to {SNAPSHOT_PATH}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,56 @@
 import os
+import argparse
 import csv
-from datetime import datetime, timedelta
+import hashlib
 import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from werkzeug.security import generate_password_hash
+
+from app import (DATA_DIR, METRIC_SOURCES, REPORTS_DIR, SAMPLE_AWARDS, SAMPLE_CLUBS, auto_nominate_all_awards,
+                 create_app, get_award_eligibility_predicate, init_database, write_metrics_snapshot)
+from models import db, Award, AwardEligibility, Club, FeedbackVote, User, bump_eligibility_version, rebuild_vote_tallies
 
-# Ensure we can import the Flask app
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+# Columns of each generated CSV, in file order
+HEADERS = {
+    'instagram_monthly.csv': ['club_id', 'club_name', 'year', 'month', 'posts', 'likes', 'reach'],
+    'whatsapp_monthly.csv': ['club_id', 'club_name', 'year', 'month', 'messages', 'sentiment', 'active_members'],
+    'attendance_events.csv': ['club_id', 'club_name', 'year', 'month', 'event_name', 'attendees'],
+    'awards_won.csv': ['club_id', 'club_name', 'year', 'month', 'award_name', 'level'],
+}
 
-from app import app, db, Club
+AWARD_POOL = [
+    'Hackathon Winner', 'Debate Trophy', 'Cultural Fest Champion', 'Community Service',
+    'Innovation Prize', 'Leadership Cup', 'Sports Meet Medal', 'Photography Contest'
+]
+POSITIVE_SNIPPETS = [
+    'successful workshop with high student participation',
+    'collaboration with external organization boosted outreach',
+    'won first place in inter-college competition',
+    'mentorship program improved leadership skills',
+    'community service created measurable impact',
+    'innovation showcased at tech fest received praise',
+    'excellent feedback with high satisfaction scores',
+    'record attendance and strong engagement throughout the semester',
+]
+NEUTRAL_SNIPPETS = [
+    'regular weekly meetings were conducted',
+    'events organized as per calendar',
+    'participation remained steady',
+    'sessions included talks and demonstrations',
+]
+NEGATIVE_SNIPPETS = [
+    'event postponements due to resource constraints',
+    'lower turnout than expected for some sessions',
+    'sponsorship challenges affected event scale',
+    'schedule conflicts impacted participation',
+]
+
+INSERT_CHUNK = 10000  # rows per executemany when filling the scratch database
 
 
 def month_range(months: int = 12):
@@ -17,145 +60,318 @@ def month_range(months: int = 12):
         yield m.year, m.month
 
 
+def months_ending(year: int, month: int, count: int):
+    """``count`` calendar months ending at year-month, latest first."""
+    index = year * 12 + month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index, index - count, -1)]
+
+
 def ensure_dir(path: str):
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
 
 
-def write_csv(filepath: str, header: list[str], rows: list[list]):
+def write_csv(filepath: str, header, rows):
+    """Write ``header`` and then ``rows`` (any iterable; consumed as it is written)."""
     ensure_dir(os.path.dirname(filepath))
     with open(filepath, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow(header)
+        if header:
+            writer.writerow(header)
         writer.writerows(rows)
 
 
+# ---- Rows per club; ``months`` is a list of (year, month), ``rng`` a random.Random or the random module ----
+
+def instagram_rows(club, months, rng):
+    base_posts = rng.randint(2, 15)
+    base_likes = rng.randint(100, 1500)
+    base_reach = rng.randint(800, 8000)
+    for year, month in months:
+        seasonality = 1.0 + 0.2 * rng.uniform(-1, 1)
+        posts = max(0, int(rng.gauss(base_posts, 3) * seasonality))
+        likes = max(0, int(rng.gauss(base_likes, 200) * (0.8 + posts / 40)))
+        reach = max(0, int(rng.gauss(base_reach, 600) * (0.9 + posts / 50)))
+        yield [club.id, club.name, year, month, posts, likes, reach]
+
+
+def whatsapp_rows(club, months, rng):
+    base_msgs = rng.randint(200, 1500)
+    sentiment_center = rng.uniform(-0.1, 0.6)
+    for year, month in months:
+        activity = max(0, int(rng.gauss(base_msgs, base_msgs * 0.25)))
+        sentiment = max(-1.0, min(1.0, rng.gauss(sentiment_center, 0.25)))
+        active_members = max(5, int((club.member_count or 30) * rng.uniform(0.2, 0.7)))
+        yield [club.id, club.name, year, month, activity, round(sentiment, 3), active_members]
+
+
+def attendance_rows(club, months, rng, events=None):
+    """Events per month scatter around ``events`` (a random 1-5 per club when None)."""
+    base_events = rng.randint(1, 5) if events is None else events
+    for year, month in months:
+        for e in range(max(0, int(rng.gauss(base_events, 1)))):
+            event_name = f"{club.name} Event {e + 1}"
+            attendees = max(5, int(rng.gauss((club.member_count or 40) * 0.5, 10)))
+            yield [club.id, club.name, year, month, event_name, attendees]
+
+
+def awards_rows(club, months, rng):
+    wins_this_year = max(0, int(rng.gauss(1.0 if (club.category or '').lower() in ['technical', 'cultural'] else 0.5, 1)))
+    # Distribute wins over months
+    months = list(months)
+    rng.shuffle(months)
+    for year, month in months[:wins_this_year]:
+        award_name = rng.choice(AWARD_POOL)
+        level = rng.choice(['College', 'City', 'State', 'National'])
+        yield [club.id, club.name, year, month, award_name, level]
+
+
+def report_text(club, rng, year):
+    lines = [
+        f"Club: {club.name}",
+        f"Category: {club.category}",
+        f"Year: {year}",
+        "Summary Report:",
+        ""
+    ]
+    lines += [f"- {rng.choice(POSITIVE_SNIPPETS)}." for _ in range(rng.randint(6, 12))]
+    lines += [f"- {rng.choice(NEUTRAL_SNIPPETS)}." for _ in range(rng.randint(3, 6))]
+    lines += [f"- {rng.choice(NEGATIVE_SNIPPETS)}." for _ in range(rng.randint(0, 3))]
+    return '\n'.join(lines)
+
+
+# ---- Default mode: the clubs already in the database, 12 months up to now, written to app.DATA_DIR ----
+
 def generate_instagram(clubs):
-    rows = []
-    for club in clubs:
-        base_posts = random.randint(2, 15)
-        base_likes = random.randint(100, 1500)
-        base_reach = random.randint(800, 8000)
-        for year, month in month_range(12):
-            seasonality = 1.0 + 0.2 * random.uniform(-1, 1)
-            posts = max(0, int(random.gauss(base_posts, 3) * seasonality))
-            likes = max(0, int(random.gauss(base_likes, 200) * (0.8 + posts / 40)))
-            reach = max(0, int(random.gauss(base_reach, 600) * (0.9 + posts / 50)))
-            rows.append([club.id, club.name, year, month, posts, likes, reach])
-    write_csv('data/instagram_monthly.csv',
-              ['club_id', 'club_name', 'year', 'month', 'posts', 'likes', 'reach'],
-              rows)
+    months = list(month_range(12))
+    write_csv(METRIC_SOURCES['instagram'], HEADERS['instagram_monthly.csv'],
+              (row for club in clubs for row in instagram_rows(club, months, random)))
 
 
 def generate_whatsapp(clubs):
-    rows = []
-    for club in clubs:
-        base_msgs = random.randint(200, 1500)
-        sentiment_center = random.uniform(-0.1, 0.6)
-        for year, month in month_range(12):
-            activity = max(0, int(random.gauss(base_msgs, base_msgs * 0.25)))
-            sentiment = max(-1.0, min(1.0, random.gauss(sentiment_center, 0.25)))
-            active_members = max(5, int((club.member_count or 30) * random.uniform(0.2, 0.7)))
-            rows.append([club.id, club.name, year, month, activity, round(sentiment, 3), active_members])
-    write_csv('data/whatsapp_monthly.csv',
-              ['club_id', 'club_name', 'year', 'month', 'messages', 'sentiment', 'active_members'],
-              rows)
+    months = list(month_range(12))
+    write_csv(METRIC_SOURCES['whatsapp'], HEADERS['whatsapp_monthly.csv'],
+              (row for club in clubs for row in whatsapp_rows(club, months, random)))
 
 
 def generate_attendance(clubs):
-    rows = []
-    for club in clubs:
-        base_events = random.randint(1, 5)
-        for year, month in month_range(12):
-            events = max(0, int(random.gauss(base_events, 1)))
-            for e in range(events):
-                event_name = f"{club.name} Event {e + 1}"
-                attendees = max(5, int(random.gauss((club.member_count or 40) * 0.5, 10)))
-                rows.append([club.id, club.name, year, month, event_name, attendees])
-    write_csv('data/attendance_events.csv',
-              ['club_id', 'club_name', 'year', 'month', 'event_name', 'attendees'],
-              rows)
+    months = list(month_range(12))
+    write_csv(METRIC_SOURCES['attendance'], HEADERS['attendance_events.csv'],
+              (row for club in clubs for row in attendance_rows(club, months, random)))
 
 
 def generate_awards(clubs):
-    rows = []
-    award_pool = [
-        'Hackathon Winner', 'Debate Trophy', 'Cultural Fest Champion', 'Community Service',
-        'Innovation Prize', 'Leadership Cup', 'Sports Meet Medal', 'Photography Contest'
-    ]
-    for club in clubs:
-        wins_this_year = max(0, int(random.gauss(1.0 if (club.category or '').lower() in ['technical', 'cultural'] else 0.5, 1)))
-        # Distribute wins over months
-        months = list(month_range(12))
-        random.shuffle(months)
-        for i in range(min(wins_this_year, len(months))):
-            year, month = months[i]
-            award_name = random.choice(award_pool)
-            level = random.choice(['College', 'City', 'State', 'National'])
-            rows.append([club.id, club.name, year, month, award_name, level])
-    write_csv('data/awards_won.csv',
-              ['club_id', 'club_name', 'year', 'month', 'award_name', 'level'],
-              rows)
+    months = list(month_range(12))
+    write_csv(METRIC_SOURCES['awards'], HEADERS['awards_won.csv'],
+              (row for club in clubs for row in awards_rows(club, months, random)))
 
 
 def generate_reports(clubs):
-    reports_dir = os.path.join('data', 'reports')
-    ensure_dir(reports_dir)
-    positive_snippets = [
-        'successful workshop with high student participation',
-        'collaboration with external organization boosted outreach',
-        'won first place in inter-college competition',
-        'mentorship program improved leadership skills',
-        'community service created measurable impact',
-        'innovation showcased at tech fest received praise',
-        'excellent feedback with high satisfaction scores',
-        'record attendance and strong engagement throughout the semester',
-    ]
-    neutral_snippets = [
-        'regular weekly meetings were conducted',
-        'events organized as per calendar',
-        'participation remained steady',
-        'sessions included talks and demonstrations',
-    ]
-    negative_snippets = [
-        'event postponements due to resource constraints',
-        'lower turnout than expected for some sessions',
-        'sponsorship challenges affected event scale',
-        'schedule conflicts impacted participation',
-    ]
+    ensure_dir(REPORTS_DIR)
     for club in clubs:
-        positives = random.randint(6, 12)
-        neutrals = random.randint(3, 6)
-        negatives = random.randint(0, 3)
-        lines = [
-            f"Club: {club.name}",
-            f"Category: {club.category}",
-            f"Year: {datetime.utcnow().year}",
-            "Summary Report:",
-            ""
-        ]
-        lines += [f"- {random.choice(positive_snippets)}." for _ in range(positives)]
-        lines += [f"- {random.choice(neutral_snippets)}." for _ in range(neutrals)]
-        lines += [f"- {random.choice(negative_snippets)}." for _ in range(negatives)]
-        with open(os.path.join(reports_dir, f"club_{club.id}.txt"), 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        with open(os.path.join(REPORTS_DIR, f"club_{club.id}.txt"), 'w', encoding='utf-8') as f:
+            f.write(report_text(club, random, datetime.utcnow().year))
 
 
-def main():
+# ---- Scale mode: N synthetic clubs, generated in shards on a process pool ----
+
+def synthetic_club(club_id: int, seed: int):
+    """Club ``club_id`` of a generated dataset, modelled on the sample club with the same position mod 12.
+
+    Depends only on (club_id, seed), so every process builds the same club.
+    """
+    rng = random.Random(f'{seed}:club:{club_id}')
+    template = SAMPLE_CLUBS[(club_id - 1) % len(SAMPLE_CLUBS)]
+    return SimpleNamespace(
+        id=club_id,
+        name=f"{template['name']} {club_id}",
+        description=template['description'],
+        category=template['category'],
+        founded_year=rng.randint(template['founded_year'] - 5, template['founded_year'] + 4),
+        member_count=max(5, int(rng.gauss(template['member_count'], 10))),
+        achievements=None,
+    )
+
+
+def generate_shard(task):
+    """Write CSV parts (no header) and report files for clubs [first, last); returns rows per file."""
+    shard, first, last, opts = task
+    parts_dir = os.path.join(opts['out'], '.parts')
+    reports_dir = os.path.join(opts['out'], 'reports')
+    months = months_ending(opts['end_year'], opts['end_month'], opts['months'])
+    files = {name: open(os.path.join(parts_dir, f'{name}.{shard:06d}'), 'w', newline='', encoding='utf-8')
+             for name in HEADERS}
+    counts = dict.fromkeys(HEADERS, 0)
+    try:
+        writers = {name: csv.writer(f) for name, f in files.items()}
+        for club_id in range(first, last):
+            club = synthetic_club(club_id, opts['seed'])
+            # one generator per club, so output does not depend on shard size or worker count
+            rng = random.Random(f"{opts['seed']}:metrics:{club_id}")
+            for name, rows in (('instagram_monthly.csv', instagram_rows(club, months, rng)),
+                               ('whatsapp_monthly.csv', whatsapp_rows(club, months, rng)),
+                               ('attendance_events.csv', attendance_rows(club, months, rng, opts['events'])),
+                               ('awards_won.csv', awards_rows(club, months, rng))):
+                for row in rows:
+                    writers[name].writerow(row)
+                    counts[name] += 1
+            if opts['reports']:
+                with open(os.path.join(reports_dir, f'club_{club_id}.txt'), 'w', encoding='utf-8') as f:
+                    f.write(report_text(club, rng, opts['end_year']))
+    finally:
+        for f in files.values():
+            f.close()
+    return counts
+
+
+def generate_dataset(opts, workers=None, shard_size=2000):
+    """Generate the CSVs (and reports) for ``opts['clubs']`` clubs under ``opts['out']``; returns rows per file."""
+    parts_dir = os.path.join(opts['out'], '.parts')
+    ensure_dir(parts_dir)
+    if opts['reports']:
+        ensure_dir(os.path.join(opts['out'], 'reports'))
+    bounds = range(1, opts['clubs'] + 1, shard_size)
+    tasks = [(i, first, min(first + shard_size, opts['clubs'] + 1), opts) for i, first in enumerate(bounds)]
+    totals = dict.fromkeys(HEADERS, 0)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(generate_shard, tasks):
+            for name, n in counts.items():
+                totals[name] += n
+    # Concatenate the parts in shard order behind one header
+    for name, header in HEADERS.items():
+        with open(os.path.join(opts['out'], name), 'w', newline='', encoding='utf-8') as out:
+            csv.writer(out).writerow(header)
+            for shard, *_ in tasks:
+                part = os.path.join(parts_dir, f'{name}.{shard:06d}')
+                with open(part, 'r', newline='', encoding='utf-8') as f:
+                    shutil.copyfileobj(f, out, 1 << 20)
+    shutil.rmtree(parts_dir)
+    return totals
+
+
+def _insert_chunks(model, rows):
+    """Bulk INSERT ``rows`` (an iterable of dicts) ``INSERT_CHUNK`` at a time; returns the count."""
+    n = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == INSERT_CHUNK:
+            db.session.execute(db.insert(model), chunk)
+            n += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(db.insert(model), chunk)
+        n += len(chunk)
+    return n
+
+
+def fill_database(path, opts, users, votes):
+    """Create a scratch SQLite database at ``path`` holding the generated clubs, users, nominations and votes.
+
+    Rows go in through bulk INSERTs, which bypass the ORM events; eligibility
+    and vote tallies are therefore written explicitly. Returns row counts.
+    """
+    if os.path.exists(path):
+        raise SystemExit(f'{path} already exists; pass a new path for the scratch database.')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(path)
+    app = create_app()
+    seed = opts['seed']
+    counts = {}
     with app.app_context():
-        db.create_all()
-        clubs = Club.query.all()
-        if not clubs:
-            raise SystemExit('No clubs found. Run the app once to seed clubs, or add clubs first.')
-        generate_instagram(clubs)
-        generate_whatsapp(clubs)
-        generate_attendance(clubs)
-        generate_awards(clubs)
-        generate_reports(clubs)
-        print('Synthetic datasets written under data/')
+        init_database()
+        db.session.add(User(username='admin', email='admin@example.com',
+                            password_hash=generate_password_hash('admin123'), is_admin=True))
+        db.session.commit()
+        _insert_chunks(Award, (dict(fields) for fields in SAMPLE_AWARDS))
+        awards = [(aid, name) for aid, name in db.session.query(Award.id, Award.name).order_by(Award.id)]
 
+        clubs = (synthetic_club(cid, seed) for cid in range(1, opts['clubs'] + 1))
+        eligible = {aid: [] for aid, _ in awards}
+        rules = [(aid, get_award_eligibility_predicate(name)) for aid, name in awards]
 
-if __name__ == '__main__':
-    main()
+        def club_rows():
+            for club in clubs:
+                for aid, rule in rules:
+                    if rule(club):
+                        eligible[aid].append(club.id)
+                yield dict(vars(club))
+        counts['clubs'] = _insert_chunks(Club, club_rows())
+        counts['eligibility'] = _insert_chunks(AwardEligibility, ({'award_id': aid, 'club_id': cid}
+                                                                   for aid, cids in eligible.items() for cid in cids))
+        bump_eligibility_version(db.session.connection())
+        db.session.commit()
+        counts['nominations'], _ = auto_nominate_all_awards()
+
+        password_hash = generate_password_hash('student')
+        counts['users'] = _insert_chunks(User, ({'username': f'student{n:07d}', 'email': f'student{n:07d}@example.com',
+                                                 'password_hash': password_hash, 'is_admin': False}
+                                                for n in range(1, users + 1)))
 
+        # Vote v is user v % users voting in award (v // users): at most one vote per user and award
+        voting_awards = [aid for aid, _ in awards if eligible[aid]]
+        limit = min(votes, users * len(voting_awards))
+        if limit < votes:
+            print(f'Only {limit} votes fit {users} users x {len(voting_awards)} awards (one vote per user and award)')
+        rng = random.Random(f'{seed}:votes')
 
+        def vote_rows():
+            for v in range(limit):
+                user, aid = v % users, voting_awards[v // users]
+                yield {'award_id': aid, 'club_id': rng.choice(eligible[aid]),
+                       'voter_hash': hashlib.sha1(f'{seed}:{user}:{aid}'.encode()).hexdigest()}
+        counts['votes'] = _insert_chunks(FeedbackVote, vote_rows())
+        rebuild_vote_tallies(db.session.connection())
+        db.session.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate the metric CSVs and reports. Without --clubs, for the clubs in the app database '
+                    '(written to METRICS_DATA_DIR, default data/, where the app reads them); with --clubs, for that many '
+                    'synthetic clubs, in parallel and seeded.')
+    parser.add_argument('--clubs', type=int, help='number of synthetic clubs (enables scale mode)')
+    parser.add_argument('--months', type=int, default=12, help='months of history per club')
+    parser.add_argument('--end-month', default='2025-09', help='latest month generated, YYYY-MM')
+    parser.add_argument('--events', type=float, default=3, help='average attendance events per club and month')
+    parser.add_argument('--seed', type=int, default=0, help='same seed and parameters give byte-identical output')
+    parser.add_argument('--out', default=os.path.join('build', 'synthetic'), help='output directory in scale mode')
+    parser.add_argument('--no-reports', dest='reports', action='store_false', help='skip reports/club_<id>.txt')
+    parser.add_argument('--workers', type=int, help='processes (default: one per CPU)')
+    parser.add_argument('--shard-size', type=int, default=2000, help='clubs per shard')
+    parser.add_argument('--db', help='also write clubs, users, nominations and votes to this new SQLite file')
+    parser.add_argument('--users', type=int, default=1000, help='student accounts in the scratch database')
+    parser.add_argument('--votes', type=int, default=10000, help='votes in the scratch database')
+    args = parser.parse_args()
+
+    if args.clubs is None:
+        with create_app().app_context():
+            init_database()
+            clubs = Club.query.all()
+            if not clubs:
+                raise SystemExit('No clubs found. Run `flask --app app seed` to add the sample clubs, or add clubs first.')
+            generate_instagram(clubs)
+            generate_whatsapp(clubs)
+            generate_attendance(clubs)
+            generate_awards(clubs)
+            generate_reports(clubs)
+            print(f'Synthetic datasets written under {DATA_DIR}')
+            print(f'Metrics snapshot compiled for {write_metrics_snapshot()} clubs')
+        return
+
+    end_year, end_month = (int(x) for x in args.end_month.split('-'))
+    opts = {'clubs': args.clubs, 'months': args.months, 'end_year': end_year, 'end_month': end_month,
+            'events': args.events, 'seed': args.seed, 'out': args.out, 'reports': args.reports}
+    started = time.perf_counter()
+    rows = generate_dataset(opts, args.workers, args.shard_size)
+    print(f'{args.clubs} clubs x {args.months} months written under {args.out} in {time.perf_counter() - started:.1f}s: '
+          + ', '.join(f'{name} {n:,} rows' for name, n in rows.items()))
+    if args.db:
+        started = time.perf_counter()
+        counts = fill_database(args.db, opts, args.users, args.votes)
+        print(f'Scratch database {args.db} filled in {time.perf_counter() - started:.1f}s: '
+              + ', '.join(f'{n:,} {name}' for name, n in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,97 +1,128 @@
 import os
-import csv
+import argparse
 from collections import defaultdict
-
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-
-from app import app, db, Club, ClubMetrics
-
-
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-
-
-def read_csv(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
-
-
-def aggregate_instagram(rows, agg):
-    for r in rows:
-        cid = int(r['club_id'])
-        agg[cid]['instagram_posts'] += int(r['posts'])
-        agg[cid]['instagram_likes'] += int(r['likes'])
-        agg[cid]['instagram_reach'] += int(r['reach'])
-
-
-def aggregate_whatsapp(rows, agg):
-    for r in rows:
-        cid = int(r['club_id'])
-        agg[cid]['whatsapp_messages'] += int(r['messages'])
-        agg[cid]['_sent_sum'] += float(r['sentiment'])
-        agg[cid]['_sent_cnt'] += 1
-
-
-def aggregate_attendance(rows, agg):
-    for r in rows:
-        cid = int(r['club_id'])
-        agg[cid]['offline_attendance'] += int(r['attendees'])
-
-
-def aggregate_awards(rows, agg):
-    for r in rows:
-        cid = int(r['club_id'])
-        agg[cid]['awards_won'] += 1
-
-
-def main():
-    paths = {
-        'instagram': os.path.join(DATA_DIR, 'instagram_monthly.csv'),
-        'whatsapp': os.path.join(DATA_DIR, 'whatsapp_monthly.csv'),
-        'attendance': os.path.join(DATA_DIR, 'attendance_events.csv'),
-        'awards': os.path.join(DATA_DIR, 'awards_won.csv'),
-    }
+from datetime import datetime
+
+from sqlalchemy import case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app import METRIC_SOURCES, create_app, init_database, write_metrics_snapshot
+from metrics_ingest import (SOURCES, CsvTail, by_month, collapse_months, month_key, new_totals, peak_rss_mb,
+                            prefix_checksum, track_months)
+from models import db, Club, ClubMetrics, ClubMetricsMonthly, IngestWatermark
+
+
+# ClubMetrics columns fed by each source; reset before a source is re-read from the start
+SOURCE_COLUMNS = {
+    'instagram': ('instagram_posts', 'instagram_likes', 'instagram_reach'),
+    'whatsapp': ('whatsapp_messages', 'whatsapp_sentiment_sum', 'whatsapp_sentiment_cnt', 'whatsapp_sentiment'),
+    'attendance': ('offline_attendance',),
+    'awards': ('awards_won',),
+}
+TOTAL_COLUMNS = tuple(new_totals())
+
+
+def resume_offset(path, mark):
+    """Byte offset to resume from, or 0 when the file no longer extends the watermark."""
+    if mark is None or not mark.byte_offset:
+        return 0
+    if os.path.getsize(path) < mark.byte_offset:
+        return 0
+    if prefix_checksum(path, mark.byte_offset) != mark.checksum:
+        return 0
+    return mark.byte_offset
+
+
+def upsert_deltas(deltas):
+    """Add per-club deltas to ClubMetrics with one INSERT ... ON CONFLICT DO UPDATE."""
+    if not deltas:
+        return
+    table = ClubMetrics.__table__
+    rows = []
+    for cid, d in deltas.items():
+        row = {'club_id': cid}
+        row.update({col: d[col] for col in TOTAL_COLUMNS})
+        cnt = d['whatsapp_sentiment_cnt']
+        row['whatsapp_sentiment'] = (d['whatsapp_sentiment_sum'] / cnt) if cnt > 0 else 0.0
+        rows.append(row)
+
+    stmt = sqlite_insert(table)
+    new_sum = table.c.whatsapp_sentiment_sum + stmt.excluded.whatsapp_sentiment_sum
+    new_cnt = table.c.whatsapp_sentiment_cnt + stmt.excluded.whatsapp_sentiment_cnt
+    updates = {col: table.c[col] + stmt.excluded[col] for col in TOTAL_COLUMNS}
+    updates['whatsapp_sentiment'] = case((new_cnt > 0, new_sum / new_cnt), else_=0.0)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['club_id'], set_=updates), rows)
+
+
+def upsert_monthly(monthly):
+    """Add (club_id, year, month) deltas to the monthly rollup."""
+    if not monthly:
+        return
+    table = ClubMetricsMonthly.__table__
+    rows = [dict(cell, club_id=cid, year=year, month=month) for (cid, year, month), cell in monthly.items()]
+    stmt = sqlite_insert(table)
+    updates = {col: table.c[col] + stmt.excluded[col] for col in TOTAL_COLUMNS}
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['club_id', 'year', 'month'], set_=updates), rows)
+
+
+def main(incremental=False):
+    # the same files the app reads and compiles into the snapshot (METRICS_DATA_DIR or data/)
+    paths = METRIC_SOURCES
 
     missing = [k for k, p in paths.items() if not os.path.exists(p)]
     if missing:
         raise SystemExit(f"Missing datasets: {', '.join(missing)}. Generate them first.")
 
-    with app.app_context():
-        clubs = {c.id: c for c in Club.query.all()}
-        if not clubs:
+    with create_app().app_context():
+        init_database()
+        club_ids = [cid for (cid,) in db.session.query(Club.id)]
+        if not club_ids:
             raise SystemExit('No clubs found in DB.')
 
-        agg = defaultdict(lambda: defaultdict(int))
-        for cid in clubs.keys():
-            agg[cid]['_sent_sum'] = 0.0
-            agg[cid]['_sent_cnt'] = 0
-
-        aggregate_instagram(read_csv(paths['instagram']), agg)
-        aggregate_whatsapp(read_csv(paths['whatsapp']), agg)
-        aggregate_attendance(read_csv(paths['attendance']), agg)
-        aggregate_awards(read_csv(paths['awards']), agg)
-
-        # Upsert ClubMetrics
-        for cid, metrics in agg.items():
-            cm = ClubMetrics.query.filter_by(club_id=cid).first()
-            if not cm:
-                cm = ClubMetrics(club_id=cid)
-                db.session.add(cm)
-            cm.instagram_posts = int(metrics.get('instagram_posts', 0))
-            cm.instagram_likes = int(metrics.get('instagram_likes', 0))
-            cm.instagram_reach = int(metrics.get('instagram_reach', 0))
-            cm.whatsapp_messages = int(metrics.get('whatsapp_messages', 0))
-            sent_sum = float(metrics.get('_sent_sum', 0.0))
-            sent_cnt = int(metrics.get('_sent_cnt', 0))
-            cm.whatsapp_sentiment = (sent_sum / sent_cnt) if sent_cnt > 0 else 0.0
-            cm.awards_won = int(metrics.get('awards_won', 0))
-            cm.offline_attendance = int(metrics.get('offline_attendance', 0))
-
+        # Rows are folded per (club, month) for the rollup, then collapsed into per-club deltas
+        monthly = defaultdict(new_totals)
+        reset = []
+        for key, path in paths.items():
+            mark = db.session.get(IngestWatermark, key)
+            offset = resume_offset(path, mark) if incremental else 0
+            if offset == 0:
+                reset.append(key)
+            columns, fold = SOURCES[key]
+            tail = CsvTail(path, columns + ('year', 'month'), offset)
+            high_water = {'mark': (mark.last_year or 0, mark.last_month or 0) if offset and mark else (0, 0)}
+            rows = fold(by_month(track_months(tail, high_water)), monthly, key=month_key)
+
+            if mark is None:
+                mark = IngestWatermark(source=key)
+                db.session.add(mark)
+            mark.byte_offset = tail.offset
+            mark.checksum = prefix_checksum(path, tail.offset)
+            mark.last_year, mark.last_month = high_water['mark']
+            mark.updated_at = datetime.utcnow()
+            mode = 'full' if offset == 0 else f'from byte {offset}'
+            print(f"{key}: {rows} rows ({mode}), high-water {mark.last_year}-{mark.last_month:02d}")
+
+        deltas = collapse_months(monthly, defaultdict(new_totals))
+        if reset:
+            # Sources re-read from the start replace their totals instead of adding to them
+            cleared = {col: 0 for key in reset for col in SOURCE_COLUMNS[key]}
+            db.session.execute(db.update(ClubMetrics).values(**cleared))
+            db.session.execute(db.update(ClubMetricsMonthly).values(
+                **{col: 0 for col in cleared if col in TOTAL_COLUMNS}))
+            for cid in club_ids:
+                deltas[cid]  # every club gets a row on a full load, as before
+
+        upsert_deltas(deltas)
+        upsert_monthly(monthly)
         db.session.commit()
-        print('ClubMetrics updated from CSV datasets.')
+        rss = peak_rss_mb()
+        print(f"ClubMetrics updated for {len(deltas)} clubs, monthly rollup for {len(monthly)} club-months"
+              + (f" (peak RSS {rss:.1f} MB)." if rss is not None else '.'))
+        print(f'Metrics snapshot compiled for {write_metrics_snapshot()} clubs')
 
 
 if __name__ == '__main__':
-    main()
-
-
+    parser = argparse.ArgumentParser(description='Aggregate the metric CSVs (under METRICS_DATA_DIR, default data/) into ClubMetrics.')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only fold rows appended since the last run (falls back to a full load per source when a file was rewritten)')
+    main(incremental=parser.parse_args().incremental)
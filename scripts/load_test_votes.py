@@ -0,0 +1,127 @@
+import os
+import argparse
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from werkzeug.security import generate_password_hash
+
+from app import create_app, eligibility_index, init_database, sync_award_eligibility
+from models import db, User, FeedbackVote
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'awards.db')
+
+
+def scratch_copy(directory):
+    """Copy the app database into ``directory``; votes never touch the real one."""
+    path = os.path.join(directory, 'awards.db')
+    if os.path.exists(SOURCE_DB):
+        # backup() rather than a file copy so committed WAL content comes along
+        src, dst = sqlite3.connect(SOURCE_DB), sqlite3.connect(path)
+        src.backup(dst)
+        src.close()
+        dst.close()
+    return path
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def prepare(app, users):
+    """Create ``users`` student accounts sharing one password; return (usernames, eligible pairs)."""
+    with app.app_context():
+        init_database()
+        sync_award_eligibility()
+        password_hash = generate_password_hash('loadtest')
+        names = [f'load_{uuid.uuid4().hex[:10]}' for _ in range(users)]
+        db.session.add_all(User(username=n, email=f'{n}@example.com', password_hash=password_hash) for n in names)
+        db.session.commit()
+        pairs = [(aid, cid) for aid, cids in eligibility_index().items() for cid in cids]
+    if not pairs:
+        raise SystemExit('No eligible (award, club) pairs; seed clubs and awards first.')
+    return names, pairs
+
+
+def run(app, mode, usernames, pairs, votes_per_user):
+    app.config['VOTE_BATCHING'] = mode == 'batched'
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(len(usernames) + 1)
+
+    def student(username):
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': 'loadtest', 'role': 'student'})
+        rng = random.Random(username)
+        start_gate.wait()
+        for _ in range(votes_per_user):
+            award_id, club_id = rng.choice(pairs)
+            started = time.perf_counter()
+            try:
+                r = client.post(f'/awards/{award_id}/vote', data={'club_id': club_id, 'voter_hash': uuid.uuid4().hex})
+                error = None if r.status_code == 302 else f'HTTP {r.status_code}'
+            except Exception as exc:  # e.g. "database is locked"
+                error = type(exc).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                if error is None:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(error)
+
+    threads = [threading.Thread(target=student, args=(u,)) for u in usernames]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+    return {
+        'mode': mode,
+        'votes': len(latencies),
+        'errors': len(errors),
+        'seconds': seconds,
+        'votes_per_sec': len(latencies) / seconds if seconds > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else 0.0,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test vote submission: one transaction per vote vs batched writer.')
+    parser.add_argument('--users', type=int, default=50, help='concurrent students submitting votes')
+    parser.add_argument('--votes', type=int, default=20, help='votes submitted per student')
+    parser.add_argument('--mode', choices=('direct', 'batched', 'both'), default='both')
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='vote-load-')
+    scratch_db = scratch_copy(scratch_dir)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + scratch_db
+    app = create_app()
+    app.logger.disabled = True
+    writer = app.extensions['vote_writer']
+    print(f'Scratch database: {scratch_db}')
+    usernames, pairs = prepare(app, args.users)
+    print(f'{args.users} students x {args.votes} votes over {len(pairs)} eligible (award, club) pairs; '
+          f'writer batch {writer.batch_size} votes / {writer.interval_ms} ms')
+
+    modes = ('direct', 'batched') if args.mode == 'both' else (args.mode,)
+    for mode in modes:
+        result = run(app, mode, usernames, pairs, args.votes)
+        print('{mode:>8}: {votes} votes in {seconds:.2f}s = {votes_per_sec:,.0f} votes/s, '
+              'p50 {p50_ms:.1f} ms, p99 {p99_ms:.1f} ms, {errors} errors'.format(**result))
+
+    with app.app_context():
+        print(f'Stored votes: {FeedbackVote.query.count()}')
+    shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import os
+import random
+import shutil
+
+import pytest
+
+from models import db, Award, AwardEligibility, FeedbackVote
+
+
+def add_votes(count, seed=0):
+    """``count`` anonymous votes spread over random eligible (award, club) pairs."""
+    rng = random.Random(seed)
+    pairs = db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).order_by(
+        AwardEligibility.award_id, AwardEligibility.club_id).all()
+    db.session.add_all(FeedbackVote(award_id=a, club_id=c) for a, c in (rng.choice(pairs) for _ in range(count)))
+    db.session.commit()
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app on a fresh database holding the sample clubs, awards, eligibility, metrics and some votes.
+
+    Background jobs are off so nothing outlives the test, and the page cache
+    is off so every request renders. No app context is left pushed, so test
+    client requests get their own, as in production; use ``ctx`` for one.
+    """
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'awards.db'}")
+    monkeypatch.setenv('BACKGROUND_JOBS', '0')
+    monkeypatch.setenv('PAGE_CACHE_TTL', '0')
+    from app import create_app, init_database, seed_sample_data, seed_synthetic_metrics, sync_award_eligibility
+
+    flask_app = create_app()
+    with flask_app.app_context():
+        init_database()
+        seed_sample_data()
+        random.seed(0)
+        seed_synthetic_metrics()
+        sync_award_eligibility()
+        add_votes(60)
+    yield flask_app
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def ctx(app):
+    """An app context for calling the app's functions directly."""
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def admin(app):
+    """A test client logged in as the seeded admin."""
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123', 'role': 'admin'})
+    return client
+
+
+@pytest.fixture
+def award_id(app):
+    with app.app_context():
+        return db.session.query(Award.id).order_by(Award.id).first()[0]
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    """A private copy of the metric files that the app reads and write_metrics_snapshot writes, so a test can change them."""
+    import app as app_module
+
+    data = tmp_path / 'data'
+    shutil.copytree(app_module.DATA_DIR, data)
+    monkeypatch.setattr(app_module, 'METRIC_SOURCES',
+                        {k: str(data / os.path.basename(p)) for k, p in app_module.METRIC_SOURCES.items()})
+    monkeypatch.setattr(app_module, 'REPORTS_DIR', str(data / 'reports'))
+    monkeypatch.setattr(app_module, 'SNAPSHOT_PATH', str(data / 'metrics.snapshot'))
+    return data
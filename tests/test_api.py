@@ -0,0 +1,49 @@
+import pytest
+
+from app import encode_cursor, refresh_ranking_snapshots
+
+
+@pytest.fixture
+def snapshots(app):
+    with app.app_context():
+        refresh_ranking_snapshots()
+
+
+def test_rankings_cursor_pages_through_the_snapshot(admin, award_id, snapshots):
+    first = admin.get(f'/api/awards/{award_id}/rankings?limit=2')
+    assert first.status_code == 200
+    second = admin.get(f"/api/awards/{award_id}/rankings?limit=2&cursor={first.json['next_cursor']}")
+    assert second.status_code == 200
+    assert second.json['rankings'][0]['rank'] == first.json['rankings'][-1]['rank'] + 1
+
+
+@pytest.mark.parametrize('position', [
+    {'snapshot': 'one', 'computed_at': '2025-01-01T00:00:00', 'rank': 2},
+    {'snapshot': [1], 'computed_at': '2025-01-01T00:00:00', 'rank': 2},
+    {'snapshot': 1.5, 'computed_at': '2025-01-01T00:00:00', 'rank': 2},
+    {'snapshot': True, 'computed_at': '2025-01-01T00:00:00', 'rank': 2},
+    {'snapshot': 2 ** 70, 'computed_at': '2025-01-01T00:00:00', 'rank': 2},
+    {'snapshot': 1, 'computed_at': 20250101, 'rank': 2},
+    {'snapshot': 1, 'computed_at': '2025-01-01T00:00:00', 'rank': '2'},
+    {'snapshot': 1, 'computed_at': '2025-01-01T00:00:00', 'rank': None},
+    {'snapshot': 1, 'computed_at': '2025-01-01T00:00:00', 'rank': -1},
+    {'snapshot': 1, 'computed_at': '2025-01-01T00:00:00'},
+    {},
+])
+def test_rankings_rejects_malformed_cursor(admin, award_id, snapshots, position):
+    response = admin.get(f'/api/awards/{award_id}/rankings?cursor={encode_cursor(position)}')
+    assert response.status_code == 400
+    assert response.json['error'] == 'invalid cursor'
+
+
+def test_rankings_unknown_snapshot_is_expired(admin, award_id, snapshots):
+    cursor = encode_cursor({'snapshot': 10 ** 6, 'computed_at': '2025-01-01T00:00:00', 'rank': 2})
+    assert admin.get(f'/api/awards/{award_id}/rankings?cursor={cursor}').status_code == 410
+
+
+@pytest.mark.parametrize('url, key', [('/api/results', 'award'), ('/api/awards/{award_id}/votes', 'club')])
+@pytest.mark.parametrize('value', ['3', 2.5, False, None, [3], 2 ** 64])
+def test_id_cursors_reject_non_integers(admin, award_id, url, key, value):
+    response = admin.get(url.format(award_id=award_id) + '?cursor=' + encode_cursor({key: value}))
+    assert response.status_code == 400
+    assert response.json['error'] == 'invalid cursor'
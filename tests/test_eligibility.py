@@ -0,0 +1,17 @@
+from app import eligible_club_ids, is_club_eligible
+from models import db, AwardEligibility, bump_eligibility_version
+
+
+def test_cached_eligibility_follows_rebuilds_by_other_processes(ctx):
+    award_id, club_id = db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).first()
+    assert is_club_eligible(award_id, club_id)
+
+    # another worker rebuilds eligibility: its writes reach this process only through the database
+    with db.engine.begin() as conn:
+        conn.execute(db.delete(AwardEligibility).where(AwardEligibility.award_id == award_id,
+                                                       AwardEligibility.club_id == club_id))
+        bump_eligibility_version(conn)
+    db.session.rollback()
+
+    assert not is_club_eligible(award_id, club_id)
+    assert club_id not in eligible_club_ids(award_id)
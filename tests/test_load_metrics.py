@@ -0,0 +1,72 @@
+import pytest
+
+import app as app_module
+from models import db, ClubMetrics, ClubMetricsMonthly
+from scripts import load_metrics_from_csv
+
+
+@pytest.fixture
+def sources(app, metrics_dir, monkeypatch):
+    # the script binds app.METRIC_SOURCES at import
+    monkeypatch.setattr(load_metrics_from_csv, 'METRIC_SOURCES', app_module.METRIC_SOURCES)
+    return app_module.METRIC_SOURCES
+
+
+def load(capsys, incremental):
+    load_metrics_from_csv.main(incremental=incremental)
+    return capsys.readouterr().out
+
+
+def append_rows(path, rows):
+    """Append CSV lines with the file's own line ending."""
+    with open(path, 'rb') as f:
+        newline = b'\r\n' if f.readline().endswith(b'\r\n') else b'\n'
+    with open(path, 'ab') as f:
+        for row in rows:
+            f.write(','.join(map(str, row)).encode() + newline)
+
+
+def stored(app):
+    with app.app_context():
+        def rows(model, key):
+            columns = [c.name for c in model.__table__.columns if c.name != 'id']
+            return sorted((tuple(round(v, 9) if isinstance(v, float) else v for v in (getattr(r, c) for c in columns))
+                           for r in model.query), key=key)
+        return (rows(ClubMetrics, key=lambda r: r[0]), rows(ClubMetricsMonthly, key=lambda r: r[:3]))
+
+
+def test_incremental_load_of_appended_rows_matches_a_full_reload(app, sources, capsys):
+    load(capsys, incremental=False)
+    append_rows(sources['instagram'], [(1, 'MUN Club', 2025, 10, 3, 500, 2000), (2, 'x', 2024, 1, 1, 10, 20)])
+    append_rows(sources['whatsapp'], [(3, 'x', 2025, 10, 120, 0.25, 30)])
+    append_rows(sources['attendance'], [(1, 'MUN Club', 2025, 9, 'Extra Meetup', 45)])
+
+    out = load(capsys, incremental=True)
+    assert 'instagram: 2 rows (from byte' in out
+    assert 'whatsapp: 1 rows (from byte' in out
+    assert 'awards: 0 rows (from byte' in out
+    # rows are sorted by club, so earlier months after the mark are ordinary, not reported as late
+    assert 'at/before' not in out
+    incremental = stored(app)
+
+    load(capsys, incremental=False)
+    assert stored(app) == incremental
+
+
+def test_rewritten_prefix_forces_a_full_reload(app, sources, capsys):
+    load(capsys, incremental=False)
+    with open(sources['instagram'], 'rb') as f:
+        lines = f.read().split(b'\n')
+    lines[1] = lines[1].replace(b',1,723,', b',9,723,')  # same length, different bytes
+    with open(sources['instagram'], 'wb') as f:
+        f.write(b'\n'.join(lines))
+    append_rows(sources['instagram'], [(1, 'MUN Club', 2025, 10, 3, 500, 2000)])
+    rows = sum(1 for line in lines[1:] if line.strip()) + 1
+
+    out = load(capsys, incremental=True)
+    assert f'instagram: {rows} rows (full)' in out
+    assert 'whatsapp: 0 rows (from byte' in out
+    incremental = stored(app)
+
+    load(capsys, incremental=False)
+    assert stored(app) == incremental
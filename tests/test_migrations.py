@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+
+from migrations import MIGRATIONS, migrate
+from models import db, AwardEligibility
+
+
+def _indexes(conn):
+    return {row[1] for row in conn.execute(text("PRAGMA index_list('feedback_vote')"))}
+
+
+@pytest.fixture
+def legacy_votes(ctx):
+    """Drop the unique voter index and store duplicate tokens, as databases from before it may hold."""
+    pairs = db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).order_by(
+        AwardEligibility.award_id, AwardEligibility.club_id).limit(2).all()
+    (award_id, club_a), (_, club_b) = pairs
+    with db.engine.begin() as conn:
+        conn.execute(text('DROP INDEX ux_feedback_vote_award_voter'))
+        insert = text('INSERT INTO feedback_vote (award_id, club_id, voter_hash) VALUES (:a, :c, :h)')
+        for club_id, token in ((club_a, 'dup'), (club_b, 'dup'), (club_b, 'dup'), (club_a, 'once')):
+            conn.execute(insert, {'a': award_id, 'c': club_id, 'h': token})
+    return award_id, club_a
+
+
+def _assert_repaired(award_id, first_club):
+    with db.engine.connect() as conn:
+        assert 'ux_feedback_vote_award_voter' in _indexes(conn)
+        kept = conn.execute(text("SELECT club_id FROM feedback_vote WHERE award_id = :a AND voter_hash = 'dup'"),
+                            {'a': award_id}).all()
+        assert kept == [(first_club,)]
+        tallies = conn.execute(text('SELECT award_id, club_id, count FROM vote_tally WHERE count > 0 '
+                                    'ORDER BY award_id, club_id')).all()
+        counts = conn.execute(text('SELECT award_id, club_id, COUNT(*) FROM feedback_vote '
+                                   'GROUP BY award_id, club_id ORDER BY award_id, club_id')).all()
+        assert tallies == counts
+
+
+def test_vote_migration_dedupes_legacy_votes_before_creating_the_index(legacy_votes):
+    with db.engine.begin() as conn:
+        conn.execute(text('DELETE FROM schema_version WHERE version >= 4'))
+    assert migrate(db.engine) == [number for number, _, _ in MIGRATIONS if number >= 4]
+    _assert_repaired(*legacy_votes)
+
+
+def test_databases_that_skipped_the_unique_index_get_it(legacy_votes):
+    # migration 4 used to be recorded as applied without creating the index
+    with db.engine.begin() as conn:
+        conn.execute(text('DELETE FROM schema_version WHERE version >= 6'))
+    assert migrate(db.engine) == [6]
+    _assert_repaired(*legacy_votes)
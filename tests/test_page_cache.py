@@ -0,0 +1,89 @@
+import pytest
+
+from app import create_app, invalidate_pages
+from models import db, AwardEligibility, Club
+from page_cache import PageCache
+
+
+def with_cache(flask_app):
+    flask_app.extensions['page_cache'] = PageCache(max_entries=64, ttl=60)
+    return flask_app
+
+
+@pytest.fixture
+def worker(app):
+    return with_cache(app)
+
+
+@pytest.fixture
+def other_worker(app):
+    """A second app on the same database, standing in for another gunicorn worker."""
+    flask_app = with_cache(create_app())
+    yield flask_app
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def stats(flask_app):
+    return flask_app.extensions['page_cache'].stats()
+
+
+def test_second_request_is_a_hit(worker):
+    client = worker.test_client()
+    first, second = client.get('/awards'), client.get('/awards')
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert stats(worker)['misses'] == 1 and stats(worker)['hits'] == 1
+
+
+def test_matching_if_none_match_gets_304(worker):
+    client = worker.test_client()
+    etag = client.get('/results').headers['ETag']
+    response = client.get('/results', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.data
+    assert client.get('/results', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_winner_declared_by_another_worker_reaches_cached_results(worker, other_worker):
+    client = worker.test_client()
+    with worker.app_context():
+        award_id, club_id = db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).first()
+        club_name = db.session.get(Club, club_id).name
+    assert club_name.encode() not in client.get('/results').data
+
+    admin = other_worker.test_client()
+    admin.post('/login', data={'username': 'admin', 'password': 'admin123', 'role': 'admin'})
+    assert admin.post(f'/admin/awards/{award_id}/decide', data={'club_id': club_id}).status_code == 302
+
+    assert club_name.encode() in client.get('/results').data
+    assert stats(worker)['hits'] == 0
+
+
+def test_invalidation_drops_the_route_in_other_workers_only(worker, other_worker):
+    client = worker.test_client()
+    client.get('/clubs')
+    client.get('/awards')
+    with other_worker.app_context():
+        invalidate_pages('clubs')
+    client.get('/clubs')
+    client.get('/awards')
+    assert stats(worker) == {'hits': 1, 'misses': 3, 'entries': 2}
+
+
+def test_vote_commit_keeps_pages_that_do_not_show_votes(worker, other_worker):
+    client = worker.test_client()
+    with worker.app_context():
+        award_id, club_id = db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).first()
+    client.get(f'/awards/{award_id}')
+    client.get('/results')
+
+    voter = other_worker.test_client()
+    voter.post('/login', data={'username': 'admin', 'password': 'admin123', 'role': 'admin'})
+    assert voter.post(f'/awards/{award_id}/vote', data={'club_id': club_id, 'voter_hash': 'once'}).status_code == 302
+
+    client.get(f'/awards/{award_id}')
+    client.get('/results')
+    # neither page shows vote counts, so the vote does not drop them
+    assert stats(worker)['hits'] == 2
@@ -0,0 +1,42 @@
+import itertools
+
+import pytest
+
+from app import refresh_ranking_snapshots, sync_award_eligibility
+from conftest import add_votes
+from models import db, Award, AwardDecision, Club
+from query_counter import assert_query_count_flat
+
+_batches = itertools.count(1)
+
+
+def add_rows(app):
+    """More clubs (with eligibility and auto-nominations), a declared award and votes, then fresh snapshots."""
+    n = next(_batches)
+    with app.app_context():
+        clubs = [Club(name=f'Debate Society {n}-{i}', description='Competitive debate and public speaking tournaments.',
+                      category='Academic', founded_year=2021, member_count=20 + i) for i in range(15)]
+        award = Award(name=f'Best Public Speaking Club {n}', description='Public speaking', category='Communication',
+                      criteria='Debate and public speaking', winners_declared=True)
+        db.session.add_all(clubs + [award])
+        db.session.commit()
+        sync_award_eligibility([c.id for c in clubs], [award.id])
+        db.session.add(AwardDecision(award_id=award.id, club_id=clubs[0].id, reason='test'))
+        db.session.commit()
+        add_votes(40, seed=n)
+        refresh_ranking_snapshots()
+
+
+@pytest.mark.parametrize('url', ['/admin/dashboard', '/results', '/admin/awards/1/rankings'])
+def test_view_query_count_does_not_grow_with_data(app, url):
+    with app.app_context():
+        refresh_ranking_snapshots()
+        engines = list(db.engines.values())  # the views read through the read engine
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123', 'role': 'admin'})
+
+    def make_request():
+        response = client.get(url)
+        assert response.status_code == 200
+
+    assert assert_query_count_flat(engines, make_request, lambda: add_rows(app)) > 0
@@ -0,0 +1,29 @@
+import pytest
+
+import app as app_module
+from app import compute_all_rankings, compute_rankings_for_award
+from models import Award
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy' and app_module.np is None:
+        pytest.skip('numpy is not installed')
+    if request.param == 'python':
+        monkeypatch.setattr(app_module, 'np', None)
+    return request.param
+
+
+def test_compute_all_rankings_matches_per_award(ctx, backend):
+    awards = Award.query.order_by(Award.id).all()
+    batched = compute_all_rankings()
+    assert set(batched) == {a.id for a in awards}
+    assert any(batched.values())
+    for award in awards:
+        assert batched[award.id] == compute_rankings_for_award(award)
+
+
+def test_compute_all_rankings_top_k_matches_per_award(ctx, backend):
+    batched = compute_all_rankings(top_k=3)
+    for award in Award.query.order_by(Award.id):
+        assert batched[award.id] == compute_rankings_for_award(award, top_k=3)
@@ -0,0 +1,74 @@
+import glob
+import os
+import random
+
+import pytest
+
+import report_scoring
+from report_scoring import NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS, ReportScoreCache, score_report_file
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'reports')
+TEXTS = [
+    '',
+    'SUCCESSFUL Collaboration with Record Attendance',
+    'wonwonwon won Wonderful',
+    'first place first placefirst place',
+    'delaydelay DELAY postponementspostponements',
+    'challenges\r\nconflicts\r\ncancelled lower turnout',
+    'excellent ' * 25,
+    'Innovation-impact; improved/mentorship: praise! strong engagement, high satisfaction.',
+]
+
+
+def original_score(path):
+    """The report score as first computed in app.py, one ``str.count`` per keyword."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().lower()
+    pos = sum(text.count(k) for k in POSITIVE_KEYWORDS)
+    neg = sum(text.count(k) for k in NEGATIVE_KEYWORDS)
+    return max(0.0, min(1.0, (pos - 0.5 * neg) / 10.0))
+
+
+def fuzz_texts(count, seed=0):
+    """Texts glued from keyword fragments, so keywords overlap, repeat and nest in each other."""
+    rng = random.Random(seed)
+    pieces = POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS + ['won', 'wonwon', 'place first ', ' ', '\n', 'x']
+    pieces += [k[:rng.randint(1, len(k))] for k in pieces] + [k[-rng.randint(1, len(k)):] for k in pieces]
+    for _ in range(count):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        yield ''.join(c.upper() if rng.random() < 0.3 else c for c in text)
+
+
+@pytest.fixture
+def reports(tmp_path):
+    files = []
+    for cid in range(1, 9):
+        path = tmp_path / f'club_{cid}.txt'
+        path.write_text('successful collaboration, record attendance. ' * cid + 'delay, challenges. ' * (8 - cid))
+        files.append((cid, str(path)))
+    return files
+
+
+def test_request_path_scores_without_processes(reports, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('request path started a process pool')
+
+    monkeypatch.setattr(report_scoring, 'ProcessPoolExecutor', no_pool)
+    scores = ReportScoreCache(workers=2, parallel_threshold=1).scores(reports)
+    assert scores == {cid: score_report_file(path) for cid, path in reports}
+
+
+def test_parallel_scoring_matches_serial(reports):
+    serial = ReportScoreCache(workers=1).scores(reports)
+    parallel = ReportScoreCache(workers=2, parallel_threshold=1).scores(reports, parallel=True)
+    assert parallel == serial
+
+
+def test_scores_match_the_original_formula(tmp_path):
+    # the shipped reports, then edge cases and fuzzed texts
+    files = list(enumerate(sorted(glob.glob(os.path.join(REPORTS_DIR, 'club_*.txt'))), start=1))
+    for n, text in enumerate(TEXTS + list(fuzz_texts(300)), start=1000):
+        path = tmp_path / f'club_{n}.txt'
+        path.write_text(text, encoding='utf-8', newline='')
+        files.append((n, str(path)))
+    assert ReportScoreCache(workers=1).scores(files) == {cid: original_score(path) for cid, path in files}
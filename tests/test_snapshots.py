@@ -0,0 +1,66 @@
+import pytest
+
+import app as app_module
+from app import (RANKING_SNAPSHOTS_KEPT, get_weights, latest_ranking_snapshot, ranking_input_versions, record_vote,
+                 refresh_ranking_snapshots)
+from models import db, AwardEligibility, RankingSnapshot
+
+
+@pytest.fixture
+def award_club(ctx, metrics_dir):
+    return db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).order_by(
+        AwardEligibility.award_id, AwardEligibility.club_id).first()
+
+
+def key(award_id):
+    return ranking_input_versions([award_id])[award_id]
+
+
+def test_snapshot_key_follows_weights_votes_and_metrics(award_club, metrics_dir):
+    award_id, club_id = award_club
+    assert refresh_ranking_snapshots([award_id]) == [award_id]
+    assert refresh_ranking_snapshots([award_id]) == []
+    first = key(award_id)
+    assert latest_ranking_snapshot(award_id).key == first
+
+    weights = get_weights()
+    weights.w_social += 0.05
+    db.session.commit()
+    after_weights = key(award_id)
+    assert after_weights[1] != first[1] and after_weights[2:] == first[2:]
+
+    assert record_vote(award_id, club_id, 'snapshot-test')
+    after_votes = key(award_id)
+    assert after_votes[2] != after_weights[2] and after_votes[1::2] == after_weights[1::2]
+
+    with open(metrics_dir / 'reports' / f'club_{club_id}.txt', 'a', encoding='utf-8') as f:
+        f.write('\nsuccessful collaboration\n')
+    after_metrics = key(award_id)
+    assert after_metrics[3] != after_votes[3] and after_metrics[:3] == after_votes[:3]
+
+    assert refresh_ranking_snapshots([award_id]) == [award_id]
+    assert latest_ranking_snapshot(award_id).key == after_metrics
+
+
+def test_only_the_latest_snapshots_are_kept(award_club):
+    award_id, club_id = award_club
+    for n in range(4):
+        assert record_vote(award_id, club_id, f'keep-{n}')
+        refresh_ranking_snapshots([award_id])
+    snapshots = RankingSnapshot.query.filter_by(award_id=award_id).all()
+    assert len(snapshots) == RANKING_SNAPSHOTS_KEPT
+    assert max(s.id for s in snapshots) == latest_ranking_snapshot(award_id).id
+
+
+def test_vote_commits_do_not_queue_snapshot_rebuilds(award_club, monkeypatch):
+    award_id, club_id = award_club
+    queued = []
+    monkeypatch.setattr(app_module, 'queue_ranking_refresh', lambda *args, **kwargs: queued.append(args))
+    for n in range(3):
+        assert record_vote(award_id, club_id, f'spike-{n}')
+    assert queued == []
+
+    weights = get_weights()
+    weights.w_awards += 0.05
+    db.session.commit()
+    assert queued == [()]
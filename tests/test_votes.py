@@ -0,0 +1,125 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import pytest
+from sqlalchemy import text
+
+from app import record_vote
+from models import db, AwardEligibility, FeedbackVote, VoteTally, rebuild_vote_tallies
+
+
+def live_counts():
+    return dict(((a, c), n) for a, c, n in db.session.query(
+        FeedbackVote.award_id, FeedbackVote.club_id, db.func.count()).group_by(FeedbackVote.award_id, FeedbackVote.club_id))
+
+
+def tallies():
+    return {(t.award_id, t.club_id): t.count for t in VoteTally.query if t.count}
+
+
+@pytest.fixture
+def pairs(ctx):
+    return db.session.query(AwardEligibility.award_id, AwardEligibility.club_id).order_by(
+        AwardEligibility.award_id, AwardEligibility.club_id).limit(2).all()
+
+
+def test_repeated_token_is_rejected_without_counting(pairs):
+    (award_id, club_a), (_, club_b) = pairs
+    assert record_vote(award_id, club_a, 'token')
+    before = tallies()
+    assert not record_vote(award_id, club_b, 'token')
+    assert tallies() == before
+    assert FeedbackVote.query.filter_by(award_id=award_id, voter_hash='token').count() == 1
+
+
+def test_repeated_token_is_rejected_while_the_unique_index_is_missing(app, pairs):
+    (award_id, club_a), (_, club_b) = pairs
+    with db.engine.begin() as conn:
+        conn.execute(text('DROP INDEX ux_feedback_vote_award_voter'))
+    app.extensions.pop('unique_voter_index', None)
+    assert record_vote(award_id, club_a, 'token')
+    assert not record_vote(award_id, club_b, 'token')
+    assert FeedbackVote.query.filter_by(award_id=award_id, voter_hash='token').count() == 1
+
+
+def test_tallies_follow_vote_inserts_and_deletes(pairs):
+    (award_id, club_a), (_, club_b) = pairs
+    for n in range(5):
+        assert record_vote(award_id, club_a if n % 2 else club_b, f'voter{n}')
+    assert tallies() == live_counts()
+    for vote in FeedbackVote.query.filter_by(award_id=award_id, club_id=club_b).limit(2):
+        db.session.delete(vote)
+    db.session.commit()
+    assert tallies() == live_counts()
+
+
+def test_rebuild_vote_tallies_matches_live_counts(pairs):
+    award_id, club_id = pairs[0]
+    # bulk inserts bypass the mapper events that keep vote_tally current
+    db.session.execute(db.insert(FeedbackVote), [{'award_id': award_id, 'club_id': club_id}] * 3)
+    db.session.commit()
+    assert tallies() != live_counts()
+    rebuild_vote_tallies(db.session.connection())
+    db.session.commit()
+    assert tallies() == live_counts()
+
+
+@pytest.fixture
+def writer(app):
+    vote_writer = app.extensions['vote_writer']
+    vote_writer.interval_ms = 200  # long enough for each wave below to land in one batch
+    return vote_writer
+
+
+def submit_all(app, writer, votes):
+    barrier = threading.Barrier(len(votes))
+
+    def submit(vote):
+        with app.app_context():
+            barrier.wait()
+            return writer.submit(*vote)
+    with ThreadPoolExecutor(len(votes)) as pool:
+        return list(pool.map(submit, votes))
+
+
+def test_writer_accepts_one_vote_per_token_within_and_across_batches(app, writer, pairs):
+    (award_id, club_a), (_, club_b) = pairs
+    with app.app_context():
+        before = FeedbackVote.query.count()
+    tokens = [f'batch-{n}' for n in range(8)]
+    # three submissions per token in the same batch, plus anonymous votes that are never deduplicated
+    first = [(award_id, club_a if i % 2 else club_b, token) for token in tokens for i in range(3)]
+    first += [(award_id, club_a, None)] * 4
+    results = submit_all(app, writer, first)
+    for token in tokens:
+        assert sum(ok for (_, _, t), ok in zip(first, results) if t == token) == 1
+    assert all(results[-4:])
+
+    # the same tokens again, in a later batch
+    again = submit_all(app, writer, [(award_id, club_b, token) for token in tokens[:4]])
+    assert again == [False] * 4
+
+    with app.app_context():
+        assert FeedbackVote.query.count() == before + len(tokens) + 4
+        assert tallies() == live_counts()
+
+
+def test_submit_times_out_while_the_writer_is_stuck_and_the_vote_still_lands(app, writer, pairs, monkeypatch):
+    award_id, club_id = pairs[0]
+    release = threading.Event()
+    write = writer._write
+
+    def stuck_write(votes):
+        release.wait(10)
+        return write(votes)
+    monkeypatch.setattr(writer, '_write', stuck_write)
+
+    with app.app_context():
+        with pytest.raises(FutureTimeoutError):
+            writer.submit(award_id, club_id, 'slow', timeout=0.3)
+    release.set()
+    with app.app_context():
+        # still queued: the next submission completes only after it, in order
+        assert not writer.submit(award_id, club_id, 'slow', timeout=5)
+        assert FeedbackVote.query.filter_by(award_id=award_id, voter_hash='slow').count() == 1
+        assert tallies() == live_counts()
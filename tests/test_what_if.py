@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.mark.parametrize('body', [
+    [], 'w_social', 3, {'weights': []}, {'weights': 'heavy'}, {'weights': 1.5}, {'weights': {'w_social': 'x'}},
+    {'weights': {'w_social': -1}}, {'limit': 'ten'}, {'limit': [1]}, {'weight_set_id': 'one'},
+])
+def test_what_if_rejects_malformed_bodies(admin, award_id, body):
+    response = admin.post(f'/admin/api/awards/{award_id}/what-if', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+
+def test_what_if_accepts_partial_weights(admin, award_id):
+    response = admin.post(f'/admin/api/awards/{award_id}/what-if', json={'weights': {'w_social': 1.0}, 'limit': 3})
+    assert response.status_code == 200
+    assert response.json['weights']['w_social'] == 1.0
+
+
+@pytest.mark.parametrize('body', [[], 'x', {'name': 3}, {'name': ' '}, {'name': 'n', 'weights': [0.2]}])
+def test_create_weight_set_rejects_malformed_bodies(admin, body):
+    response = admin.post('/admin/api/weight-sets', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.json
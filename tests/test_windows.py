@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app import ROLLUP_COLUMNS, _read_monthly_rollup, _windowed_metrics, month_index
+from models import db, Club, ClubMetricsMonthly
+
+# 2024-06 .. 2025-06 with gaps, so some windows hold no months at all
+MONTHS = [(2024, m) for m in (6, 7, 8, 10, 11, 12)] + [(2025, m) for m in (1, 2, 4, 6)]
+
+
+@pytest.fixture
+def monthly(ctx):
+    rng = random.Random(0)
+    club_ids = [cid for (cid,) in db.session.query(Club.id).order_by(Club.id)]
+    db.session.execute(db.delete(ClubMetricsMonthly))
+    for cid in club_ids:
+        for year, month in rng.sample(MONTHS, k=rng.randint(3, len(MONTHS))):
+            db.session.add(ClubMetricsMonthly(
+                club_id=cid, year=year, month=month, instagram_posts=rng.randint(0, 9),
+                instagram_likes=rng.randint(0, 900), instagram_reach=rng.randint(0, 5000),
+                whatsapp_messages=rng.randint(0, 300), whatsapp_sentiment_sum=rng.uniform(-5, 5),
+                whatsapp_sentiment_cnt=rng.randint(0, 30), awards_won=rng.randint(0, 2),
+                offline_attendance=rng.randint(0, 200)))
+    db.session.commit()
+    return club_ids
+
+
+def direct_sums(club_id, start, end):
+    index = ClubMetricsMonthly.year * 12 + ClubMetricsMonthly.month - 1
+    query = db.session.query(*(db.func.coalesce(db.func.sum(getattr(ClubMetricsMonthly, c)), 0)
+                               for c in ROLLUP_COLUMNS)).filter(ClubMetricsMonthly.club_id == club_id)
+    if start is not None:
+        query = query.filter(index >= start)
+    if end is not None:
+        query = query.filter(index <= end)
+    return dict(zip(ROLLUP_COLUMNS, query.one()))
+
+
+WINDOWS = [
+    ('2024-11', '2024-11'),  # a single month
+    ('2024-11', '2025-02'),  # across a year boundary
+    ('2024-12', '2025-01'),
+    ('2024-09', '2024-09'),  # a month no club has: empty
+    ('2025-03', '2025-03'),
+    ('2023-01', '2024-05'),  # before all data: empty
+    ('2025-06', '2024-06'),  # start after end: empty
+    (None, '2024-08'),
+    ('2025-02', None),
+    (None, None),
+]
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_window_totals_match_direct_sums(monthly, window):
+    start, end = (None if w is None else month_index(w) for w in window)
+    rollup = _read_monthly_rollup()
+    for cid in monthly + [max(monthly) + 1]:  # plus a club without any months
+        expected = direct_sums(cid, start, end)
+        assert rollup.totals(cid, start, end) == pytest.approx(expected)
+
+
+def test_windowed_metrics_finalize_the_window_sums(monthly):
+    metrics = _windowed_metrics(('2024-11', '2025-02'))
+    for cid in monthly:
+        sums = direct_sums(cid, month_index('2024-11'), month_index('2025-02'))
+        m = metrics.get(cid)
+        assert m['instagram_reach'] == sums['instagram_reach']
+        cnt = sums['whatsapp_sentiment_cnt']
+        assert m['whatsapp_sentiment'] == pytest.approx(sums['whatsapp_sentiment_sum'] / cnt if cnt else 0.0)
+
+
+def test_rankings_page_accepts_a_window(admin, award_id):
+    page = admin.get(f'/admin/awards/{award_id}/rankings?from=2024-11&to=2025-02')
+    assert page.status_code == 200
+    bad = admin.get(f'/admin/awards/{award_id}/rankings?from=2024-13', follow_redirects=True)
+    assert bad.status_code == 200
+    assert b'Use YYYY-MM for the month range.' in bad.data